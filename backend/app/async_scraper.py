@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from app.core.host_limiter import HostRateLimiter, host_of, parse_retry_after
+from app.core.job_cache import AsyncJobDataCache, stable_job_id
+from app.job_scraper import LinkedInJobScraper
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "8"))
+SCRAPER_TIMEOUT_SECONDS = float(os.getenv("SCRAPER_TIMEOUT_SECONDS", "15"))
+SCRAPER_MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+
+
+class AsyncLinkedInJobScraper:
+    """asyncio engine for LinkedIn scrapes.
+
+    Search pages are walked in order as before, but each page's detail
+    pages are fetched concurrently (at most `concurrency` in flight) over
+    one keep-alive httpx client. Every request is paced by a per-host
+    HostRateLimiter, so the crawl runs at the allowed rate rather than
+    sleeping a fixed amount. HTML parsing runs in worker threads so the
+    event loop keeps serving while a page is parsed. All parsing and
+    classification is delegated to LinkedInJobScraper, so the job dicts
+    are identical to `LinkedInJobScraper.scrape_jobs`.
+
+    Point `origin` at a local stub server (or pass an httpx client with a
+    mock transport) to exercise it without touching LinkedIn.
+    """
+
+    def __init__(self, origin: str = "https://www.linkedin.com",
+                 concurrency: int = SCRAPER_CONCURRENCY,
+                 timeout: float = SCRAPER_TIMEOUT_SECONDS,
+                 limiter: Optional[HostRateLimiter] = None,
+                 detail_cache: Optional[AsyncJobDataCache] = None,
+                 client: Optional[httpx.AsyncClient] = None):
+        self.parser = LinkedInJobScraper(origin=origin)
+        # Known-job lookups go through the asyncio cache, not the parser's sync one
+        self.detail_cache = detail_cache
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        # Needs an asyncio Redis client to be shared, e.g. db.redis_client
+        self.limiter = limiter or HostRateLimiter()
+        self._client = client
+        self._owns_client = client is None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.parser.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch_with_backoff(self, url: str, params: Dict = None, headers: Dict = None,
+                                 max_retries: int = SCRAPER_MAX_RETRIES) -> httpx.Response:
+        """Async counterpart of LinkedInJobScraper.make_request_with_backoff"""
+        client = self._get_client()
+        host = host_of(url)
+        for attempt in range(max_retries):
+            wait_time = 2 ** attempt
+            try:
+                await self.limiter.acquire(host)
+                response = await client.get(url, params=params, headers=headers)
+                if response.status_code == 429:
+                    # The limiter makes the next acquire() wait out Retry-After
+                    wait_time = parse_retry_after(response.headers.get('Retry-After')) or wait_time
+                    logger.warning(f"Rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
+                    await self.limiter.penalize(host, wait_time)
+                    continue
+                elif response.status_code >= 400:
+                    if attempt == max_retries - 1:
+                        logger.error(f"Request failed with status {response.status_code} after {max_retries} attempts")
+                        response.raise_for_status()
+                    logger.warning(f"Request failed with status {response.status_code}. Retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
+                else:
+                    return response
+            except httpx.HTTPStatusError:
+                raise
+            except httpx.HTTPError as e:
+                if attempt == max_retries - 1:
+                    logger.error(f"Request failed after {max_retries} attempts: {str(e)}")
+                    raise
+                logger.warning(f"Request failed: {str(e)}. Retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
+            await asyncio.sleep(wait_time)
+
+        raise Exception(f"Request failed after {max_retries} attempts")
+
+    async def lookup_known_details(self, job_cards: List[Dict]) -> Dict[str, Dict]:
+        """Async LinkedInJobScraper.lookup_known_details: assign IDs, one pipelined read"""
+        self.parser.lookup_known_details(job_cards)
+        if self.detail_cache is None or not job_cards:
+            return {}
+        try:
+            return await self.detail_cache.get_known_details([job['job_id'] for job in job_cards])
+        except Exception as e:
+            logger.warning(f"Known-job lookup failed, fetching every detail page: {str(e)}")
+            return {}
+
+    async def get_job_description(self, job_url: str, semaphore: asyncio.Semaphore,
+                                  known: Optional[Dict] = None) -> Dict:
+        """Fetch one detail page and parse it off the event loop.
+
+        Fresh cached details skip the request; stale ones are revalidated
+        conditionally, as in LinkedInJobScraper.get_job_description.
+        """
+        if self.parser.is_detail_fresh(known):
+            return self.parser.cached_job_description(known)
+        job_url = self.parser.absolute_job_url(job_url)
+        try:
+            async with semaphore:
+                response = await self.fetch_with_backoff(job_url, headers=self.parser.conditional_headers(known))
+            details = await asyncio.to_thread(
+                self.parser.described_response, response.status_code, response.headers, response.content, known
+            )
+            if details is not None:
+                return details
+        except Exception as e:
+            logger.error(f"Error fetching job description from {job_url}: {str(e)}")
+
+        return self.parser.empty_job_description()
+
+    async def _complete_job(self, job_data: Dict, semaphore: asyncio.Semaphore,
+                            known: Optional[Dict]) -> Dict:
+        if job_data['job_url']:
+            job_data.update(await self.get_job_description(job_data['job_url'], semaphore, known))
+
+        return self.parser.classify_job(job_data)
+
+    async def iter_pages(self, keywords: str = "software engineer", location: str = "India",
+                         max_jobs: int = 50, job_type_filter: str = None, trusted_only: bool = True,
+                         start: int = 0, collected: int = 0,
+                         seen_ids: Optional[Set[str]] = None) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """Completed jobs one search page at a time, as (next_start, jobs).
+
+        `start`, `collected` and `seen_ids` resume an interrupted crawl:
+        pagination continues at `start`, `collected` jobs count toward
+        `max_jobs`, and cards already in `seen_ids` are skipped (the set is
+        updated in place). Fetch errors propagate, so the caller can retry
+        from its last checkpoint instead of treating the crawl as finished.
+        """
+        count = 25
+        seen_ids = set() if seen_ids is None else seen_ids
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        while collected < max_jobs:
+            params = self.parser.build_search_params(keywords, location, start, count, job_type_filter)
+            logger.info(f"Fetching jobs: start={start}, count={count}")
+
+            response = await self.fetch_with_backoff(self.parser.base_url, params=params)
+            job_cards = await asyncio.to_thread(self.parser.extract_job_cards, response.content)
+
+            if not job_cards:
+                logger.info("No more job cards found")
+                return
+
+            if trusted_only:
+                job_cards = [job for job in job_cards if job['is_trusted_company']]
+
+            if not job_cards:
+                logger.info("No qualifying jobs found in this batch")
+                return
+
+            # One pipelined Redis lookup per page; known jobs skip the detail fetch
+            job_cards = [job for job in job_cards if stable_job_id(job) not in seen_ids]
+            job_cards = job_cards[:max_jobs - collected]
+            known_details = await self.lookup_known_details(job_cards)
+
+            # gather keeps card order, so output matches the sequential scraper
+            page_jobs = list(await asyncio.gather(
+                *(self._complete_job(job, semaphore, known_details.get(job['job_id'])) for job in job_cards)
+            ))
+            seen_ids.update(job['job_id'] for job in page_jobs)
+            collected += len(page_jobs)
+            start += count
+            yield start, page_jobs
+
+    async def scrape_jobs(self, keywords: str = "software engineer", location: str = "India",
+                          max_jobs: int = 50, job_type_filter: str = None, category_filter: str = None,
+                          trusted_only: bool = True) -> List[Dict]:
+        """Same contract and output as LinkedInJobScraper.scrape_jobs"""
+        all_jobs = []
+
+        logger.info(f"Starting async job scraping: keywords='{keywords}', location='{location}', "
+                    f"max_jobs={max_jobs}, trusted_only={trusted_only}, concurrency={self.concurrency}")
+
+        try:
+            async for _, page_jobs in self.iter_pages(keywords, location, max_jobs,
+                                                      job_type_filter, trusted_only):
+                all_jobs.extend(page_jobs)
+        except Exception as e:
+            logger.error(f"Error during scraping: {str(e)}")
+
+        if category_filter and category_filter != 'All':
+            all_jobs = self.parser.filter_by_category(all_jobs, category_filter)
+
+        logger.info(f"Successfully scraped {len(all_jobs)} jobs")
+        return all_jobs
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import json
+import logging
+
+from app.core.db import db
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_actions(args) -> int:
+    """Backfill the consolidated user_job_actions projection"""
+    stats = await db.backfill_user_job_actions(batch_size=args.batch_size)
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+async def migrate_snapshots(args) -> int:
+    """Move embedded job_details into the shared job_snapshots collection"""
+    stats = await db.migrate_job_snapshots(batch_size=args.batch_size)
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+async def extract_skills(args) -> int:
+    """Derive skills for jobs-lists postings with the compiled skill extractor"""
+    stats = await db.backfill_job_skills(batch_size=args.batch_size)
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+async def ingest_worker(args) -> int:
+    """Drain the scrape request queue into the Redis job cache"""
+    worker = db.build_ingestion_worker()
+    try:
+        processed = await worker.run(once=args.once)
+    finally:
+        await worker.engine.close()
+    logger.info(f"Processed {processed} scrape requests")
+    return 0
+
+
+async def enqueue_scrape(args) -> int:
+    """Queue one query for the ingestion worker"""
+    queued = await db.scrape_queue.enqueue(
+        keywords=args.keywords, location=args.location, max_jobs=args.max_jobs,
+        job_type_filter=args.job_type, category_filter=args.category,
+        trusted_only=not args.all_companies, force_refresh=args.force)
+    print(json.dumps({"queued": queued, "depth": await db.scrape_queue.depth()}, indent=2))
+    return 0
+
+
+async def indexes(args) -> int:
+    """Provision registered indexes and optionally verify hot query plans"""
+    result = await db.ensure_indexes()
+    if args.verify:
+        result["plans"] = await db.verify_indexes(strict=False)
+    print(json.dumps(result, indent=2))
+
+    scans = [plan["query"] for plan in result.get("plans", []) if plan["collscan"]]
+    if result["failed"] or (args.strict and scans):
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description="Job Recommender maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill = subparsers.add_parser(
+        "backfill-actions", help="Rebuild user_job_actions from the per-action collections")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    backfill.set_defaults(handler=backfill_actions)
+
+    snapshots = subparsers.add_parser(
+        "migrate-snapshots", help="Move embedded job_details into job_snapshots")
+    snapshots.add_argument("--batch-size", type=int, default=500)
+    snapshots.set_defaults(handler=migrate_snapshots)
+
+    skills = subparsers.add_parser(
+        "extract-skills", help="Extract skills from jobs-lists descriptions")
+    skills.add_argument("--batch-size", type=int, default=500)
+    skills.set_defaults(handler=extract_skills)
+
+    worker = subparsers.add_parser(
+        "ingest-worker", help="Run the background scraping worker")
+    worker.add_argument("--once", action="store_true",
+                        help="exit when the queue is empty instead of waiting")
+    worker.set_defaults(handler=ingest_worker)
+
+    enqueue = subparsers.add_parser(
+        "enqueue-scrape", help="Queue a scrape for the ingestion worker")
+    enqueue.add_argument("--keywords", default="software engineer")
+    enqueue.add_argument("--location", default="India")
+    enqueue.add_argument("--max-jobs", type=int, default=50)
+    enqueue.add_argument("--job-type")
+    enqueue.add_argument("--category")
+    enqueue.add_argument("--all-companies", action="store_true",
+                         help="don't restrict to trusted companies")
+    enqueue.add_argument("--force", action="store_true",
+                         help="scrape even if the search is cached")
+    enqueue.set_defaults(handler=enqueue_scrape)
+
+    index_cmd = subparsers.add_parser(
+        "indexes", help="Create registered indexes and check hot query plans")
+    index_cmd.add_argument("--verify", action="store_true",
+                           help="explain() each hot query shape")
+    index_cmd.add_argument("--strict", action="store_true",
+                           help="exit non-zero if any query uses a COLLSCAN")
+    index_cmd.set_defaults(handler=indexes)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
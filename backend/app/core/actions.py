@@ -0,0 +1,110 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+from app.core.snapshots import snapshot_ref
+
+# Swipe actions and the collection each one is persisted to
+ACTION_COLLECTIONS = {
+    "like": "users_job_like",
+    "super_like": "users_job_like",
+    "apply": "users_job_like",
+    "save": "users_job_saved",
+    "dislike": "users_job_dislike",
+}
+
+# Per-collection timestamp field recorded alongside the action
+ACTION_TIMESTAMP_FIELDS = {
+    "users_job_like": "liked_at",
+    "users_job_saved": "saved_at",
+    "users_job_dislike": "disliked_at",
+}
+
+VALID_ACTIONS = ['like', 'dislike', 'save', 'apply', 'super_like']
+
+
+def collection_for_action(action: str) -> str:
+    """Target collection for an action; unknown actions are stored as dislikes"""
+    return ACTION_COLLECTIONS.get(action, "users_job_dislike")
+
+
+def build_action_write(action: str, user_id: str, job_id: str,
+                       job_details: Optional[dict] = None,
+                       now: Optional[datetime] = None) -> Tuple[str, dict, dict]:
+    """Build the upsert for one swipe.
+
+    Returns (collection_name, filter, update) so callers can run it either
+    as update_one or as a pymongo UpdateOne inside bulk_write. Job details
+    are referenced by job_ref; callers store the snapshot itself through
+    JobSnapshotStore.
+    """
+    now = now or datetime.utcnow()
+    collection_name = collection_for_action(action)
+
+    doc = {
+        "user_id": user_id,
+        "job_id": job_id,
+        ACTION_TIMESTAMP_FIELDS[collection_name]: now,
+        "created_at": now,
+    }
+    update = {"$set": doc}
+    if collection_name != "users_job_dislike":
+        # Likes and saves point at a shared job snapshot; dislikes stay minimal
+        doc["job_ref"] = snapshot_ref(job_id, job_details) if job_details else None
+        doc["updated_at"] = now
+        update["$unset"] = {"job_details": ""}
+
+    return collection_name, {"user_id": user_id, "job_id": job_id}, update
+
+
+# ===== Consolidated interaction projection =====
+
+# One document per (user_id, job_id) with a bitmask of everything the user
+# did to the job, maintained alongside the per-action collections above.
+INTERACTIONS_COLLECTION = "user_job_actions"
+
+ACTION_BITS = {
+    "users_job_like": 1,
+    "users_job_saved": 2,
+    "users_job_dislike": 4,
+}
+ALL_ACTIONS_MASK = 1 | 2 | 4
+
+# Removals buffered by SwipeWriteBuffer leave a tombstone here, so a swipe
+# written before the removal but flushed after it can't bring the item back
+REMOVALS_COLLECTION = "user_job_removals"
+
+
+def action_mask(actions: List[str]) -> int:
+    """Bitmask covering the given action names"""
+    mask = 0
+    for action in actions:
+        mask |= ACTION_BITS[collection_for_action(action)]
+    return mask
+
+
+def build_interaction_write(user_id: str, job_id: str, collection_name: str,
+                            now: Optional[datetime] = None,
+                            remove: bool = False) -> Tuple[dict, dict]:
+    """Build the (filter, update) that sets or clears one action bit.
+
+    Each set records its time under set_at.<collection>, and a clear only
+    applies when that is not newer than the removal, so a late removal
+    can't clear the bit of a later swipe.
+    """
+    now = now or datetime.utcnow()
+    bit = ACTION_BITS[collection_name]
+    query = {"user_id": user_id, "job_id": job_id}
+    if remove:
+        query[f"set_at.{collection_name}"] = {"$not": {"$gt": now}}
+        update = {
+            "$bit": {"actions": {"and": ALL_ACTIONS_MASK & ~bit}},
+            "$set": {"updated_at": now}
+        }
+    else:
+        update = {
+            "$bit": {"actions": {"or": bit}},
+            "$set": {"updated_at": now},
+            "$max": {f"set_at.{collection_name}": now},
+            "$setOnInsert": {"created_at": now}
+        }
+    return query, update
@@ -0,0 +1,109 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+CRAWL_KEY_PREFIX = "crawl:"
+# Long enough to outlive a worker restart; an abandoned crawl simply expires
+CRAWL_CHECKPOINT_TTL = int(os.getenv("CRAWL_CHECKPOINT_TTL", str(24 * 3600)))
+
+
+class CrawlState:
+    """Progress of one crawl: where pagination resumes and what it has so far"""
+
+    def __init__(self, crawl_id: str, query: Dict, start: int = 0,
+                 seen_ids: Optional[Set[str]] = None, jobs: Optional[List[Dict]] = None,
+                 pages: int = 0):
+        self.crawl_id = crawl_id
+        self.query = query
+        self.start = start
+        self.seen_ids = seen_ids if seen_ids is not None else set()
+        self.jobs = jobs if jobs is not None else []
+        self.pages = pages
+
+
+class CrawlCheckpointStore:
+    """Redis checkpoints for long scrapes.
+
+    A crawl is stored as crawl:{id} (query, next page offset, pages done),
+    crawl:{id}:seen (job IDs already collected) and crawl:{id}:jobs (the
+    partial results, one JSON job per entry). `save_page` appends a page
+    and advances the offset in one MULTI/EXEC, so a checkpoint never holds
+    a page's jobs without its offset or the reverse. Whoever picks the
+    crawl up next (a restarted worker, a retry, another consumer claiming
+    the message) continues from the last completed page.
+    """
+
+    def __init__(self, redis_client, ttl_seconds: int = CRAWL_CHECKPOINT_TTL):
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    def _keys(self, crawl_id: str):
+        key = f"{CRAWL_KEY_PREFIX}{crawl_id}"
+        return key, f"{key}:seen", f"{key}:jobs"
+
+    async def load(self, crawl_id: str) -> Optional[CrawlState]:
+        """The saved state of a crawl, or None if it never started or expired"""
+        key, seen_key, jobs_key = self._keys(crawl_id)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.hgetall(key)
+        pipeline.smembers(seen_key)
+        pipeline.lrange(jobs_key, 0, -1)
+        checkpoint, seen_ids, jobs = await pipeline.execute()
+        if not checkpoint:
+            return None
+        return CrawlState(
+            crawl_id,
+            query=json.loads(checkpoint.get('query', '{}')),
+            start=int(checkpoint.get('start', 0)),
+            seen_ids=set(seen_ids),
+            jobs=[json.loads(job) for job in jobs],
+            pages=int(checkpoint.get('pages', 0))
+        )
+
+    async def begin(self, crawl_id: str, query: Dict) -> CrawlState:
+        """Resume a crawl from its checkpoint, or start it from page one"""
+        state = await self.load(crawl_id)
+        if state is not None:
+            logger.info(f"⏯️  Resuming crawl {crawl_id} at start={state.start} "
+                        f"with {len(state.jobs)} jobs from {state.pages} pages")
+            return state
+
+        key, _, _ = self._keys(crawl_id)
+        await self.redis_client.hset(key, mapping={
+            'query': json.dumps(query),
+            'start': 0,
+            'pages': 0,
+            'created_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat()
+        })
+        await self.redis_client.expire(key, self.ttl_seconds)
+        return CrawlState(crawl_id, query)
+
+    async def save_page(self, state: CrawlState, next_start: int, page_jobs: List[Dict]):
+        """Record a completed page and advance `state` to match"""
+        key, seen_key, jobs_key = self._keys(state.crawl_id)
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.hset(key, mapping={
+            'start': next_start,
+            'pages': state.pages + 1,
+            'updated_at': datetime.now().isoformat()
+        })
+        if page_jobs:
+            pipeline.sadd(seen_key, *(job['job_id'] for job in page_jobs))
+            pipeline.rpush(jobs_key, *(json.dumps(job) for job in page_jobs))
+        for checkpoint_key in (key, seen_key, jobs_key):
+            pipeline.expire(checkpoint_key, self.ttl_seconds)
+        await pipeline.execute()
+
+        state.start = next_start
+        state.pages += 1
+        state.jobs.extend(page_jobs)
+        state.seen_ids.update(job['job_id'] for job in page_jobs)
+
+    async def finish(self, crawl_id: str):
+        """Drop the checkpoint once the results are stored or the crawl is abandoned"""
+        await self.redis_client.delete(*self._keys(crawl_id))
@@ -1,9 +1,11 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from bson import ObjectId
 import os
 import json
 import redis.asyncio as redis
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from dotenv import load_dotenv
 import logging
 from datetime import datetime, timedelta
@@ -15,6 +17,22 @@ import time
 from functools import lru_cache
 import weakref
 
+from app.core.rate_limiter import RateLimiter, DAILY_SWIPE_LIMIT
+from app.core.actions import (
+    ACTION_BITS, ACTION_TIMESTAMP_FIELDS, INTERACTIONS_COLLECTION, action_mask, build_action_write,
+    build_interaction_write, collection_for_action
+)
+from app.core.write_behind import SwipeWriteBuffer, SWIPE_WRITE_MODE
+from app.core.exclusion import ExclusionIndex
+from app.core.indexes import INDEX_REGISTRY, apply_indexes, verify_query_plans
+from app.utils.pagination import encode_cursor, keyset_query
+from app.core.snapshots import JobSnapshotStore, SNAPSHOTS_COLLECTION, build_snapshot_write
+from app.core.ingestion import INGEST_MAX_JOBS, IngestionWorker, ScrapeQueue
+from app.core.job_cache import AsyncJobDataCache
+from app.core.payload_cache import RECORD_VERSION_FIELD
+from app.services.company_matcher import trusted_company_matcher
+from app.services.skill_extractor import skill_extractor
+
 logger = logging.getLogger(__name__)
 
 load_dotenv()
@@ -54,7 +72,27 @@ class Database:
         self.mongo_db = self.mongo_client.Jobs
         # Connect to users database for user profiles and skills
         self.users_db = self.mongo_client.users
-        self.scraper = None
+
+        # Redis-backed rate limiting; counters are mirrored to user_swipe_limits
+        self.rate_limiter = RateLimiter(
+            self.redis_client, audit_collection=self.users_db.user_swipe_limits)
+
+        # Per-user Redis index of interacted jobs, rebuilt from Mongo when cold
+        self.exclusions = ExclusionIndex(self.redis_client, self.get_excluded_job_ids)
+
+        # Shared job snapshots referenced from liked/saved job documents
+        self.snapshots = JobSnapshotStore(self.users_db[SNAPSHOTS_COLLECTION])
+
+        # Optional write-behind buffer for swipe persistence (SWIPE_WRITE_MODE)
+        self.swipe_writer = SwipeWriteBuffer(
+            self.users_db, self.redis_client, mode=SWIPE_WRITE_MODE,
+            exclusions=self.exclusions, snapshots=self.snapshots)
+
+        # Scrape requests for the background ingestion worker
+        self.scrape_queue = ScrapeQueue(self.redis_client)
+
+        # Scraped-job cache on the shared Redis pool
+        self.job_cache = AsyncJobDataCache(self.redis_client)
 
         # Serverless-optimized performance settings
         self._cache = {}  # Simple in-memory cache
@@ -75,10 +113,11 @@ class Database:
 
     # ===== NEW: SWIPE LIMIT TRACKING METHODS =====
 
-    async def check_and_increment_swipe_limit(self, user_id: str) -> dict:
+    async def check_and_increment_swipe_limit(self, user_id: str, cost: int = 1) -> dict:
         """
-        Check if user has reached daily swipe limit (20 swipes per 24 hours).
-        If not, increment the swipe count.
+        Check if user has reached daily swipe limit (DAILY_SWIPE_LIMIT per UTC day).
+        If not, increment the swipe count by `cost`.
+        Counters live in Redis; user_swipe_limits is written asynchronously for audit.
         Returns: {
             "allowed": bool,
             "remaining": int,
@@ -86,80 +125,100 @@ class Database:
             "total_today": int
         }
         """
+        try:
+            check = await self.rate_limiter.hit("swipe", user_id, cost=cost)
+            total_today = check["limit"] - check["remaining"]
+
+            if not check["allowed"]:
+                logger.warning(
+                    f"🚫 User {user_id[:8]}... reached daily swipe limit ({total_today}/{check['limit']})")
+            else:
+                logger.info(
+                    f"✅ Swipe counted: user={user_id[:8]}..., count={total_today}/{check['limit']}, remaining={check['remaining']}")
+
+            return {
+                "allowed": check["allowed"],
+                "remaining": check["remaining"],
+                "reset_at": check["reset_at"],
+                "total_today": total_today,
+                "limit": check["limit"]
+            }
+
+        except Exception as e:
+            logger.warning(
+                f"⚠️  Redis swipe limiter unavailable, falling back to MongoDB: {e}")
+            return await self._check_and_increment_swipe_limit_mongo(user_id, cost)
+
+    async def _check_and_increment_swipe_limit_mongo(self, user_id: str, cost: int = 1) -> dict:
+        """MongoDB-only swipe limit check, used when Redis is unreachable"""
         try:
             collection = self.users_db.user_swipe_limits
             now = datetime.utcnow()
             today_start = datetime(now.year, now.month,
                                    now.day)  # Midnight UTC
             tomorrow_start = today_start + timedelta(days=1)
+            limit = DAILY_SWIPE_LIMIT
 
-            # Find or create today's swipe limit document
-            swipe_doc = await collection.find_one({
-                "user_id": user_id,
-                "date": today_start
-            })
-
-            if not swipe_doc:
-                # Create new document for today
-                swipe_doc = {
-                    "user_id": user_id,
-                    "date": today_start,
-                    "swipe_count": 0,
-                    "reset_at": tomorrow_start,
-                    "created_at": now,
-                    "updated_at": now
-                }
-                await collection.insert_one(swipe_doc)
-                logger.info(
-                    f"📊 Created new swipe limit document for user: {user_id[:8]}...")
-
-            current_count = swipe_doc.get("swipe_count", 0)
-            limit = 20
-
-            # Check if limit reached
-            if current_count >= limit:
+            if cost > limit:
+                # The filter below would match nothing and the upsert would
+                # insert swipe_count=cost; refuse and report what still fits
                 logger.warning(
-                    f"🚫 User {user_id[:8]}... reached daily swipe limit ({current_count}/{limit})")
+                    f"🚫 User {user_id[:8]}... asked for {cost} swipes, over the daily limit ({limit})")
+                status = await self._get_swipe_limit_status_mongo(user_id)
                 return {
                     "allowed": False,
-                    "remaining": 0,
-                    "reset_at": tomorrow_start,
-                    "total_today": current_count,
-                    "limit": limit
+                    "remaining": status["remaining"],
+                    "reset_at": status["reset_at"],
+                    "total_today": status["total_today"],
+                    "limit": status["limit"]
                 }
 
-            # Increment swipe count
-            result = await collection.update_one(
-                {"user_id": user_id, "date": today_start},
+            # Atomically increment only while the count stays within the limit
+            swipe_doc = await collection.find_one_and_update(
                 {
-                    "$inc": {"swipe_count": 1},
-                    "$set": {"updated_at": now}
-                }
+                    "user_id": user_id,
+                    "date": today_start,
+                    "swipe_count": {"$lte": limit - cost}
+                },
+                {
+                    "$inc": {"swipe_count": cost},
+                    "$set": {"updated_at": now, "reset_at": tomorrow_start},
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
             )
-
-            new_count = current_count + 1
-            remaining = limit - new_count
-
-            logger.info(
-                f"✅ Swipe counted: user={user_id[:8]}..., count={new_count}/{limit}, remaining={remaining}")
+            new_count = swipe_doc.get("swipe_count", cost)
 
             return {
                 "allowed": True,
-                "remaining": remaining,
+                "remaining": max(0, limit - new_count),
                 "reset_at": tomorrow_start,
                 "total_today": new_count,
                 "limit": limit
             }
 
+        except DuplicateKeyError:
+            # The filter missed because the count is already at the limit
+            logger.warning(
+                f"🚫 User {user_id[:8]}... reached daily swipe limit ({DAILY_SWIPE_LIMIT})")
+            status = await self._get_swipe_limit_status_mongo(user_id)
+            return {
+                "allowed": False,
+                "remaining": status["remaining"],
+                "reset_at": status["reset_at"],
+                "total_today": status["total_today"],
+                "limit": status["limit"]
+            }
         except Exception as e:
             logger.error(f"❌ Failed to check/increment swipe limit: {e}")
             # On error, allow the swipe (fail-open approach)
             return {
                 "allowed": True,
-                "remaining": 20,
+                "remaining": DAILY_SWIPE_LIMIT,
                 "reset_at": datetime.utcnow() + timedelta(days=1),
                 "total_today": 0,
-                "limit": 20,
+                "limit": DAILY_SWIPE_LIMIT,
                 "error": str(e)
             }
 
@@ -173,6 +232,21 @@ class Database:
             "reset_at": datetime
         }
         """
+        try:
+            check = await self.rate_limiter.peek("swipe", user_id)
+            return {
+                "remaining": check["remaining"],
+                "total_today": check["limit"] - check["remaining"],
+                "limit": check["limit"],
+                "reset_at": check["reset_at"]
+            }
+        except Exception as e:
+            logger.warning(
+                f"⚠️  Redis swipe limiter unavailable, reading MongoDB: {e}")
+            return await self._get_swipe_limit_status_mongo(user_id)
+
+    async def _get_swipe_limit_status_mongo(self, user_id: str) -> dict:
+        """Read today's swipe count from user_swipe_limits"""
         try:
             collection = self.users_db.user_swipe_limits
             now = datetime.utcnow()
@@ -184,7 +258,7 @@ class Database:
                 "date": today_start
             })
 
-            limit = 20
+            limit = DAILY_SWIPE_LIMIT
             total_today = swipe_doc.get("swipe_count", 0) if swipe_doc else 0
             remaining = max(0, limit - total_today)
 
@@ -198,9 +272,9 @@ class Database:
         except Exception as e:
             logger.error(f"❌ Failed to get swipe limit status: {e}")
             return {
-                "remaining": 20,
+                "remaining": DAILY_SWIPE_LIMIT,
                 "total_today": 0,
-                "limit": 20,
+                "limit": DAILY_SWIPE_LIMIT,
                 "reset_at": datetime.utcnow() + timedelta(days=1),
                 "error": str(e)
             }
@@ -230,28 +304,9 @@ class Database:
 
     async def ensure_swipe_limit_indexes(self):
         """Create indexes for swipe limit collection"""
-        try:
-            collection = self.users_db.user_swipe_limits
-
-            # Compound index on user_id and date for fast lookups
-            await collection.create_index(
-                [("user_id", 1), ("date", 1)],
-                unique=True,
-                name="user_date_unique"
-            )
-            logger.info(
-                "   ✅ Unique compound index: (user_id, date) for swipe limits")
-
-            # TTL index to auto-delete old documents after 7 days
-            await collection.create_index(
-                [("date", 1)],
-                expireAfterSeconds=7*24*3600,  # 7 days in seconds
-                name="date_ttl"
-            )
-            logger.info("   ✅ TTL index: date (7 days) for auto-cleanup")
-
-        except Exception as e:
-            logger.warning(f"⚠️  Swipe limit index creation warning: {e}")
+        await apply_indexes(
+            self._index_databases(),
+            [spec for spec in INDEX_REGISTRY if spec.collection == "user_swipe_limits"])
 
     # ===== END OF NEW SWIPE LIMIT METHODS =====
 
@@ -297,70 +352,34 @@ class Database:
 
         return user
 
-    async def ensure_indexes(self):
-        """Create unique indexes to prevent duplicate job actions and setup swipe limits"""
-        try:
-            # Create unique compound index on user_job_actions collection
-            # This ensures no duplicate (user_id, job_id, action) combinations
-            await self.users_db.user_job_actions.create_index(
-                [("user_id", 1), ("job_id", 1), ("action", 1)],
-                unique=True,
-                name="unique_user_job_action"
-            )
-            logger.info(
-                "   ✅ Unique compound index: (user_id, job_id, action)")
-
-            # Create index on user_id for faster queries
-            await self.users_db.user_job_actions.create_index(
-                [("user_id", 1)],
-                name="user_id_index"
-            )
-            logger.info("   ✅ Index: user_id")
-
-            # Create index on action for faster filtering
-            await self.users_db.user_job_actions.create_index(
-                [("action", 1)],
-                name="action_index"
-            )
-            logger.info("   ✅ Index: action")
-
-            # NEW: Ensure swipe limit indexes
-            await self.ensure_swipe_limit_indexes()
+    def _index_databases(self) -> dict:
+        """Motor databases by the names used in the index registry"""
+        return {"users": self.users_db, "Jobs": self.mongo_db}
 
+    async def ensure_indexes(self) -> dict:
+        """Create every index declared in app.core.indexes.INDEX_REGISTRY"""
+        try:
+            return await apply_indexes(self._index_databases())
         except Exception as e:
             logger.warning(
                 f"⚠️  Index creation warning (indexes may already exist): {e}")
+            return {"created": [], "failed": {"*": str(e)}}
 
-    def _initialize_scraper(self):
-        """Initialize the web scraper only when needed"""
-        if self.scraper is None:
-            try:
-                from app.job_scraper import RedisCachedJobScraper
-
-                redis_parts = redis_uri.split('@')
-                if len(redis_parts) == 2:
-                    auth_part = redis_parts[0].split('//')[1]
-                    host_part = redis_parts[1]
-                    password = auth_part.split(
-                        ':')[1] if ':' in auth_part else None
-                    host = host_part.split(':')[0]
-                    port = int(host_part.split(':')[1].split('/')[0])
-                else:
-                    host = 'localhost'
-                    port = 6379
-                    password = None
-
-                self.scraper = RedisCachedJobScraper(
-                    redis_host=host,
-                    redis_port=port,
-                    redis_password=password,
-                    cache_duration_hours=72
-                )
-                logger.info("Web scraper initialized successfully")
+    async def verify_indexes(self, strict: Optional[bool] = None) -> List[dict]:
+        """explain() the hot query shapes; see app.core.indexes.verify_query_plans"""
+        if strict is None:
+            return await verify_query_plans(self._index_databases())
+        return await verify_query_plans(self._index_databases(), strict=strict)
 
-            except Exception as e:
-                logger.error(f"Failed to initialize web scraper: {e}")
-                self.scraper = None
+    def build_ingestion_worker(self) -> IngestionWorker:
+        """Worker that drains scrape_queue; see `python -m app.cli ingest-worker`"""
+        from app.async_scraper import AsyncLinkedInJobScraper
+        from app.core.host_limiter import HostRateLimiter
+
+        engine = AsyncLinkedInJobScraper(
+            limiter=HostRateLimiter(redis_client=self.redis_client),
+            detail_cache=self.job_cache)
+        return IngestionWorker(self.redis_client, self.job_cache, engine)
 
     def _normalize_employment_type(self, employment_type: str) -> str:
         """Convert employment type to expected enum values"""
@@ -540,7 +559,8 @@ class Database:
                     "_id": 1, "employer_id": 1, "title": 1, "description": 1,
                     "employment_type": 1, "location": 1, "skills_required": 1,
                     "requirements": 1, "category": 1, "source": 1, "created_at": 1,
-                    "posted_at": 1, "salary": 1, "company": 1, "url": 1, "experience_level": 1
+                    "posted_at": 1, "salary": 1, "company": 1, "url": 1, "experience_level": 1,
+                    "updated_at": 1, "skills_version": 1, "extracted_skills": 1
                 }
             ).to_list(200)  # Increased limit for all locations
 
@@ -702,7 +722,9 @@ class Database:
             except Exception as e:
                 print(f"❌ Error fetching Redis jobs: {e}")
 
-        # ============= STEP 3: WEB SCRAPING (MINIMAL) =============
+        # ============= STEP 3: WEB SCRAPING (BACKGROUND) =============
+        # Scraping never runs in the request: the query is queued for the
+        # ingestion worker and its results show up in Redis (step 2) later.
         remaining_needed = limit - len(all_jobs)
 
         # Scraping threshold - much higher for "All Locations"
@@ -712,33 +734,22 @@ class Database:
 
         if should_scrape or force_scrape:
             try:
-                print(f"\n🕷️  STEP 3: Web scraping...")
-                self._initialize_scraper()
-
-                if self.scraper:
-                    scrape_location = "United States" if location.lower() == "usa" else location
-                    max_scrape = min(remaining_needed, 50)
-
-                    scraped_jobs = self.scraper.get_jobs(
-                        keywords=keywords,
-                        location=scrape_location,
-                        max_jobs=max_scrape,
-                        job_type_filter=job_type_filter,
-                        category_filter=category_filter,
-                        trusted_only=trusted_only,
-                        force_refresh=force_scrape
-                    )
-
-                    for job in scraped_jobs:
-                        converted_job = self._convert_scraped_job_format(job)
-                        if converted_job:
-                            converted_job["source"] = "fresh_scraped"
-                            converted_job["priority"] = 0.5
-                            all_jobs.append(converted_job)
-
-                    print(f"✅ Added {len(scraped_jobs)} fresh jobs")
+                scrape_location = "United States" if location.lower() == "usa" else location
+                queued = await self.scrape_queue.enqueue(
+                    keywords=keywords,
+                    location=scrape_location,
+                    max_jobs=INGEST_MAX_JOBS,
+                    job_type_filter=job_type_filter,
+                    category_filter=category_filter,
+                    trusted_only=trusted_only,
+                    force_refresh=force_scrape
+                )
+                if queued:
+                    print(f"\n📨 STEP 3: Queued background scrape for '{keywords}' in {scrape_location}")
+                else:
+                    print(f"\n📨 STEP 3: Scrape for '{keywords}' already queued")
             except Exception as e:
-                print(f"❌ Scraping error: {e}")
+                print(f"❌ Could not queue scrape: {e}")
         else:
             print(
                 f"\n⏸️  STEP 3: Skipping scraping (have {len(all_jobs)} jobs)")
@@ -831,8 +842,7 @@ class Database:
                     return False
 
             if trusted_only:
-                is_trusted = job_data.get('is_trusted_company', False)
-                if not is_trusted:
+                if not trusted_company_matcher.is_trusted(job_data.get('company', '')):
                     return False
 
             return True
@@ -943,6 +953,9 @@ class Database:
                 else:
                     skills = [skill.strip() for skill in job_data['skills_required'].split(
                         ',') if skill.strip()]
+            if not skills:
+                # Written at ingest by backfill_job_skills
+                skills = job_data.get('extracted_skills') or []
 
             location_data = job_data.get('location', {})
             if isinstance(location_data, str):
@@ -958,8 +971,13 @@ class Database:
             if isinstance(salary_data, str):
                 salary_data = self._parse_salary_string(salary_data)
 
+            # Write-time stamp for the payload caches; unstamped postings are hashed
+            written_at = job_data.get("updated_at") or job_data.get("created_at")
+            version = f"{written_at}|{job_data.get('skills_version') or ''}" if written_at else None
+
             return {
                 "id": str(job_data.get("_id", "")),
+                RECORD_VERSION_FIELD: version,
                 "employer_id": job_data.get("employer_id", ""),
                 "title": job_data.get("title", ""),
                 "description": job_data.get("description", ""),
@@ -1111,6 +1129,8 @@ class Database:
             # Create a robust job object with all required fields
             job_obj = {
                 "id": str(job_id),
+                # save_job_to_redis rewrites created_at on every save
+                RECORD_VERSION_FIELD: job_data.get('created_at'),
                 "employer_id": job_data.get('company', 'unknown'),
                 "title": job_data.get('title', 'Untitled Job'),
                 "description": job_data.get('description', job_data.get('responsibilities', 'No description available')),
@@ -1128,7 +1148,8 @@ class Database:
                 "url": job_data.get('url', ''),
                 "experience_level": job_data.get('experience_level', 'Not specified'),
                 "category": job_data.get('category', 'General'),
-                "is_trusted_company": job_data.get('is_trusted_company', False)
+                # Redis hashes don't store the flag; derive it from the name
+                "is_trusted_company": trusted_company_matcher.is_trusted(job_data.get('company', ''))
             }
 
             return job_obj
@@ -1151,11 +1172,56 @@ class Database:
         return swipes
 
     async def get_job_by_id(self, job_id: str) -> Optional[dict]:
-        """Get job details by ID from Redis"""
-        job_data = await self.redis_client.get(f"job:{job_id}")
-        if job_data:
-            return json.loads(job_data)
-        return None
+        """Get job details by ID from Redis, falling back to Jobs/jobs-lists"""
+        return (await self.resolve_jobs([job_id])).get(job_id)
+
+    async def resolve_jobs(self, job_ids: List[str]) -> dict:
+        """Converted job dicts for many ids in at most two round trips.
+
+        One Redis pipeline issues HGETALL (scraped jobs are hashes) and GET
+        (JSON strings) per id; raise_on_error=False turns the WRONGTYPE reply
+        for the other format into a skipped result. Ids still unresolved and
+        shaped like ObjectIds are then fetched from jobs-lists with one $in.
+        Returns {job_id: job}; unknown ids are absent.
+        """
+        job_ids = [job_id for job_id in dict.fromkeys(job_ids) if job_id]
+        resolved = {}
+        if not job_ids:
+            return resolved
+
+        try:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for job_id in job_ids:
+                pipeline.hgetall(f"job:{job_id}")
+                pipeline.get(f"job:{job_id}")
+            replies = await pipeline.execute(raise_on_error=False)
+
+            for index, job_id in enumerate(job_ids):
+                hash_data, string_data = replies[2 * index], replies[2 * index + 1]
+                job = None
+                if isinstance(hash_data, dict) and hash_data:
+                    job = self._convert_scraped_job(hash_data)
+                elif isinstance(string_data, str) and string_data:
+                    job = self._convert_job_data(json.loads(string_data))
+                if job:
+                    job["id"] = job_id
+                    resolved[job_id] = job
+        except Exception as e:
+            logger.error(f"Failed to resolve jobs from Redis: {e}")
+
+        object_ids = [ObjectId(job_id) for job_id in job_ids
+                      if job_id not in resolved and ObjectId.is_valid(job_id)]
+        if object_ids:
+            try:
+                cursor = self.mongo_db["jobs-lists"].find({"_id": {"$in": object_ids}})
+                async for doc in cursor:
+                    job = self._convert_jobs_lists_job(doc)
+                    if job:
+                        resolved[str(doc["_id"])] = job
+            except Exception as e:
+                logger.error(f"Failed to resolve jobs from MongoDB: {e}")
+
+        return resolved
 
     async def enqueue_user_jobs(self, clerk_id: str, jobs: List[dict]) -> int:
         """Enqueue related jobs into a per-user Redis list queue.
@@ -1205,39 +1271,63 @@ class Database:
     async def get_scraper_stats(self) -> dict:
         """Get web scraper statistics"""
         try:
-            self._initialize_scraper()
-            if self.scraper:
-                return {
-                    "cache_status": self.scraper.get_cache_status(),
-                    "job_statistics": self.scraper.get_job_statistics(),
-                    "redis_health": self.scraper.get_redis_health(),
-                    "available_categories": self.scraper.get_job_categories(),
-                    "trusted_companies_count": len(self.scraper.get_trusted_companies())
-                }
-            else:
-                return {"error": "Scraper not available"}
+            stats = await self.job_cache.get_scraper_stats()
+            stats["ingest_queue_depth"] = await self.scrape_queue.depth()
+            return stats
         except Exception as e:
             return {"error": str(e)}
 
     async def clear_job_cache(self, expired_only: bool = True) -> dict:
         """Clear job cache"""
         try:
-            self._initialize_scraper()
-            if self.scraper:
-                cleared_count = self.scraper.clear_cache(
-                    expired_only=expired_only)
-                return {
-                    "success": True,
-                    "cleared_count": cleared_count,
-                    "expired_only": expired_only
-                }
+            if expired_only:
+                cleared_count = await self.job_cache.clear_expired_cache()
             else:
-                return {"success": False, "error": "Scraper not available"}
+                cleared_count = await self.job_cache.clear_all_cache()
+            return {
+                "success": True,
+                "cleared_count": cleared_count,
+                "expired_only": expired_only
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     # ===== Separate Collections for Job Actions =====
 
+    async def _record_interaction(self, user_id: str, job_id: str, collection_name: str,
+                                  now: Optional[datetime] = None, remove: bool = False):
+        """Keep the user_job_actions projection and exclusion index in step with a write"""
+        try:
+            query, update = build_interaction_write(
+                user_id, job_id, collection_name, now, remove=remove)
+            if not remove:
+                await asyncio.gather(
+                    self.users_db[INTERACTIONS_COLLECTION].update_one(
+                        query, update, upsert=True),
+                    self.exclusions.add(user_id, [job_id])
+                )
+                return
+
+            # Only un-exclude the job once no action bit is left on it
+            doc = await self.users_db[INTERACTIONS_COLLECTION].find_one_and_update(
+                query, update, projection={"_id": 0, "actions": 1},
+                return_document=ReturnDocument.AFTER)
+            if not doc or not doc.get("actions"):
+                await self.exclusions.remove(user_id, job_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to update interaction projection: {e}")
+
+    async def _store_snapshots(self, snapshots: List[tuple]):
+        """Persist (job_id, job_details) snapshots referenced by action documents"""
+        snapshots = [(job_id, details) for job_id, details in snapshots if details]
+        if not snapshots:
+            return
+        try:
+            await self.snapshots.put_many(snapshots)
+        except Exception as e:
+            # Readers fall back to the job cache for unresolved refs
+            logger.error(f"❌ Failed to store job snapshots: {e}")
+
     async def save_job_saved(self, user_id: str, job_id: str, job_details: dict) -> bool:
         """Save job bookmark with full job details to users_job_saved collection."""
         try:
@@ -1248,19 +1338,13 @@ class Database:
                 f"🔖 Saving job bookmark: user={user_id[:8]}..., job={job_id[:8]}...")
 
             # Prepare document with full job details
-            saved_doc = {
-                "user_id": user_id,
-                "job_id": job_id,
-                "job_details": job_details,
-                "saved_at": now,
-                "created_at": now,
-                "updated_at": now
-            }
+            _, query, update = build_action_write(
+                "save", user_id, job_id, job_details, now)
 
-            result = await collection.update_one(
-                {"user_id": user_id, "job_id": job_id},
-                {"$set": saved_doc},
-                upsert=True,
+            result, *_ = await asyncio.gather(
+                collection.update_one(query, update, upsert=True),
+                self._record_interaction(user_id, job_id, "users_job_saved", now),
+                self._store_snapshots([(job_id, job_details)])
             )
 
             if result.upserted_id:
@@ -1288,19 +1372,13 @@ class Database:
                 f"💚 Saving job like: user={user_id[:8]}..., job={job_id[:8]}...")
 
             # Prepare document with full job details
-            like_doc = {
-                "user_id": user_id,
-                "job_id": job_id,
-                "job_details": job_details,
-                "liked_at": now,
-                "created_at": now,
-                "updated_at": now
-            }
+            _, query, update = build_action_write(
+                "like", user_id, job_id, job_details, now)
 
-            result = await collection.update_one(
-                {"user_id": user_id, "job_id": job_id},
-                {"$set": like_doc},
-                upsert=True,
+            result, *_ = await asyncio.gather(
+                collection.update_one(query, update, upsert=True),
+                self._record_interaction(user_id, job_id, "users_job_like", now),
+                self._store_snapshots([(job_id, job_details)])
             )
 
             if result.upserted_id:
@@ -1328,17 +1406,12 @@ class Database:
                 f"👎 Saving job dislike: user={user_id[:8]}..., job={job_id[:8]}...")
 
             # Minimal document - only user_id and job_id
-            dislike_doc = {
-                "user_id": user_id,
-                "job_id": job_id,
-                "disliked_at": now,
-                "created_at": now
-            }
+            _, query, update = build_action_write(
+                "dislike", user_id, job_id, now=now)
 
-            result = await collection.update_one(
-                {"user_id": user_id, "job_id": job_id},
-                {"$set": dislike_doc},
-                upsert=True,
+            result, _ = await asyncio.gather(
+                collection.update_one(query, update, upsert=True),
+                self._record_interaction(user_id, job_id, "users_job_dislike", now)
             )
 
             if result.upserted_id:
@@ -1380,14 +1453,81 @@ class Database:
             logger.error(f"❌ Failed to save user job action: {e}")
             return False
 
+    async def save_user_job_actions_bulk(self, user_id: str, swipes: List[dict]) -> List[bool]:
+        """Persist an ordered list of swipes with one bulk_write per collection.
+
+        Each swipe is {"action", "job_id", "job_details"}. Returns one success
+        flag per swipe, in input order.
+        """
+        now = datetime.utcnow()
+        results = [False] * len(swipes)
+        grouped = {}
+
+        interaction_ops = []
+
+        for index, swipe in enumerate(swipes):
+            collection_name, query, update = build_action_write(
+                swipe["action"], user_id, swipe["job_id"], swipe.get("job_details"), now)
+            grouped.setdefault(collection_name, []).append(
+                (index, UpdateOne(query, update, upsert=True)))
+            interaction_ops.append(UpdateOne(
+                *build_interaction_write(user_id, swipe["job_id"], collection_name, now),
+                upsert=True))
+
+        async def write_collection(collection_name: str, entries: list):
+            try:
+                await self.users_db[collection_name].bulk_write(
+                    [op for _, op in entries], ordered=True)
+                for index, _ in entries:
+                    results[index] = True
+            except BulkWriteError as e:
+                # Ordered writes stop at the first error; earlier ops succeeded
+                write_errors = e.details.get("writeErrors", [])
+                failed_at = min((err["index"] for err in write_errors), default=0)
+                for position, (index, _) in enumerate(entries):
+                    results[index] = position < failed_at
+                logger.error(
+                    f"❌ Bulk write to {collection_name} failed at op {failed_at}: {write_errors[:1]}")
+            except Exception as e:
+                logger.error(f"❌ Bulk write to {collection_name} failed: {e}")
+
+        async def write_interactions():
+            try:
+                await self.users_db[INTERACTIONS_COLLECTION].bulk_write(
+                    interaction_ops, ordered=False)
+            except Exception as e:
+                logger.error(f"❌ Failed to update interaction projection: {e}")
+
+        await asyncio.gather(
+            write_interactions(),
+            self.exclusions.add(user_id, [swipe["job_id"] for swipe in swipes]),
+            self._store_snapshots(
+                [(swipe["job_id"], swipe.get("job_details")) for swipe in swipes]),
+            *[write_collection(name, entries) for name, entries in grouped.items()]
+        )
+
+        logger.info(
+            f"✅ Bulk saved {sum(results)}/{len(swipes)} swipes for user={user_id[:8]}... "
+            f"across {len(grouped)} collections")
+        return results
+
     async def remove_saved_job(self, user_id: str, job_id: str) -> bool:
         """Remove a saved job document for a user from users_job_saved collection."""
         try:
             logger.info(
                 f"🗑️  Removing saved job: user={user_id[:8]}..., job={job_id[:8]}...")
 
-            result = await self.users_db.users_job_saved.delete_one(
-                {"user_id": user_id, "job_id": job_id}
+            if self.swipe_writer.enabled:
+                # Ordered behind any still-buffered upsert for this job
+                await self.swipe_writer.submit_removal("users_job_saved", user_id, job_id)
+                return True
+
+            result, _ = await asyncio.gather(
+                self.users_db.users_job_saved.delete_one(
+                    {"user_id": user_id, "job_id": job_id}
+                ),
+                self._record_interaction(
+                    user_id, job_id, "users_job_saved", remove=True)
             )
 
             if result.deleted_count > 0:
@@ -1407,8 +1547,17 @@ class Database:
             logger.info(
                 f"🗑️  Removing job like: user={user_id[:8]}..., job={job_id[:8]}...")
 
-            result = await self.users_db.users_job_like.delete_one(
-                {"user_id": user_id, "job_id": job_id}
+            if self.swipe_writer.enabled:
+                # Ordered behind any still-buffered upsert for this job
+                await self.swipe_writer.submit_removal("users_job_like", user_id, job_id)
+                return True
+
+            result, _ = await asyncio.gather(
+                self.users_db.users_job_like.delete_one(
+                    {"user_id": user_id, "job_id": job_id}
+                ),
+                self._record_interaction(
+                    user_id, job_id, "users_job_like", remove=True)
             )
 
             if result.deleted_count > 0:
@@ -1428,8 +1577,17 @@ class Database:
             logger.info(
                 f"🗑️  Removing job dislike: user={user_id[:8]}..., job={job_id[:8]}...")
 
-            result = await self.users_db.users_job_dislike.delete_one(
-                {"user_id": user_id, "job_id": job_id}
+            if self.swipe_writer.enabled:
+                # Ordered behind any still-buffered upsert for this job
+                await self.swipe_writer.submit_removal("users_job_dislike", user_id, job_id)
+                return True
+
+            result, _ = await asyncio.gather(
+                self.users_db.users_job_dislike.delete_one(
+                    {"user_id": user_id, "job_id": job_id}
+                ),
+                self._record_interaction(
+                    user_id, job_id, "users_job_dislike", remove=True)
             )
 
             if result.deleted_count > 0:
@@ -1453,41 +1611,15 @@ class Database:
                 logger.debug(f"📋 Cache hit for saved jobs: {user_id[:8]}...")
                 return cached_jobs
 
-            # Fetch from database with concurrent operations
-            cursor = self.users_db.users_job_saved.find({"user_id": user_id})
+            cursor = self.users_db.users_job_saved.find(
+                {"user_id": user_id}, self._action_list_projection("users_job_saved"))
             items = [doc async for doc in cursor]
 
             if not items:
                 self._set_cache(cache_key, [])
                 return []
 
-            # Process jobs concurrently
-            async def process_job_doc(doc):
-                job_details = doc.get("job_details", {})
-                if job_details:
-                    return {
-                        "id": doc.get("job_id"),
-                        "saved_at": doc.get("saved_at"),
-                        **job_details
-                    }
-                else:
-                    # Fallback: try to get job from main collection
-                    job_id = doc.get("job_id")
-                    job_data = await self.get_job_by_id(job_id)
-                    if job_data:
-                        job_obj = self._convert_job_data(job_data)
-                        if job_obj:
-                            return {
-                                "id": job_id,
-                                "saved_at": doc.get("saved_at"),
-                                **job_obj
-                            }
-                return None
-
-            # Process all jobs concurrently
-            results = await asyncio.gather(*[process_job_doc(doc) for doc in items])
-            final_results = [
-                result for result in results if result is not None]
+            final_results = await self._format_job_action_docs(items, "saved_at")
 
             # Cache the results
             self._set_cache(cache_key, final_results)
@@ -1499,60 +1631,195 @@ class Database:
             logger.error(f"Failed to fetch saved jobs: {e}")
             return []
 
+    def _action_list_projection(self, collection_name: str) -> dict:
+        """Only the fields list reads use; skips created_at/updated_at and the like"""
+        projection = {"user_id": 1, "job_id": 1, ACTION_TIMESTAMP_FIELDS[collection_name]: 1}
+        if collection_name != "users_job_dislike":
+            projection.update({"job_ref": 1, "job_details": 1})
+        return projection
+
+    async def _format_job_action_docs(self, docs: List[dict], timestamp_field: str,
+                                      attached: bool = False) -> List[dict]:
+        """Turn liked/saved documents into job dicts with full job details.
+
+        Pass `attached=True` when snapshots.attach already ran on `docs`.
+        """
+        if not attached:
+            docs = await self.snapshots.attach(docs)
+
+        # Documents without stored details are resolved in one batch
+        fallback = await self.resolve_jobs(
+            [str(doc.get("job_id")) for doc in docs
+             if not doc.get("job_details") and doc.get("job_id")])
+
+        results: List[dict] = []
+        for doc in docs:
+            job_details = doc.get("job_details") or fallback.get(str(doc.get("job_id")))
+            if job_details:
+                results.append({
+                    "id": doc.get("job_id"),
+                    timestamp_field: doc.get(timestamp_field),
+                    **job_details
+                })
+
+        return results
+
+    async def _get_action_page(self, collection_name: str, user_id: str, limit: int,
+                               cursor: Optional[str] = None) -> tuple:
+        """One keyset page of a user's documents, newest first.
+
+        Sorted on (timestamp, _id) descending, served by the
+        (user_id, timestamp, _id) index. Returns (docs, next_cursor);
+        next_cursor is None on the last page. Raises ValueError for a
+        malformed cursor.
+        """
+        field = ACTION_TIMESTAMP_FIELDS[collection_name]
+        query = keyset_query({"user_id": user_id}, field, cursor)
+        docs = await self.users_db[collection_name].find(
+            query, self._action_list_projection(collection_name)
+        ).sort([(field, -1), ("_id", -1)]).limit(limit + 1).to_list(limit + 1)
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1].get(field), docs[-1]["_id"])
+        return docs, next_cursor
+
+    async def get_user_job_lists(self, user_id: str, limit: int) -> dict:
+        """First page of the saved, liked and disliked lists in one aggregation.
+
+        Each collection contributes its newest `limit + 1` documents through
+        $unionWith (index-backed sort per branch); $facet splits them back
+        out. Returns {"saved"|"liked"|"disliked": {"items", "next_cursor"}},
+        matching the paginated list endpoints.
+        """
+        kinds = {
+            "users_job_saved": "saved",
+            "users_job_like": "liked",
+            "users_job_dislike": "disliked",
+        }
+
+        def branch(collection_name: str) -> list:
+            field = ACTION_TIMESTAMP_FIELDS[collection_name]
+            projection = self._action_list_projection(collection_name)
+            projection.update({"kind": {"$literal": kinds[collection_name]}})
+            return [
+                {"$match": {"user_id": user_id}},
+                {"$sort": {field: -1, "_id": -1}},
+                {"$limit": limit + 1},
+                {"$project": projection},
+            ]
+
+        pipeline = branch("users_job_saved")
+        for collection_name in ("users_job_like", "users_job_dislike"):
+            pipeline.append({"$unionWith": {"coll": collection_name,
+                                            "pipeline": branch(collection_name)}})
+        pipeline.append({"$facet": {
+            kind: [{"$match": {"kind": kind}}] for kind in kinds.values()
+        }})
+
+        facets = (await self.users_db.users_job_saved.aggregate(pipeline).to_list(1) or [{}])[0]
+
+        pages = {}
+        for collection_name, kind in kinds.items():
+            field = ACTION_TIMESTAMP_FIELDS[collection_name]
+            docs = facets.get(kind, [])
+            next_cursor = None
+            if len(docs) > limit:
+                docs = docs[:limit]
+                next_cursor = encode_cursor(docs[-1].get(field), docs[-1]["_id"])
+            pages[kind] = {"docs": docs, "next_cursor": next_cursor}
+
+        # One snapshot lookup for both job lists
+        await self.snapshots.attach(pages["saved"]["docs"] + pages["liked"]["docs"])
+        saved, liked = await asyncio.gather(
+            self._format_job_action_docs(pages["saved"]["docs"], "saved_at", attached=True),
+            self._format_job_action_docs(pages["liked"]["docs"], "liked_at", attached=True))
+
+        return {
+            "saved": {"items": saved, "next_cursor": pages["saved"]["next_cursor"]},
+            "liked": {"items": liked, "next_cursor": pages["liked"]["next_cursor"]},
+            "disliked": {
+                "items": self._format_dislike_docs(pages["disliked"]["docs"]),
+                "next_cursor": pages["disliked"]["next_cursor"]
+            },
+        }
+
+    async def iter_user_action_jobs(self, collection_name: str, user_id: str,
+                                    batch_size: int = 50) -> AsyncIterator[dict]:
+        """Stream a user's liked/saved/disliked list straight off the cursor.
+
+        Documents are formatted `batch_size` at a time, so snapshot refs and
+        fallbacks still resolve in batches while memory stays bounded.
+        """
+        timestamp_field = ACTION_TIMESTAMP_FIELDS[collection_name]
+        cursor = self.users_db[collection_name].find(
+            {"user_id": user_id}, self._action_list_projection(collection_name),
+            batch_size=batch_size)
+
+        async def format_batch(docs: List[dict]) -> List[dict]:
+            if collection_name == "users_job_dislike":
+                return self._format_dislike_docs(docs)
+            return await self._format_job_action_docs(docs, timestamp_field)
+
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                for item in await format_batch(batch):
+                    yield item
+                batch = []
+        if batch:
+            for item in await format_batch(batch):
+                yield item
+
     async def get_user_saved_jobs(self, user_id: str) -> List[dict]:
         """Return saved jobs from users_job_saved collection with full job details."""
         try:
-            cursor = self.users_db.users_job_saved.find({"user_id": user_id})
+            cursor = self.users_db.users_job_saved.find(
+                {"user_id": user_id}, self._action_list_projection("users_job_saved"))
             items = [doc async for doc in cursor]
-            results: List[dict] = []
-
-            for doc in items:
-                job_details = doc.get("job_details", {})
-                if job_details:
-                    # Use the stored job details directly
-                    results.append({
-                        "id": doc.get("job_id"),
-                        "saved_at": doc.get("saved_at"),
-                        **job_details
-                    })
-                else:
-                    # Fallback: try to get job from main collection
-                    job_id = doc.get("job_id")
-                    job_data = await self.get_job_by_id(job_id)
-                    if job_data:
-                        job_obj = self._convert_job_data(job_data)
-                        if job_obj:
-                            results.append({
-                                "id": job_id,
-                                "saved_at": doc.get("saved_at"),
-                                **job_obj
-                            })
-
-            return results
+            return await self._format_job_action_docs(items, "saved_at")
         except Exception as e:
             logger.error(f"Failed to fetch saved jobs: {e}")
             return []
 
+    async def get_user_saved_jobs_page(self, user_id: str, limit: int,
+                                       cursor: Optional[str] = None) -> dict:
+        """One page of saved jobs: {"items": [...], "next_cursor": str | None}"""
+        docs, next_cursor = await self._get_action_page(
+            "users_job_saved", user_id, limit, cursor)
+        return {
+            "items": await self._format_job_action_docs(docs, "saved_at"),
+            "next_cursor": next_cursor
+        }
+
+    def _format_dislike_docs(self, docs: List[dict]) -> List[dict]:
+        # Only return basic info for disliked jobs
+        return [{
+            "job_id": doc.get("job_id"),
+            "disliked_at": doc.get("disliked_at"),
+            "user_id": doc.get("user_id")
+        } for doc in docs]
+
     async def get_user_disliked_jobs(self, user_id: str) -> List[dict]:
         """Return disliked job IDs from users_job_dislike collection (minimal data)."""
         try:
-            cursor = self.users_db.users_job_dislike.find({"user_id": user_id})
+            cursor = self.users_db.users_job_dislike.find(
+                {"user_id": user_id}, self._action_list_projection("users_job_dislike"))
             items = [doc async for doc in cursor]
-            results: List[dict] = []
-
-            for doc in items:
-                # Only return basic info for disliked jobs
-                results.append({
-                    "job_id": doc.get("job_id"),
-                    "disliked_at": doc.get("disliked_at"),
-                    "user_id": doc.get("user_id")
-                })
-
-            return results
+            return self._format_dislike_docs(items)
         except Exception as e:
             logger.error(f"Failed to fetch disliked jobs: {e}")
             return []
 
+    async def get_user_disliked_jobs_page(self, user_id: str, limit: int,
+                                          cursor: Optional[str] = None) -> dict:
+        """One page of disliked job IDs: {"items": [...], "next_cursor": str | None}"""
+        docs, next_cursor = await self._get_action_page(
+            "users_job_dislike", user_id, limit, cursor)
+        return {"items": self._format_dislike_docs(docs), "next_cursor": next_cursor}
+
     async def is_job_disliked(self, user_id: str, job_id: str) -> bool:
         """Check if a job is disliked by the user."""
         try:
@@ -1568,42 +1835,30 @@ class Database:
     async def get_user_liked_jobs(self, user_id: str) -> List[dict]:
         """Return liked jobs from users_job_like collection with full job details."""
         try:
-            cursor = self.users_db.users_job_like.find({"user_id": user_id})
+            cursor = self.users_db.users_job_like.find(
+                {"user_id": user_id}, self._action_list_projection("users_job_like"))
             items = [doc async for doc in cursor]
-            results: List[dict] = []
-
-            for doc in items:
-                job_details = doc.get("job_details", {})
-                if job_details:
-                    # Use the stored job details directly
-                    results.append({
-                        "id": doc.get("job_id"),
-                        "liked_at": doc.get("liked_at"),
-                        **job_details
-                    })
-                else:
-                    # Fallback: try to get job from main collection
-                    job_id = doc.get("job_id")
-                    job_data = await self.get_job_by_id(job_id)
-                    if job_data:
-                        job_obj = self._convert_job_data(job_data)
-                        if job_obj:
-                            results.append({
-                                "id": job_id,
-                                "liked_at": doc.get("liked_at"),
-                                **job_obj
-                            })
-
-            return results
+            return await self._format_job_action_docs(items, "liked_at")
         except Exception as e:
             logger.error(f"Failed to fetch liked jobs: {e}")
             return []
 
+    async def get_user_liked_jobs_page(self, user_id: str, limit: int,
+                                       cursor: Optional[str] = None) -> dict:
+        """One page of liked jobs: {"items": [...], "next_cursor": str | None}"""
+        docs, next_cursor = await self._get_action_page(
+            "users_job_like", user_id, limit, cursor)
+        return {
+            "items": await self._format_job_action_docs(docs, "liked_at"),
+            "next_cursor": next_cursor
+        }
+
     async def get_user_action_job_ids(self, user_id: str, actions: List[str]) -> List[str]:
         """Fetch job ids from MongoDB where user performed any of the given actions."""
         try:
-            cursor = self.users_db.user_job_actions.find(
-                {"user_id": user_id, "action": {"$in": actions}})
+            cursor = self.users_db[INTERACTIONS_COLLECTION].find(
+                {"user_id": user_id, "actions": {"$bitsAnySet": action_mask(actions)}},
+                {"_id": 0, "job_id": 1})
             ids: List[str] = []
             async for doc in cursor:
                 jid = str(doc.get("job_id"))
@@ -1614,6 +1869,161 @@ class Database:
             logger.error(f"Failed to fetch user action job ids: {e}")
             return []
 
+    async def get_excluded_job_ids(self, user_id: str) -> set:
+        """Job ids the user has liked, saved or disliked.
+
+        Single covered query on the (user_id, actions, job_id) index of the
+        consolidated projection; only job_id comes back over the wire.
+        """
+        try:
+            cursor = self.users_db[INTERACTIONS_COLLECTION].find(
+                {"user_id": user_id, "actions": {"$gt": 0}},
+                {"_id": 0, "job_id": 1}
+            )
+            return {str(doc["job_id"]) async for doc in cursor if doc.get("job_id")}
+        except Exception as e:
+            logger.error(f"Failed to fetch excluded job ids: {e}")
+            return set()
+
+    async def backfill_user_job_actions(self, batch_size: int = 1000) -> dict:
+        """Rebuild the consolidated user_job_actions projection.
+
+        Folds every users_job_like/saved/dislike document into the bitmask
+        documents and converts legacy per-action rows ({user_id, job_id,
+        action}) left in user_job_actions. Safe to re-run: bits are OR-ed in.
+        """
+        interactions = self.users_db[INTERACTIONS_COLLECTION]
+        stats = {}
+
+        async def flush(ops: list) -> int:
+            if ops:
+                await interactions.bulk_write(ops, ordered=False)
+            return len(ops)
+
+        # Fold legacy rows first, then drop them: the (user_id, job_id) unique
+        # index cannot be built while they exist
+        legacy_ops, legacy_count = [], 0
+        legacy_cursor = interactions.find(
+            {"action": {"$exists": True}}, {"_id": 0, "user_id": 1, "job_id": 1, "action": 1})
+        async for doc in legacy_cursor:
+            query, update = build_interaction_write(
+                str(doc["user_id"]), str(doc["job_id"]),
+                collection_for_action(doc.get("action", "")))
+            query["action"] = {"$exists": False}
+            legacy_ops.append(UpdateOne(query, update, upsert=True))
+            if len(legacy_ops) >= batch_size:
+                legacy_count += await flush(legacy_ops)
+                legacy_ops = []
+        legacy_count += await flush(legacy_ops)
+
+        if legacy_count:
+            await interactions.delete_many({"action": {"$exists": True}})
+            for index_name in ("unique_user_job_action", "action_index"):
+                try:
+                    await interactions.drop_index(index_name)
+                except Exception:
+                    pass
+        stats["legacy_rows"] = legacy_count
+
+        await self.ensure_indexes()
+
+        for collection_name in ACTION_BITS:
+            ops, count = [], 0
+            cursor = self.users_db[collection_name].find(
+                {}, {"_id": 0, "user_id": 1, "job_id": 1, "created_at": 1})
+            async for doc in cursor:
+                if not doc.get("user_id") or not doc.get("job_id"):
+                    continue
+                ops.append(UpdateOne(
+                    *build_interaction_write(
+                        str(doc["user_id"]), str(doc["job_id"]), collection_name,
+                        doc.get("created_at")),
+                    upsert=True))
+                if len(ops) >= batch_size:
+                    count += await flush(ops)
+                    ops = []
+            count += await flush(ops)
+            stats[collection_name] = count
+            logger.info(f"✅ Backfilled {count} interactions from {collection_name}")
+
+        return stats
+
+    async def migrate_job_snapshots(self, batch_size: int = 500) -> dict:
+        """Move job_details embedded in liked/saved documents into job_snapshots.
+
+        Snapshots are written before the action documents are switched to a
+        job_ref, so an interrupted run leaves every document readable. Safe
+        to re-run.
+        """
+        snapshots = self.users_db[SNAPSHOTS_COLLECTION]
+        stats = {}
+
+        for collection_name in ("users_job_like", "users_job_saved"):
+            collection = self.users_db[collection_name]
+            snapshot_ops, action_ops, count = [], [], 0
+
+            async def flush():
+                if snapshot_ops:
+                    await snapshots.bulk_write(snapshot_ops, ordered=False)
+                if action_ops:
+                    await collection.bulk_write(action_ops, ordered=False)
+                return len(action_ops)
+
+            cursor = collection.find(
+                {"job_details": {"$exists": True}}, {"job_id": 1, "job_details": 1})
+            async for doc in cursor:
+                job_details = doc.get("job_details") or {}
+                ref = None
+                if job_details and doc.get("job_id"):
+                    ref, operation = build_snapshot_write(str(doc["job_id"]), job_details)
+                    snapshot_ops.append(operation)
+                action_ops.append(UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"job_ref": ref}, "$unset": {"job_details": ""}}))
+                if len(action_ops) >= batch_size:
+                    count += await flush()
+                    snapshot_ops, action_ops = [], []
+            count += await flush()
+
+            stats[collection_name] = count
+            logger.info(f"✅ Moved {count} embedded job snapshots out of {collection_name}")
+
+        stats["snapshots"] = await snapshots.estimated_document_count()
+        return stats
+
+    async def backfill_job_skills(self, batch_size: int = 500) -> dict:
+        """Extract skills from jobs-lists descriptions into `extracted_skills`.
+
+        Employer-entered `skills_required` is never touched; extracted skills
+        are only a fallback for postings without any. Documents are tagged
+        with the skill dictionary version, so re-runs only process postings
+        extracted with an older dictionary.
+        """
+        collection = self.mongo_db["jobs-lists"]
+        version = skill_extractor.version
+        operations, count = [], 0
+
+        cursor = collection.find(
+            {"skills_version": {"$ne": version}}, {"title": 1, "description": 1})
+        async for doc in cursor:
+            text = f"{doc.get('title') or ''}\n{doc.get('description') or ''}"
+            operations.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {
+                    "extracted_skills": skill_extractor.find_skills(text),
+                    "skills_version": version
+                }}))
+            if len(operations) >= batch_size:
+                await collection.bulk_write(operations, ordered=False)
+                count += len(operations)
+                operations = []
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+            count += len(operations)
+
+        logger.info(f"✅ Extracted skills for {count} jobs-lists postings (dictionary {version})")
+        return {"updated": count, "version": version}
+
     def calculate_skill_match_score(self, user_skills: list, job_skills: list) -> float:
         """Calculate skill matching score between user and job"""
         if not user_skills or not job_skills:
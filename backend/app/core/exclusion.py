@@ -0,0 +1,203 @@
+from typing import Awaitable, Callable, Iterable, List
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Past this many interacted jobs a user's exclusion set becomes a Bloom filter
+EXCLUSION_BLOOM_THRESHOLD = int(os.getenv("EXCLUSION_BLOOM_THRESHOLD", "5000"))
+EXCLUSION_BLOOM_ERROR_RATE = float(os.getenv("EXCLUSION_BLOOM_ERROR_RATE", "0.001"))
+EXCLUSION_TTL_SECONDS = 7 * 24 * 3600
+WARM_CHUNK_SIZE = 1000
+# How long a warm may take before another reader can start over
+WARM_TIMEOUT_SECONDS = 60
+
+# KEYS: mode, set, bloom, staging, pending. While an index is warmed its
+# mode is 'warming': adds are parked in `pending` and folded in when the
+# warm finishes, so a swipe committed after the MongoDB read isn't lost.
+
+# Returns nil when the index is cold (or still warming) so the caller can
+# warm it from MongoDB.
+CONTAINS_LUA = """
+local mode = redis.call('GET', KEYS[1])
+if not mode or mode == 'warming' then return false end
+if mode == 'bloom' then
+    return redis.call('BF.MEXISTS', KEYS[3], unpack(ARGV))
+end
+return redis.call('SMISMEMBER', KEYS[2], unpack(ARGV))
+"""
+
+# Returns the set size after the add, -1 in bloom mode, 0 when cold or warming
+ADD_LUA = """
+local mode = redis.call('GET', KEYS[1])
+if not mode then return 0 end
+if mode == 'warming' then
+    redis.call('SADD', KEYS[5], unpack(ARGV))
+    redis.call('EXPIRE', KEYS[5], tonumber(redis.call('TTL', KEYS[1])) + 1)
+    return 0
+end
+if mode == 'bloom' then
+    redis.call('BF.MADD', KEYS[3], unpack(ARGV))
+    return -1
+end
+redis.call('SADD', KEYS[2], unpack(ARGV))
+return redis.call('SCARD', KEYS[2])
+"""
+
+# Bloom filters cannot delete, so removals there drop the whole index and
+# the next read rebuilds it from MongoDB. A removal during a warm aborts
+# it, since the MongoDB read may predate the removal.
+REMOVE_LUA = """
+local mode = redis.call('GET', KEYS[1])
+if not mode then return 0 end
+if mode == 'bloom' or mode == 'warming' then
+    redis.call('DEL', KEYS[1], KEYS[2], KEYS[3], KEYS[5])
+    return -1
+end
+return redis.call('SREM', KEYS[2], unpack(ARGV))
+"""
+
+# ARGV: final mode ('set' or 'bloom'), TTL. Publishes a warmed index built
+# in `staging` (set mode) or `bloom`, plus the adds parked meanwhile.
+# Returns 0 when the warm was aborted.
+FINISH_WARM_LUA = """
+if redis.call('GET', KEYS[1]) ~= 'warming' then
+    redis.call('DEL', KEYS[4])
+    return 0
+end
+local ttl = tonumber(ARGV[2])
+if ARGV[1] == 'bloom' then
+    local pending = redis.call('SMEMBERS', KEYS[5])
+    if #pending > 0 then
+        redis.call('BF.MADD', KEYS[3], unpack(pending))
+    end
+    redis.call('DEL', KEYS[2], KEYS[4], KEYS[5])
+    redis.call('EXPIRE', KEYS[3], ttl)
+else
+    redis.call('SUNIONSTORE', KEYS[2], KEYS[4], KEYS[5])
+    redis.call('DEL', KEYS[3], KEYS[4], KEYS[5])
+    redis.call('EXPIRE', KEYS[2], ttl)
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+return 1
+"""
+
+
+class ExclusionIndex:
+    """Per-user Redis index of jobs the user already liked, saved or disliked.
+
+    Starts as a set and switches to a RedisBloom filter once it grows past
+    EXCLUSION_BLOOM_THRESHOLD (when the module is available). Cold indexes
+    are rebuilt from `loader`, the MongoDB source of truth.
+    """
+
+    def __init__(self, redis_client, loader: Callable[[str], Awaitable[set]]):
+        self.redis_client = redis_client
+        self.loader = loader
+        self._contains = redis_client.register_script(CONTAINS_LUA)
+        self._add = redis_client.register_script(ADD_LUA)
+        self._remove = redis_client.register_script(REMOVE_LUA)
+        self._finish_warm = redis_client.register_script(FINISH_WARM_LUA)
+
+    def _keys(self, user_id: str) -> List[str]:
+        # Hash tag keeps a user's keys in one cluster slot for the scripts
+        return [f"excluded:{{{user_id}}}:mode",
+                f"excluded:{{{user_id}}}:set",
+                f"excluded:{{{user_id}}}:bloom",
+                f"excluded:{{{user_id}}}:staging",
+                f"excluded:{{{user_id}}}:pending"]
+
+    async def contains_many(self, user_id: str, job_ids: List[str]) -> List[bool]:
+        """One flag per candidate id, True when the user already acted on it"""
+        if not job_ids:
+            return []
+        try:
+            keys = self._keys(user_id)
+            flags = await self._contains(keys=keys, args=job_ids)
+            if flags is None:
+                await self.warm(user_id)
+                flags = await self._contains(keys=keys, args=job_ids)
+            if flags is None:
+                raise RuntimeError("exclusion index could not be warmed")
+            return [bool(int(flag)) for flag in flags]
+        except Exception as e:
+            logger.warning(f"⚠️  Exclusion index unavailable, reading MongoDB: {e}")
+            excluded = await self.loader(user_id)
+            return [job_id in excluded for job_id in job_ids]
+
+    async def add(self, user_id: str, job_ids: Iterable[str]):
+        """Record new interactions; no-op while the index is cold"""
+        job_ids = [job_id for job_id in job_ids if job_id]
+        if not job_ids:
+            return
+        try:
+            size = await self._add(keys=self._keys(user_id), args=job_ids)
+            if size and int(size) > EXCLUSION_BLOOM_THRESHOLD:
+                await self._promote_to_bloom(user_id)
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to update exclusion index: {e}")
+
+    async def remove(self, user_id: str, job_id: str):
+        """Forget an interaction once the user has no action left on the job"""
+        try:
+            await self._remove(keys=self._keys(user_id), args=[job_id])
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to update exclusion index: {e}")
+
+    async def warm(self, user_id: str) -> bool:
+        """Rebuild a cold index from MongoDB; False if another warm is running
+        or a removal aborted this one"""
+        keys = self._keys(user_id)
+        mode_key, _, bloom_key, staging_key, _ = keys
+        # Mark the index before reading, so adds from here on are parked
+        if not await self.redis_client.set(mode_key, "warming", nx=True, ex=WARM_TIMEOUT_SECONDS):
+            return False
+        try:
+            job_ids = list(await self.loader(user_id))
+
+            mode = "set"
+            if len(job_ids) > EXCLUSION_BLOOM_THRESHOLD and await self._write_bloom(user_id, job_ids):
+                mode = "bloom"
+            else:
+                pipeline = self.redis_client.pipeline()
+                pipeline.delete(staging_key)
+                for i in range(0, len(job_ids), WARM_CHUNK_SIZE):
+                    pipeline.sadd(staging_key, *job_ids[i:i + WARM_CHUNK_SIZE])
+                pipeline.expire(staging_key, WARM_TIMEOUT_SECONDS)
+                await pipeline.execute()
+
+            return bool(await self._finish_warm(keys=keys, args=[mode, EXCLUSION_TTL_SECONDS]))
+        except Exception:
+            # Leave the index cold rather than stuck in 'warming'
+            await self.redis_client.delete(mode_key, staging_key)
+            raise
+
+    async def _promote_to_bloom(self, user_id: str):
+        mode_key, set_key, bloom_key, _, _ = self._keys(user_id)
+        job_ids = list(await self.redis_client.smembers(set_key))
+        if await self._write_bloom(user_id, job_ids):
+            pipeline = self.redis_client.pipeline()
+            pipeline.set(mode_key, "bloom", ex=EXCLUSION_TTL_SECONDS)
+            pipeline.expire(bloom_key, EXCLUSION_TTL_SECONDS)
+            pipeline.delete(set_key)
+            await pipeline.execute()
+            logger.info(
+                f"🌸 Exclusion index for {user_id[:8]}... switched to Bloom filter ({len(job_ids)} jobs)")
+
+    async def _write_bloom(self, user_id: str, job_ids: List[str]) -> bool:
+        """Build the user's Bloom filter (callers switch the mode); False without RedisBloom"""
+        _, _, bloom_key, _, _ = self._keys(user_id)
+        capacity = max(EXCLUSION_BLOOM_THRESHOLD * 4, len(job_ids) * 2)
+        try:
+            await self.redis_client.delete(bloom_key)
+            await self.redis_client.execute_command(
+                "BF.RESERVE", bloom_key, EXCLUSION_BLOOM_ERROR_RATE, capacity)
+            pipeline = self.redis_client.pipeline()
+            for i in range(0, len(job_ids), WARM_CHUNK_SIZE):
+                pipeline.execute_command("BF.MADD", bloom_key, *job_ids[i:i + WARM_CHUNK_SIZE])
+            pipeline.expire(bloom_key, EXCLUSION_TTL_SECONDS)
+            await pipeline.execute()
+            return True
+        except Exception as e:
+            logger.debug(f"Bloom filter unavailable, keeping exclusion set: {e}")
+            return False
@@ -0,0 +1,170 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from app.core.rate_limiter import TOKEN_BUCKET_LUA
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_REQUESTS_PER_SECOND = float(os.getenv("SCRAPER_REQUESTS_PER_SECOND", "2"))
+SCRAPER_BURST = int(os.getenv("SCRAPER_BURST", "4"))
+HOST_BUCKET_PREFIX = "scrape:bucket:"
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc or url
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostRateLimiter:
+    """Per-host token bucket for outbound scraping.
+
+    Each request takes one token; the bucket holds `burst` tokens and
+    refills at `rate` per second, so callers wait only when they are
+    actually ahead of the allowed rate. With a Redis client the bucket is
+    the same TOKEN_BUCKET_LUA state the API rate limiter uses, shared by
+    every process scraping that host; without one (or when Redis fails)
+    it is kept in-process.
+
+    A 429 puts the bucket into debt for the Retry-After period, which
+    holds back every worker sharing it, not just the one that was told.
+
+    `acquire`/`penalize` need an asyncio Redis client, `acquire_sync`/
+    `penalize_sync` a synchronous one.
+    """
+
+    def __init__(self, rate: float = SCRAPER_REQUESTS_PER_SECOND,
+                 burst: int = SCRAPER_BURST, redis_client=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.redis_client = redis_client
+        self._script = redis_client.register_script(TOKEN_BUCKET_LUA) if redis_client is not None else None
+        self._buckets: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def _refill_per_ms(self) -> float:
+        return self.rate / 1000
+
+    def _key(self, host: str) -> str:
+        return f"{HOST_BUCKET_PREFIX}{host}"
+
+    def _args(self, now_ms: int) -> list:
+        return [self.burst, 1, repr(self._refill_per_ms), now_ms]
+
+    # ===== In-process bucket =====
+
+    def _take_local(self, host: str, now_ms: int) -> float:
+        """Take a token; returns 0, or the seconds until one is available"""
+        with self._lock:
+            tokens, ts = self._buckets.get(host, (self.burst, now_ms))
+            tokens = min(self.burst, tokens + max(0, now_ms - ts) * self._refill_per_ms)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[host] = (tokens, now_ms)
+            return wait
+
+    def _penalize_local(self, host: str, seconds: float, now_ms: int):
+        with self._lock:
+            tokens, ts = self._buckets.get(host, (self.burst, now_ms))
+            tokens = min(self.burst, tokens + max(0, now_ms - ts) * self._refill_per_ms)
+            self._buckets[host] = (min(tokens, 1 - seconds * self.rate), now_ms)
+
+    def _debt(self, seconds: float) -> Tuple[float, int]:
+        """Bucket balance that makes the next token `seconds` away, and its TTL"""
+        tokens = 1 - seconds * self.rate
+        return tokens, int((self.burst - tokens) / self.rate * 1000) + 1
+
+    # ===== asyncio =====
+
+    async def acquire(self, host: str):
+        """Wait until a request to `host` is allowed"""
+        while True:
+            now_ms = int(time.time() * 1000)
+            wait = None
+            if self._script is not None:
+                try:
+                    allowed, _, reset_ms = await self._script(keys=[self._key(host)], args=self._args(now_ms))
+                    wait = 0.0 if allowed else int(reset_ms) / 1000
+                except Exception as e:
+                    logger.warning(f"⚠️ Shared scrape limiter unavailable, using local bucket: {e}")
+            if wait is None:
+                wait = self._take_local(host, now_ms)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def penalize(self, host: str, seconds: float):
+        """Hold every request to `host` back for `seconds` (e.g. Retry-After)"""
+        logger.warning(f"⏳ {host} asked us to back off for {seconds:.1f}s")
+        now_ms = int(time.time() * 1000)
+        self._penalize_local(host, seconds, now_ms)
+        if self.redis_client is not None:
+            tokens, ttl_ms = self._debt(seconds)
+            try:
+                pipe = self.redis_client.pipeline(transaction=True)
+                pipe.hset(self._key(host), mapping={"tokens": repr(tokens), "ts": now_ms})
+                pipe.pexpire(self._key(host), ttl_ms)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not share back-off for {host}: {e}")
+
+    # ===== Blocking (requests-based scraper) =====
+
+    def acquire_sync(self, host: str):
+        while True:
+            now_ms = int(time.time() * 1000)
+            wait = None
+            if self._script is not None:
+                try:
+                    allowed, _, reset_ms = self._script(keys=[self._key(host)], args=self._args(now_ms))
+                    wait = 0.0 if allowed else int(reset_ms) / 1000
+                except Exception as e:
+                    logger.warning(f"⚠️ Shared scrape limiter unavailable, using local bucket: {e}")
+            if wait is None:
+                wait = self._take_local(host, now_ms)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def penalize_sync(self, host: str, seconds: float):
+        logger.warning(f"⏳ {host} asked us to back off for {seconds:.1f}s")
+        now_ms = int(time.time() * 1000)
+        self._penalize_local(host, seconds, now_ms)
+        if self.redis_client is not None:
+            tokens, ttl_ms = self._debt(seconds)
+            try:
+                pipe = self.redis_client.pipeline(transaction=True)
+                pipe.hset(self._key(host), mapping={"tokens": repr(tokens), "ts": now_ms})
+                pipe.pexpire(self._key(host), ttl_ms)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not share back-off for {host}: {e}")
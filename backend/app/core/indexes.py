@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import logging
+import os
+
+from app.core.actions import ACTION_TIMESTAMP_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Run the query-plan check when the API starts, and whether a COLLSCAN
+# aborts startup instead of only being reported
+INDEX_VERIFY_ON_STARTUP = os.getenv("INDEX_VERIFY_ON_STARTUP", "false").lower() == "true"
+INDEX_VERIFY_STRICT = os.getenv("INDEX_VERIFY_STRICT", "false").lower() == "true"
+
+# Placeholder values for explain(); only the plan shape matters
+SAMPLE_ID = "__explain__"
+
+
+class IndexCoverageError(RuntimeError):
+    """A hot query shape is not served by an index"""
+
+
+class IndexSpec:
+    """One index to provision, addressed as (database, collection)"""
+
+    def __init__(self, database: str, collection: str, keys: list, name: str, **options):
+        self.database = database
+        self.collection = collection
+        self.keys = keys
+        self.name = name
+        self.options = options
+
+
+class QueryShape:
+    """A query the application runs often enough that it must use an index"""
+
+    def __init__(self, name: str, database: str, collection: str, filter: dict,
+                 projection: Optional[dict] = None, sort: Optional[list] = None):
+        self.name = name
+        self.database = database
+        self.collection = collection
+        self.filter = filter
+        self.projection = projection
+        self.sort = sort
+
+
+def _action_indexes(collection: str) -> List[IndexSpec]:
+    return [
+        # Upsert/delete key for every swipe write, and the per-user list read
+        IndexSpec("users", collection, [("user_id", 1), ("job_id", 1)],
+                  "unique_user_job", unique=True),
+        # Keyset pagination of the user's list, newest first
+        IndexSpec("users", collection,
+                  [("user_id", 1), (ACTION_TIMESTAMP_FIELDS[collection], -1), ("_id", -1)],
+                  f"user_{ACTION_TIMESTAMP_FIELDS[collection]}_page"),
+    ]
+
+
+INDEX_REGISTRY: List[IndexSpec] = [
+    *_action_indexes("users_job_like"),
+    *_action_indexes("users_job_saved"),
+    *_action_indexes("users_job_dislike"),
+
+    # Consolidated interaction projection: one document per (user_id, job_id)
+    IndexSpec("users", "user_job_actions", [("user_id", 1), ("job_id", 1)],
+              "unique_user_job", unique=True),
+    # Covering index for the recommendation exclusion lookup
+    IndexSpec("users", "user_job_actions", [("user_id", 1), ("actions", 1), ("job_id", 1)],
+              "user_actions_job_covering"),
+
+    # Tombstones of buffered removals; they only have to outlive buffered swipes
+    IndexSpec("users", "user_job_removals", [("user_id", 1), ("job_id", 1), ("collection", 1)],
+              "unique_user_job_collection", unique=True),
+    IndexSpec("users", "user_job_removals", [("removed_at", 1)],
+              "removed_at_ttl", expireAfterSeconds=7 * 24 * 3600),
+
+    IndexSpec("users", "user_swipe_limits", [("user_id", 1), ("date", 1)],
+              "user_date_unique", unique=True),
+    # Auto-delete swipe limit documents after 7 days
+    IndexSpec("users", "user_swipe_limits", [("date", 1)],
+              "date_ttl", expireAfterSeconds=7 * 24 * 3600),
+
+    IndexSpec("users", "Profile", [("clerk_id", 1)], "clerk_id_unique", unique=True),
+
+    IndexSpec("Jobs", "jobs-lists", [("is_active", 1)], "is_active"),
+]
+
+
+def _action_queries(collection: str) -> List[QueryShape]:
+    return [
+        QueryShape(f"{collection}.by_user_job", "users", collection,
+                   {"user_id": SAMPLE_ID, "job_id": SAMPLE_ID}),
+        QueryShape(f"{collection}.by_user", "users", collection,
+                   {"user_id": SAMPLE_ID}),
+        QueryShape(f"{collection}.page", "users", collection,
+                   {"user_id": SAMPLE_ID},
+                   sort=[(ACTION_TIMESTAMP_FIELDS[collection], -1), ("_id", -1)]),
+    ]
+
+
+HOT_QUERIES: List[QueryShape] = [
+    *_action_queries("users_job_like"),
+    *_action_queries("users_job_saved"),
+    *_action_queries("users_job_dislike"),
+    QueryShape("user_job_actions.excluded", "users", "user_job_actions",
+               {"user_id": SAMPLE_ID, "actions": {"$gt": 0}}, {"_id": 0, "job_id": 1}),
+    QueryShape("user_job_actions.by_user_job", "users", "user_job_actions",
+               {"user_id": SAMPLE_ID, "job_id": SAMPLE_ID}),
+    QueryShape("user_swipe_limits.by_user_date", "users", "user_swipe_limits",
+               {"user_id": SAMPLE_ID, "date": datetime(1970, 1, 1)}),
+    QueryShape("Profile.by_clerk_id", "users", "Profile", {"clerk_id": SAMPLE_ID}),
+    QueryShape("job_snapshots.by_ref", "users", "job_snapshots",
+               {"_id": {"$in": [SAMPLE_ID]}}),
+    QueryShape("jobs-lists.active", "Jobs", "jobs-lists", {"is_active": {"$ne": False}}),
+]
+
+
+def _plan_stages(plan) -> List[str]:
+    """Every stage name in an explain() plan tree, classic or SBE"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+async def apply_indexes(databases: Dict[str, object],
+                        registry: List[IndexSpec] = INDEX_REGISTRY) -> dict:
+    """Create every registered index; one failure doesn't stop the rest.
+
+    `databases` maps registry database names to Motor databases. Returns
+    {"created": [...], "failed": {name: error}}.
+    """
+    created, failed = [], {}
+    for spec in registry:
+        label = f"{spec.database}.{spec.collection}.{spec.name}"
+        try:
+            await databases[spec.database][spec.collection].create_index(
+                spec.keys, name=spec.name, **spec.options)
+            created.append(label)
+            logger.info(f"   ✅ Index {label}")
+        except Exception as e:
+            failed[label] = str(e)
+            logger.warning(f"⚠️  Index {label} could not be created: {e}")
+    return {"created": created, "failed": failed}
+
+
+async def verify_query_plans(databases: Dict[str, object],
+                             queries: List[QueryShape] = HOT_QUERIES,
+                             strict: bool = INDEX_VERIFY_STRICT) -> List[dict]:
+    """explain() every hot query shape and report the winning plan.
+
+    Raises IndexCoverageError in strict mode when any shape falls back to a
+    collection scan.
+    """
+    report = []
+    for query in queries:
+        entry = {"query": query.name, "collscan": False, "stages": []}
+        try:
+            cursor = databases[query.database][query.collection].find(
+                query.filter, query.projection)
+            if query.sort:
+                cursor = cursor.sort(query.sort)
+            explain = await cursor.explain()
+            entry["stages"] = _plan_stages(
+                explain.get("queryPlanner", {}).get("winningPlan", {}))
+            entry["collscan"] = "COLLSCAN" in entry["stages"]
+        except Exception as e:
+            entry["error"] = str(e)
+        report.append(entry)
+
+        if entry["collscan"]:
+            logger.error(f"❌ {query.name} uses a collection scan: {entry['stages']}")
+        elif "error" in entry:
+            logger.warning(f"⚠️  Could not explain {query.name}: {entry['error']}")
+        else:
+            logger.info(f"   ✅ {query.name}: {' > '.join(entry['stages'])}")
+
+    scans = [entry["query"] for entry in report if entry["collscan"]]
+    if scans and strict:
+        raise IndexCoverageError(f"Queries without index coverage: {', '.join(scans)}")
+    return report
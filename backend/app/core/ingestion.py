@@ -0,0 +1,237 @@
+from typing import Optional
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+
+from app.core.crawl_state import CrawlCheckpointStore
+from app.core.job_cache import search_metadata
+
+logger = logging.getLogger(__name__)
+
+INGEST_STREAM_KEY = "stream:scrape-requests"
+INGEST_CONSUMER_GROUP = "scrape-workers"
+INGEST_PENDING_PREFIX = "scrape:pending:"
+# Failed requests wait here, scored by when they may run again
+INGEST_RETRY_KEY = "scrape:retries"
+# A query is queued at most once while it is waiting or being scraped,
+# however many requests ask. The TTL only cleans up after a dead worker.
+INGEST_DEDUP_SECONDS = int(os.getenv("INGEST_DEDUP_SECONDS", "900"))
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+# Retry n waits INGEST_RETRY_DELAY_SECONDS * 2**(n-1)
+INGEST_RETRY_DELAY_SECONDS = int(os.getenv("INGEST_RETRY_DELAY_SECONDS", "60"))
+INGEST_MAX_JOBS = int(os.getenv("INGEST_MAX_JOBS", "50"))
+INGEST_STREAM_MAXLEN = 10_000
+# Scrapes take minutes; only take over messages idle for longer than that
+STALE_CLAIM_MS = 15 * 60_000
+
+
+def scrape_request_key(request: dict) -> str:
+    """Identity of a scrape request, ignoring delivery details"""
+    identity = {k: v for k, v in request.items() if k not in ("force_refresh", "attempts")}
+    return hashlib.md5(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+class ScrapeQueue:
+    """Producer side: request handlers signal "refresh this query" here.
+
+    Requests go to a Redis stream consumed by IngestionWorker processes, so
+    no HTTP fetching or sleeping ever happens inside an API request.
+    """
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+
+    async def enqueue(self, keywords: str, location: str, max_jobs: int = INGEST_MAX_JOBS,
+                      job_type_filter: str = None, category_filter: str = None,
+                      trusted_only: bool = True, force_refresh: bool = False) -> bool:
+        """Queue a scrape; False when the same query is already queued"""
+        request = {
+            "keywords": keywords,
+            "location": location,
+            "max_jobs": max_jobs,
+            "job_type_filter": job_type_filter,
+            "category_filter": category_filter,
+            "trusted_only": trusted_only,
+        }
+        fresh = await self.redis_client.set(
+            f"{INGEST_PENDING_PREFIX}{scrape_request_key(request)}", "1",
+            nx=True, ex=INGEST_DEDUP_SECONDS)
+        if not fresh:
+            return False
+
+        request["force_refresh"] = force_refresh
+        await self.push(request)
+        return True
+
+    async def push(self, request: dict):
+        """Append a request without the dedup check (retries)"""
+        await self.redis_client.xadd(
+            INGEST_STREAM_KEY, {"payload": json.dumps(request)},
+            maxlen=INGEST_STREAM_MAXLEN, approximate=True)
+
+    async def release(self, request: dict):
+        """Let the same query be queued again once its request is done"""
+        await self.redis_client.delete(f"{INGEST_PENDING_PREFIX}{scrape_request_key(request)}")
+
+    async def push_later(self, request: dict, delay_seconds: float):
+        """Hold a retry back for `delay_seconds` before workers see it"""
+        await self.redis_client.zadd(
+            INGEST_RETRY_KEY, {json.dumps(request): time.time() + delay_seconds})
+
+    async def promote_due(self) -> int:
+        """Move retries whose delay has passed onto the stream"""
+        due = await self.redis_client.zrangebyscore(INGEST_RETRY_KEY, "-inf", time.time())
+        promoted = 0
+        for payload in due:
+            # Only the worker whose ZREM wins pushes, so each retry runs once
+            if await self.redis_client.zrem(INGEST_RETRY_KEY, payload):
+                await self.push(json.loads(payload))
+                promoted += 1
+        return promoted
+
+    async def depth(self) -> int:
+        return await self.redis_client.xlen(INGEST_STREAM_KEY)
+
+
+class IngestionWorker:
+    """Consumer side: scrapes queued queries into the Redis job cache.
+
+    Runs outside the API (`python -m app.cli ingest-worker`). Each worker
+    takes one request at a time from the consumer group; run more workers
+    to scrape more queries in parallel. Failed requests are re-queued up to
+    INGEST_MAX_ATTEMPTS times with exponential backoff, and messages left pending by a dead worker
+    are claimed on start. Crawls are checkpointed page by page in
+    CrawlCheckpointStore, so a retry or a claimed message continues where
+    the previous attempt stopped instead of starting from page one.
+    """
+
+    def __init__(self, redis_client, cache, engine, block_ms: int = 5000):
+        self.redis_client = redis_client
+        self.queue = ScrapeQueue(redis_client)
+        # AsyncJobDataCache where results are stored
+        self.cache = cache
+        # AsyncLinkedInJobScraper used for the actual fetching
+        self.engine = engine
+        self.checkpoints = CrawlCheckpointStore(redis_client)
+        self.block_ms = block_ms
+        self.consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+        self._stopping = False
+
+    def stop(self):
+        self._stopping = True
+
+    async def _ensure_group(self):
+        try:
+            await self.redis_client.xgroup_create(
+                INGEST_STREAM_KEY, INGEST_CONSUMER_GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _claim_stale(self) -> int:
+        response = await self.redis_client.xautoclaim(
+            INGEST_STREAM_KEY, INGEST_CONSUMER_GROUP, self.consumer_name,
+            min_idle_time=STALE_CLAIM_MS, start_id="0-0", count=100)
+        messages = response[1] if response and len(response) > 1 else []
+        return len(messages)
+
+    async def _next_message(self, block: Optional[int]):
+        # Our own pending messages (claimed or interrupted) first, then new ones
+        for stream_id in ("0", ">"):
+            response = await self.redis_client.xreadgroup(
+                INGEST_CONSUMER_GROUP, self.consumer_name, {INGEST_STREAM_KEY: stream_id},
+                count=1, block=block if stream_id == ">" else None)
+            messages = response[0][1] if response else []
+            if messages:
+                return messages[0]
+        return None
+
+    async def run(self, once: bool = False) -> int:
+        """Process requests until stopped (or until the queue is empty with `once`)"""
+        await self._ensure_group()
+        claimed = await self._claim_stale()
+        if claimed:
+            logger.info(f"♻️  Claimed {claimed} scrape requests from stopped workers")
+
+        processed = 0
+        while not self._stopping:
+            await self.queue.promote_due()
+            message = await self._next_message(None if once else self.block_ms)
+            if message is None:
+                if once:
+                    break
+                continue
+            await self._handle(*message)
+            processed += 1
+        return processed
+
+    async def _handle(self, message_id: str, fields: dict):
+        try:
+            request = json.loads(fields["payload"])
+        except Exception as e:
+            logger.error(f"❌ Dropping unreadable scrape request {message_id}: {e}")
+            await self._ack(message_id)
+            return
+
+        done = True
+        try:
+            count = await self.refresh(request)
+            logger.info(f"✅ Ingested {count} jobs for '{request['keywords']}' in {request['location']}")
+        except Exception as e:
+            attempts = request.get("attempts", 0) + 1
+            if attempts < INGEST_MAX_ATTEMPTS:
+                delay = INGEST_RETRY_DELAY_SECONDS * 2 ** (attempts - 1)
+                logger.warning(f"⚠️ Scrape failed ({e}); retrying in {delay}s, attempt {attempts + 1}/{INGEST_MAX_ATTEMPTS}")
+                await self.queue.push_later({**request, "attempts": attempts}, delay)
+                done = False
+            else:
+                logger.error(f"❌ Giving up on scrape for '{request.get('keywords')}' after {attempts} attempts: {e}")
+                # No attempt will resume it; don't leave the partial crawl around
+                await self.checkpoints.finish(scrape_request_key(request))
+        await self._ack(message_id)
+        if done:
+            await self.queue.release(request)
+
+    async def _ack(self, message_id: str):
+        pipeline = self.redis_client.pipeline()
+        pipeline.xack(INGEST_STREAM_KEY, INGEST_CONSUMER_GROUP, message_id)
+        pipeline.xdel(INGEST_STREAM_KEY, message_id)
+        await pipeline.execute()
+
+    async def refresh(self, request: dict) -> int:
+        """Scrape one query and save it to the cache; returns jobs stored"""
+        cache = self.cache
+        params = dict(
+            keywords=request["keywords"],
+            location=request["location"],
+            max_jobs=request.get("max_jobs", INGEST_MAX_JOBS),
+            job_type_filter=request.get("job_type_filter"),
+            category_filter=request.get("category_filter"),
+            trusted_only=request.get("trusted_only", True),
+        )
+        cache_key = cache.generate_cache_key(**params)
+
+        if not request.get("force_refresh"):
+            cached = await cache.load_from_cache(cache_key)
+            if cached:
+                return 0
+
+        # Same identity as the dedup key, so every attempt shares one checkpoint
+        crawl_id = scrape_request_key(request)
+        state = await self.checkpoints.begin(crawl_id, params)
+        pages = self.engine.iter_pages(
+            params["keywords"], params["location"], params["max_jobs"],
+            params["job_type_filter"], params["trusted_only"],
+            start=state.start, collected=len(state.jobs), seen_ids=state.seen_ids)
+        async for next_start, page_jobs in pages:
+            # Jobs are visible to get_active_jobs as soon as their page is done
+            await cache.save_jobs(page_jobs)
+            await self.checkpoints.save_page(state, next_start, page_jobs)
+
+        jobs = self.engine.parser.filter_by_category(state.jobs, params["category_filter"])
+        await cache.save_to_cache(cache_key, jobs, search_metadata(**params))
+        await self.checkpoints.finish(crawl_id)
+        return len(jobs)
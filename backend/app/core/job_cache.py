@@ -0,0 +1,504 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import hashlib
+import json
+import logging
+import os
+
+from app.services.company_matcher import TRUSTED_COMPANIES, trusted_company_matcher
+from app.services.job_classifier import JOB_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+JOB_CACHE_HOURS = int(os.getenv("JOB_CACHE_HOURS", "72"))
+# Keys per pipeline when reading or deleting many jobs at once
+JOB_CACHE_BATCH_SIZE = int(os.getenv("JOB_CACHE_BATCH_SIZE", "500"))
+
+# Every cached job is a member of exactly one of these cluster sets
+JOB_CLUSTERS = ('usa', 'india', 'global')
+ACTIVE_SEARCHES_KEY = "active_searches"
+
+# Fields read back from job:{id} to decide whether a detail fetch is needed
+KNOWN_DETAIL_FIELDS = ['description', 'requirements', 'skills', 'salary',
+                       'etag', 'last_modified', 'fetched_at']
+
+
+def job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def search_key(cache_key: str) -> str:
+    return f"search:{cache_key}"
+
+
+def cluster_key(country: str) -> str:
+    return f"cluster:{country}:jobs"
+
+
+def stable_job_id(job_data: Dict) -> str:
+    """Cache ID of a job: derived from the card, so it is known before any detail fetch"""
+    job_id_source = f"{job_data.get('title', '')}{job_data.get('company', '')}{job_data.get('location', '')}"
+    return hashlib.md5(job_id_source.encode()).hexdigest()[:12]
+
+
+def search_cache_key(keywords: str, location: str, max_jobs: int = 50,
+                     job_type_filter: str = None, category_filter: str = None,
+                     trusted_only: bool = True) -> str:
+    """Generate unique cache key based on search parameters"""
+    search_params = f"{keywords}_{location}_{max_jobs}_{job_type_filter}_{category_filter}_{trusted_only}"
+    return hashlib.md5(search_params.encode()).hexdigest()
+
+
+def search_metadata(keywords: str, location: str, max_jobs: int,
+                    job_type_filter: str = None, category_filter: str = None,
+                    trusted_only: bool = True) -> Dict:
+    """Metadata stored alongside a cached search"""
+    return {
+        'keywords': keywords,
+        'location': location,
+        'max_jobs': max_jobs,
+        'job_type_filter': job_type_filter,
+        'category_filter': category_filter,
+        'trusted_only': trusted_only,
+        'scraped_at': datetime.now().isoformat(),
+        'scraper_version': '2.0',
+        'source': 'LinkedIn'
+    }
+
+
+def job_cluster(location: str) -> str:
+    """Cluster a job is filed under, from its lowercased location"""
+    if any(keyword in location for keyword in ['usa', 'us', 'united states']):
+        return 'usa'
+    if any(keyword in location for keyword in ['india', 'mumbai', 'delhi', 'bangalore']):
+        return 'india'
+    return 'global'
+
+
+def search_country(location: str) -> str:
+    """Country partition of a cached search: the last part of 'City, Country'"""
+    location = location.lower()
+    return location.split(',')[-1].strip() if ',' in location else 'india'
+
+
+def job_hash_fields(job_data: Dict, ttl_seconds: int) -> Dict:
+    """Redis hash for job:{id}; assigns job_data['job_id'] when missing"""
+    if 'job_id' not in job_data:
+        job_data['job_id'] = stable_job_id(job_data)
+    location = job_data.get('location', '').lower()
+    now = datetime.now()
+    return {
+        'title': job_data.get('title', ''),
+        'company': job_data.get('company', ''),
+        'location': location,
+        'country': job_cluster(location),
+        'job_type': job_data.get('job_type', ''),
+        'skills': json.dumps(job_data.get('skills', [])),
+        'requirements': json.dumps(job_data.get('requirements', [])),
+        'description': job_data.get('description', ''),
+        'salary': job_data.get('salary', ''),
+        'url': job_data.get('job_url', ''),
+        # Classifier labels, read back by the feed and the cache statistics
+        'category': job_data.get('category', ''),
+        'experience_level': job_data.get('experience_level', ''),
+        'employment_type': job_data.get('employment_type', ''),
+        'remote': job_data.get('remote_work', 'No'),
+        # Detail-page validators for skip-known / conditional fetching
+        'etag': job_data.get('etag', ''),
+        'last_modified': job_data.get('last_modified', ''),
+        'fetched_at': job_data.get('detail_fetched_at', ''),
+        'job_id': job_data['job_id'],
+        'created_at': now.isoformat(),
+        'expires_at': (now + timedelta(seconds=ttl_seconds)).isoformat()
+    }
+
+
+def search_hash_fields(cache_key: str, country: str, job_ids: List[str],
+                       metadata: Optional[Dict], ttl_seconds: int) -> Dict:
+    """Redis hash for a cached search ({country}:search:{key} and search:{key})"""
+    now = datetime.now()
+    return {
+        'cache_key': cache_key,
+        'country': country,
+        'job_ids': json.dumps(job_ids),
+        'job_count': len(job_ids),
+        'metadata': json.dumps(metadata or {}),
+        'created_at': now.isoformat(),
+        'expires_at': (now + timedelta(seconds=ttl_seconds)).isoformat()
+    }
+
+
+def job_from_hash(redis_job_data: Dict) -> Dict:
+    """Convert Redis hash data back to job dictionary format"""
+    return {
+        'title': redis_job_data.get('title', ''),
+        'company': redis_job_data.get('company', ''),
+        'location': redis_job_data.get('location', ''),
+        'description': redis_job_data.get('description', ''),
+        'requirements': json.loads(redis_job_data.get('requirements', '[]')),
+        'job_type': redis_job_data.get('job_type', ''),
+        'skills': json.loads(redis_job_data.get('skills', '[]')),
+        'posted_date': redis_job_data.get('posted_date', ''),
+        'job_url': redis_job_data.get('url', ''),
+        'salary': redis_job_data.get('salary', ''),
+        'category': redis_job_data.get('category', ''),
+        'is_trusted_company': trusted_company_matcher.is_trusted(redis_job_data.get('company', '')),
+        'experience_level': redis_job_data.get('experience_level', ''),
+        'employment_type': redis_job_data.get('employment_type', ''),
+        'job_id': redis_job_data.get('job_id', ''),
+        'remote_work': redis_job_data.get('remote', 'No')
+    }
+
+
+def matches_criteria(job_data: Dict, title_keyword: str = None, company_keyword: str = None,
+                     location_keyword: str = None, remote_only: bool = False,
+                     trusted_only: bool = False) -> bool:
+    """Filters of search_jobs_by_criteria, applied to a raw job hash"""
+    if title_keyword and title_keyword.lower() not in job_data.get('title', '').lower():
+        return False
+    if company_keyword and company_keyword.lower() not in job_data.get('company', '').lower():
+        return False
+    if location_keyword and location_keyword.lower() not in job_data.get('location', '').lower():
+        return False
+    if remote_only and job_data.get('remote', 'No') == 'No':
+        return False
+    if trusted_only and not trusted_company_matcher.is_trusted(job_data.get('company', '')):
+        return False
+    return True
+
+
+def summarize_jobs(job_hashes: Iterable[Dict]) -> Dict:
+    """Counts by company, location, type, category, level and remote status"""
+    stats = {
+        'total_jobs': 0,
+        'by_company': {},
+        'by_location': {},
+        'by_job_type': {},
+        'by_category': {},
+        'by_experience_level': {},
+        'remote_stats': {'Yes': 0, 'No': 0, 'Hybrid': 0},
+        'trusted_companies': 0
+    }
+    for job_data in job_hashes:
+        if not job_data:
+            continue
+        stats['total_jobs'] += 1
+
+        company = job_data.get('company', 'Unknown')
+        for field, key in (('by_company', company),
+                           ('by_location', job_data.get('location', 'Unknown')),
+                           ('by_job_type', job_data.get('job_type', 'Unknown')),
+                           ('by_category', job_data.get('category', 'Unknown')),
+                           ('by_experience_level', job_data.get('experience_level', 'Unknown'))):
+            stats[field][key] = stats[field].get(key, 0) + 1
+
+        remote = job_data.get('remote', 'No')
+        if remote in stats['remote_stats']:
+            stats['remote_stats'][remote] += 1
+
+        if trusted_company_matcher.is_trusted(company):
+            stats['trusted_companies'] += 1
+
+    # Sort top categories by count
+    for field in ['by_company', 'by_location', 'by_job_type', 'by_category', 'by_experience_level']:
+        stats[field] = dict(sorted(stats[field].items(), key=lambda x: x[1], reverse=True))
+    return stats
+
+
+class AsyncJobDataCache:
+    """asyncio counterpart of RedisJobDataCache for the API and workers.
+
+    Uses the caller's redis.asyncio client (Database.redis_client), so it
+    shares that connection pool instead of opening its own, and never
+    blocks the event loop. Bulk operations go out as pipelines of
+    JOB_CACHE_BATCH_SIZE commands, and cached jobs are enumerated through
+    the cluster sets rather than KEYS. Key layout and stored fields are the
+    same as RedisJobDataCache, so both can serve the same data.
+    """
+
+    generate_cache_key = staticmethod(search_cache_key)
+
+    def __init__(self, redis_client, cache_duration_hours: int = JOB_CACHE_HOURS,
+                 batch_size: int = JOB_CACHE_BATCH_SIZE):
+        self.redis_client = redis_client
+        self.cache_duration_seconds = cache_duration_hours * 3600
+        self.batch_size = batch_size
+
+    async def _run_batched(self, keys: List[str], command: str, *args) -> list:
+        """One `command key *args` per key, in pipelines of batch_size"""
+        results = []
+        for i in range(0, len(keys), self.batch_size):
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for key in keys[i:i + self.batch_size]:
+                getattr(pipeline, command)(key, *args)
+            results.extend(await pipeline.execute())
+        return results
+
+    def _queue_job(self, pipeline, job_data: Dict) -> str:
+        """Add a job's hash and cluster membership to `pipeline`; returns its ID"""
+        ttl = self.cache_duration_seconds
+        fields = job_hash_fields(job_data, ttl)
+        job_id = fields['job_id']
+        pipeline.hset(job_key(job_id), mapping=fields)
+        pipeline.expire(job_key(job_id), ttl)
+        pipeline.sadd(cluster_key(fields['country']), job_id)
+        pipeline.expire(cluster_key(fields['country']), ttl)
+        return job_id
+
+    async def save_jobs(self, jobs_data: List[Dict]) -> int:
+        """Store jobs without a search record (e.g. one crawl page); returns jobs saved"""
+        if not jobs_data:
+            return 0
+        try:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for job_data in jobs_data:
+                self._queue_job(pipeline, job_data)
+            await pipeline.execute()
+            return len(jobs_data)
+        except Exception as e:
+            logger.error(f"Error saving jobs to Redis: {str(e)}")
+            return 0
+
+    async def save_to_cache(self, cache_key: str, jobs_data: List[Dict], metadata: Dict = None) -> bool:
+        """Save job search results: every job and search record in one pipeline"""
+        try:
+            ttl = self.cache_duration_seconds
+            pipeline = self.redis_client.pipeline(transaction=False)
+            country_job_ids: Dict[str, List[str]] = {}
+            for job_data in jobs_data:
+                job_id = self._queue_job(pipeline, job_data)
+                country_job_ids.setdefault(search_country(job_data.get('location', '')), []).append(job_id)
+
+            all_job_ids = [job_id for job_ids in country_job_ids.values() for job_id in job_ids]
+            records = {f"{country}:search:{cache_key}": search_hash_fields(cache_key, country, job_ids, metadata, ttl)
+                       for country, job_ids in country_job_ids.items()}
+            records[search_key(cache_key)] = search_hash_fields(cache_key, 'all', all_job_ids, metadata, ttl)
+            for key, fields in records.items():
+                pipeline.hset(key, mapping=fields)
+                pipeline.expire(key, ttl)
+            for country in country_job_ids:
+                pipeline.sadd(f"{country}:active_searches", cache_key)
+            pipeline.sadd(ACTIVE_SEARCHES_KEY, cache_key)
+            await pipeline.execute()
+
+            logger.info(f"Saved {len(all_job_ids)} jobs to Redis cache across {len(country_job_ids)} countries")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving to Redis cache: {str(e)}")
+            return False
+
+    async def get_known_details(self, job_ids: List[str]) -> Dict[str, Dict]:
+        """Cached detail fields for the given job IDs, in one pipelined round trip"""
+        results = await self._run_batched([job_key(job_id) for job_id in job_ids], "hmget", KNOWN_DETAIL_FIELDS)
+        known = {}
+        for job_id, values in zip(job_ids, results):
+            if any(value is not None for value in values):
+                known[job_id] = dict(zip(KNOWN_DETAIL_FIELDS, values))
+        return known
+
+    async def load_from_cache(self, cache_key: str) -> Optional[Dict]:
+        """Load job search results from Redis cache"""
+        try:
+            search_data = await self.redis_client.hgetall(search_key(cache_key))
+            if not search_data:
+                logger.info(f"No cached data found for key: {cache_key}")
+                return None
+
+            expires_at = datetime.fromisoformat(search_data.get('expires_at', ''))
+            if datetime.now() > expires_at:
+                logger.info(f"Cache expired for key: {cache_key}")
+                await self.clear_search_cache(cache_key)
+                return None
+
+            job_ids = json.loads(search_data.get('job_ids', '[]'))
+            job_hashes = await self._run_batched([job_key(job_id) for job_id in job_ids], "hgetall")
+            jobs_data = [job_from_hash(job_data) for job_data in job_hashes if job_data]
+
+            logger.info(f"Loaded {len(jobs_data)} jobs from Redis cache")
+            return {
+                'timestamp': search_data.get('created_at'),
+                'cache_key': cache_key,
+                'metadata': json.loads(search_data.get('metadata', '{}')),
+                'job_count': len(jobs_data),
+                'data': jobs_data
+            }
+
+        except Exception as e:
+            logger.error(f"Error loading from Redis cache: {str(e)}")
+            return None
+
+    async def cached_job_ids(self) -> List[str]:
+        return list(await self.redis_client.sunion(*(cluster_key(country) for country in JOB_CLUSTERS)))
+
+    async def cached_jobs(self) -> List[Dict]:
+        """Raw hashes of every cached job"""
+        job_ids = await self.cached_job_ids()
+        job_hashes = await self._run_batched([job_key(job_id) for job_id in job_ids], "hgetall")
+        return [job_data for job_data in job_hashes if job_data]
+
+    async def clear_search_cache(self, cache_key: str):
+        """Clear specific search cache and its jobs"""
+        try:
+            job_ids = json.loads(await self.redis_client.hget(search_key(cache_key), 'job_ids') or '[]')
+            for i in range(0, len(job_ids), self.batch_size):
+                chunk = job_ids[i:i + self.batch_size]
+                pipeline = self.redis_client.pipeline(transaction=False)
+                pipeline.delete(*(job_key(job_id) for job_id in chunk))
+                for country in JOB_CLUSTERS:
+                    pipeline.srem(cluster_key(country), *chunk)
+                await pipeline.execute()
+
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.delete(search_key(cache_key))
+            pipeline.srem(ACTIVE_SEARCHES_KEY, cache_key)
+            await pipeline.execute()
+            logger.info(f"Cleared cache for search: {cache_key}")
+
+        except Exception as e:
+            logger.error(f"Error clearing search cache: {str(e)}")
+
+    async def clear_expired_cache(self) -> int:
+        """Remove expired searches; job hashes expire on their own TTL"""
+        try:
+            active_searches = list(await self.redis_client.smembers(ACTIVE_SEARCHES_KEY))
+            expiries = await self._run_batched(
+                [search_key(cache_key) for cache_key in active_searches], "hget", "expires_at")
+
+            current_time = datetime.now()
+            expired_searches = []
+            for cache_key, expires_at in zip(active_searches, expiries):
+                try:
+                    if expires_at is None or current_time > datetime.fromisoformat(expires_at):
+                        expired_searches.append(cache_key)
+                except Exception:
+                    expired_searches.append(cache_key)
+
+            for cache_key in expired_searches:
+                await self.clear_search_cache(cache_key)
+
+            logger.info(f"Cleaned up {len(expired_searches)} expired searches")
+            return len(expired_searches)
+
+        except Exception as e:
+            logger.error(f"Error clearing expired cache: {str(e)}")
+            return 0
+
+    async def clear_all_cache(self) -> int:
+        """Remove all cached searches and jobs; returns searches removed"""
+        try:
+            active_searches = await self.redis_client.smembers(ACTIVE_SEARCHES_KEY)
+            job_ids = await self.cached_job_ids()
+            for i in range(0, len(job_ids), self.batch_size):
+                await self.redis_client.delete(*(job_key(job_id) for job_id in job_ids[i:i + self.batch_size]))
+
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for cache_key in active_searches:
+                pipeline.delete(search_key(cache_key))
+            pipeline.delete(ACTIVE_SEARCHES_KEY, *(cluster_key(country) for country in JOB_CLUSTERS))
+            await pipeline.execute()
+
+            logger.info("Cleared all cached data from Redis")
+            return len(active_searches)
+
+        except Exception as e:
+            logger.error(f"Error clearing all cache: {str(e)}")
+            return 0
+
+    async def get_cache_info(self) -> Dict:
+        """Get comprehensive cache information"""
+        try:
+            active_searches = list(await self.redis_client.smembers(ACTIVE_SEARCHES_KEY))
+            search_hashes = await self._run_batched(
+                [search_key(cache_key) for cache_key in active_searches], "hgetall")
+
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for country in JOB_CLUSTERS:
+                pipeline.scard(cluster_key(country))
+            cluster_sizes = await pipeline.execute()
+            memory_info = await self.redis_client.info('memory')
+            used_memory = memory_info.get('used_memory', 0)
+
+            search_details = []
+            total_jobs = 0
+            for cache_key, search_data in zip(active_searches, search_hashes):
+                if not search_data:
+                    continue
+                job_count = int(search_data.get('job_count', 0))
+                total_jobs += job_count
+                search_details.append({
+                    'cache_key': cache_key,
+                    'job_count': job_count,
+                    'created_at': search_data.get('created_at'),
+                    'expires_at': search_data.get('expires_at'),
+                    'metadata': json.loads(search_data.get('metadata', '{}'))
+                })
+
+            return {
+                'total_searches': len(active_searches),
+                'total_job_hashes': sum(cluster_sizes),
+                'total_jobs_cached': total_jobs,
+                'redis_memory_used_mb': round(used_memory / (1024 * 1024), 2),
+                'redis_connected': True,
+                'cache_duration_hours': self.cache_duration_seconds // 3600,
+                'searches': search_details[:10]
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting cache info: {str(e)}")
+            return {
+                'error': str(e),
+                'redis_connected': False
+            }
+
+    async def search_jobs_by_criteria(self, title_keyword: str = None, company_keyword: str = None,
+                                      location_keyword: str = None, remote_only: bool = False,
+                                      trusted_only: bool = False, limit: int = 50) -> List[Dict]:
+        """Search cached jobs by specific criteria"""
+        try:
+            matching_jobs = []
+            for job_data in await self.cached_jobs():
+                if matches_criteria(job_data, title_keyword, company_keyword,
+                                    location_keyword, remote_only, trusted_only):
+                    matching_jobs.append(job_from_hash(job_data))
+                    if len(matching_jobs) >= limit:
+                        break
+
+            logger.info(f"Found {len(matching_jobs)} jobs matching criteria")
+            return matching_jobs
+
+        except Exception as e:
+            logger.error(f"Error searching jobs by criteria: {str(e)}")
+            return []
+
+    async def get_job_statistics(self) -> Dict:
+        """Get statistics about cached jobs"""
+        try:
+            return summarize_jobs(await self.cached_jobs())
+        except Exception as e:
+            logger.error(f"Error getting job statistics: {str(e)}")
+            return {'error': str(e)}
+
+    async def get_redis_health(self) -> Dict:
+        """Check Redis health"""
+        try:
+            await self.redis_client.ping()
+            info = await self.redis_client.info()
+            return {
+                'connected': True,
+                'redis_version': info.get('redis_version', 'unknown'),
+                'used_memory_human': info.get('used_memory_human', 'unknown'),
+                'connected_clients': info.get('connected_clients', 0)
+            }
+        except Exception as e:
+            return {'connected': False, 'error': str(e)}
+
+    async def get_scraper_stats(self) -> Dict:
+        """The statistics RedisCachedJobScraper reports, without a sync client"""
+        return {
+            "cache_status": await self.get_cache_info(),
+            "job_statistics": await self.get_job_statistics(),
+            "redis_health": await self.get_redis_health(),
+            "available_categories": ['All'] + list(JOB_CATEGORIES.keys()),
+            "trusted_companies_count": len(TRUSTED_COMPANIES),
+        }
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from typing import Tuple, Union
+import os
+import threading
+
+from app.models.job import JobPosting
+
+JOB_MODEL_CACHE_SIZE = int(os.getenv("JOB_MODEL_CACHE_SIZE", "5000"))
+
+
+class JobModelCache:
+    """Validate each catalog record once per (job id, record version).
+
+    Records come from our own converters and don't change under a given
+    version, so the validated JobPosting is reused across requests instead
+    of re-running validation 100 times per recommendation call. Records
+    that fail validation are remembered too and keep failing the same way.
+    Cached models are shared: callers must treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = JOB_MODEL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Union[JobPosting, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, job_id: str, version: str, record: dict) -> JobPosting:
+        """Validated model for `record`; raises ValueError for invalid records"""
+        key = (job_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if entry is None:
+            try:
+                entry = JobPosting(**record)
+            except ValueError as e:
+                # pydantic's ValidationError is a ValueError; keep the message
+                entry = str(e)
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if isinstance(entry, str):
+            raise ValueError(entry)
+        return entry
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Process-wide cache shared by all requests
+job_model_cache = JobModelCache()
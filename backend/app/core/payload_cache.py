@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Any, Tuple
+import os
+import threading
+import zlib
+
+from pydantic import BaseModel
+
+from app.core.responses import dumps, orjson
+
+JOB_PAYLOAD_CACHE_SIZE = int(os.getenv("JOB_PAYLOAD_CACHE_SIZE", "5000"))
+
+# Set by the db converters from the source's write-time stamp
+RECORD_VERSION_FIELD = "record_version"
+
+
+def record_version(record: dict) -> str:
+    """Version of a source job record; changes whenever the record does.
+
+    Converted catalog records carry a RECORD_VERSION_FIELD stamped at write
+    or ingest time, so this is a dict lookup. Only records without a stamp
+    fall back to hashing their serialized content.
+    """
+    version = record.get(RECORD_VERSION_FIELD)
+    if version:
+        return str(version)
+    return format(zlib.crc32(dumps(record)), "08x")
+
+
+class JobPayloadCache:
+    """LRU of each job's response JSON, keyed by (job id, record version).
+
+    `fragment()` hands back an orjson.Fragment, which orjson copies into the
+    surrounding response verbatim, so a cached job body is never serialized
+    again. Without orjson it degrades to returning the plain dict.
+    """
+
+    def __init__(self, max_entries: int = JOB_PAYLOAD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_bytes(self, job_id: str, version: str, model: BaseModel) -> bytes:
+        key = (job_id, version)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+
+        payload = dumps(model.model_dump(by_alias=True))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = payload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def fragment(self, job_id: str, version: str, model: BaseModel) -> Any:
+        """Pre-serialized job body to splice into a response"""
+        if orjson is None or not hasattr(orjson, "Fragment"):
+            return model.model_dump(by_alias=True)
+        return orjson.Fragment(self.get_bytes(job_id, version, model))
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Process-wide cache shared by all requests
+job_payload_cache = JobPayloadCache()
@@ -0,0 +1,308 @@
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+FIXED_WINDOW = "fixed_window"
+SLIDING_WINDOW = "sliding_window"
+TOKEN_BUCKET = "token_bucket"
+
+EPOCH = datetime(1970, 1, 1)
+DAILY_SWIPE_LIMIT = int(os.getenv("DAILY_SWIPE_LIMIT", "20"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("RATE_LIMIT_AUDIT_FLUSH_SECONDS", "5"))
+
+# All scripts return {allowed, remaining, reset_ms} so callers can treat the
+# three algorithms the same way. A cost of 0 only peeks at the current state.
+# The token bucket tolerates a negative balance (see HostRateLimiter.penalize):
+# the key then lives until the debt is repaid and the bucket is full again.
+
+FIXED_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local ttl_ms = tonumber(ARGV[3])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local allowed = 1
+if cost > 0 then
+    if current + cost > limit then
+        allowed = 0
+    else
+        current = redis.call('INCRBY', KEYS[1], cost)
+        if current == cost then
+            redis.call('PEXPIRE', KEYS[1], ttl_ms)
+        end
+    end
+end
+local reset_ms = redis.call('PTTL', KEYS[1])
+if reset_ms < 0 then reset_ms = ttl_ms end
+return {allowed, limit - current, reset_ms}
+"""
+
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local window_ms = tonumber(ARGV[3])
+local now_ms = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - window_ms)
+local count = redis.call('ZCARD', KEYS[1])
+local allowed = 1
+if cost > 0 then
+    if count + cost > limit then
+        allowed = 0
+    else
+        for i = 1, cost do
+            redis.call('ZADD', KEYS[1], now_ms, ARGV[5] .. ':' .. i)
+        end
+        redis.call('PEXPIRE', KEYS[1], window_ms)
+        count = count + cost
+    end
+end
+local reset_ms = window_ms
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset_ms = tonumber(oldest[2]) + window_ms - now_ms
+end
+return {allowed, limit - count, reset_ms}
+"""
+
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local refill_per_ms = tonumber(ARGV[3])
+local now_ms = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now_ms
+end
+tokens = math.min(capacity, tokens + math.max(0, now_ms - ts) * refill_per_ms)
+local allowed = 1
+if cost > 0 then
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        allowed = 0
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now_ms)
+    redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - math.min(tokens, 0)) / refill_per_ms))
+end
+local reset_ms = 0
+if tokens < math.max(cost, 1) then
+    reset_ms = math.ceil((math.max(cost, 1) - tokens) / refill_per_ms)
+end
+return {allowed, math.floor(tokens), reset_ms}
+"""
+
+
+class RateLimitPolicy:
+    """Limit definition for one route"""
+
+    def __init__(self, algorithm: str, limit: int, window_seconds: int,
+                 align_to_utc_day: bool = False, audit: bool = False):
+        if algorithm not in (FIXED_WINDOW, SLIDING_WINDOW, TOKEN_BUCKET):
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        self.algorithm = algorithm
+        # For token buckets `limit` is the bucket capacity and the bucket
+        # refills completely over `window_seconds`.
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.align_to_utc_day = align_to_utc_day
+        self.audit = audit
+
+
+# Policies per route. User profiles carry no plan, so every user gets the same limits.
+RATE_LIMIT_POLICIES: Dict[str, RateLimitPolicy] = {
+    "swipe": RateLimitPolicy(
+        FIXED_WINDOW, DAILY_SWIPE_LIMIT, 24 * 3600, align_to_utc_day=True, audit=True),
+    "recommend": RateLimitPolicy(
+        TOKEN_BUCKET, int(os.getenv("RECOMMEND_BURST_LIMIT", "10")), 60),
+}
+
+
+def get_policy(route: str) -> RateLimitPolicy:
+    """Resolve the policy for a route"""
+    policy = RATE_LIMIT_POLICIES.get(route)
+    if policy is None:
+        raise KeyError(f"No rate limit policy for route '{route}'")
+    return policy
+
+
+class RateLimiter:
+    """Redis-backed rate limiter.
+
+    Every check is a single EVALSHA round trip. Counters for audited policies
+    are persisted to MongoDB in batches by a background task, so the request
+    path never waits on Mongo.
+    """
+
+    def __init__(self, redis_client, audit_collection=None):
+        self.redis_client = redis_client
+        self.audit_collection = audit_collection
+        self._scripts = {
+            FIXED_WINDOW: redis_client.register_script(FIXED_WINDOW_LUA),
+            SLIDING_WINDOW: redis_client.register_script(SLIDING_WINDOW_LUA),
+            TOKEN_BUCKET: redis_client.register_script(TOKEN_BUCKET_LUA),
+        }
+        self._pending_audit: Dict[Tuple[str, datetime], dict] = {}
+        self._audit_task: Optional[asyncio.Task] = None
+
+    def _window_bounds(self, policy: RateLimitPolicy, now: datetime) -> Tuple[datetime, datetime]:
+        """Start and end of the current fixed window"""
+        if policy.align_to_utc_day:
+            start = datetime(now.year, now.month, now.day)
+        else:
+            epoch = int((now - EPOCH).total_seconds())
+            start = datetime.utcfromtimestamp(
+                epoch - epoch % policy.window_seconds)
+        return start, start + timedelta(seconds=policy.window_seconds)
+
+    def _redis_key(self, route: str, identity: str,
+                   policy: RateLimitPolicy, window_start: datetime) -> str:
+        if policy.algorithm == FIXED_WINDOW:
+            return f"ratelimit:{route}:{identity}:{int((window_start - EPOCH).total_seconds())}"
+        return f"ratelimit:{route}:{identity}"
+
+    async def hit(self, route: str, identity: str, cost: int = 1) -> dict:
+        """Consume `cost` units for `identity` on `route`.
+
+        Returns: {
+            "allowed": bool,
+            "limit": int,
+            "remaining": int,
+            "reset_at": datetime,
+            "retry_after": int  # seconds, 0 when allowed
+        }
+        """
+        policy = get_policy(route)
+        now = datetime.utcnow()
+        now_ms = int(time.time() * 1000)
+        window_start, window_end = self._window_bounds(policy, now)
+        key = self._redis_key(route, identity, policy, window_start)
+        window_ms = policy.window_seconds * 1000
+
+        if policy.algorithm == FIXED_WINDOW:
+            ttl_ms = max(1, int((window_end - now).total_seconds() * 1000))
+            args = [policy.limit, cost, ttl_ms]
+        elif policy.algorithm == SLIDING_WINDOW:
+            args = [policy.limit, cost, window_ms, now_ms, uuid.uuid4().hex]
+        else:
+            refill_per_ms = policy.limit / window_ms
+            args = [policy.limit, cost, repr(refill_per_ms), now_ms]
+
+        allowed, remaining, reset_ms = await self._scripts[policy.algorithm](
+            keys=[key], args=args)
+
+        remaining = max(0, int(remaining))
+        reset_at = window_end if policy.algorithm == FIXED_WINDOW else \
+            now + timedelta(milliseconds=int(reset_ms))
+        result = {
+            "allowed": bool(allowed),
+            "limit": policy.limit,
+            "remaining": remaining,
+            "reset_at": reset_at,
+            "retry_after": 0 if allowed else max(1, int(reset_ms) // 1000)
+        }
+
+        if policy.audit and allowed and cost > 0:
+            self._record_audit(identity, window_start, window_end,
+                               policy.limit - remaining)
+
+        return result
+
+    async def peek(self, route: str, identity: str) -> dict:
+        """Current limiter state without consuming anything"""
+        return await self.hit(route, identity, cost=0)
+
+    # ===== Audit persistence =====
+
+    def _record_audit(self, identity: str, window_start: datetime,
+                      window_end: datetime, count: int):
+        """Queue the latest counter value for the background flusher"""
+        if self.audit_collection is None:
+            return
+        self._pending_audit[(identity, window_start)] = {
+            "count": count,
+            "reset_at": window_end,
+            "updated_at": datetime.utcnow()
+        }
+        if self._audit_task is None or self._audit_task.done():
+            self._audit_task = asyncio.create_task(self._audit_loop())
+
+    async def _audit_loop(self):
+        while self._pending_audit:
+            await asyncio.sleep(AUDIT_FLUSH_INTERVAL_SECONDS)
+            await self.flush_audit()
+
+    async def flush_audit(self) -> int:
+        """Write pending counters to MongoDB with one bulk_write"""
+        if not self._pending_audit or self.audit_collection is None:
+            return 0
+
+        from pymongo import UpdateOne
+
+        pending, self._pending_audit = self._pending_audit, {}
+        operations = [
+            UpdateOne(
+                {"user_id": identity, "date": window_start},
+                {
+                    # $max keeps the write idempotent if flushes overlap
+                    "$max": {"swipe_count": entry["count"]},
+                    "$set": {"reset_at": entry["reset_at"], "updated_at": entry["updated_at"]},
+                    "$setOnInsert": {"created_at": entry["updated_at"]}
+                },
+                upsert=True
+            )
+            for (identity, window_start), entry in pending.items()
+        ]
+        try:
+            await self.audit_collection.bulk_write(operations, ordered=False)
+            logger.debug(f"📊 Flushed {len(operations)} swipe limit counters")
+            return len(operations)
+        except Exception as e:
+            logger.error(f"❌ Failed to flush swipe limit audit: {e}")
+            # Keep the newest value for each key so the next flush retries it
+            for key, entry in pending.items():
+                self._pending_audit.setdefault(key, entry)
+            return 0
+
+
+def limit_route(route: str, identity_param: str = "clerk_id"):
+    """FastAPI dependency that throttles a route per path/query identity.
+
+    Usage: `Depends(limit_route("recommend"))`. Fails open when Redis is
+    unavailable, like the swipe limit does.
+    """
+    async def dependency(request: Request):
+        from app.core.db import db
+
+        identity = request.path_params.get(identity_param) or \
+            request.query_params.get(identity_param) or \
+            (request.client.host if request.client else "anonymous")
+        try:
+            result = await db.rate_limiter.hit(route, identity)
+        except Exception as e:
+            logger.error(f"❌ Rate limiter unavailable for {route}: {e}")
+            return None
+
+        if not result["allowed"]:
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "error": "Rate limit exceeded",
+                    "limit": result["limit"],
+                    "remaining": result["remaining"],
+                    "reset_at": result["reset_at"].isoformat()
+                },
+                headers={"Retry-After": str(result["retry_after"])}
+            )
+        return result
+
+    return dependency
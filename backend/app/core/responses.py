@@ -0,0 +1,55 @@
+from typing import Any
+import json
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(value: Any):
+    """Types orjson doesn't serialize on its own (datetime, enums and UUIDs it does)"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize API content to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _json_default(value: Any):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return _default(value)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-backed JSON response.
+
+    Handlers on hot paths return it directly with plain dicts so FastAPI
+    skips jsonable_encoder; anything else still works as the router's
+    default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def dump_models(models) -> list:
+    """Pydantic models as plain dicts (by alias, like FastAPI's encoder)"""
+    return [model.model_dump(by_alias=True) for model in models]
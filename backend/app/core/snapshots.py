@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Deduplicated job snapshots referenced from users_job_like/users_job_saved.
+# Snapshots are content-addressed and never modified, so cached copies can't
+# go stale.
+SNAPSHOTS_COLLECTION = "job_snapshots"
+JOB_SNAPSHOT_CACHE_SIZE = int(os.getenv("JOB_SNAPSHOT_CACHE_SIZE", "2048"))
+
+
+def snapshot_ref(job_id: str, job_details: dict) -> str:
+    """Snapshot key: job id plus a hash of the snapshot content"""
+    payload = json.dumps(job_details, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+    return f"{job_id}:{digest}"
+
+
+def build_snapshot_write(job_id: str, job_details: dict,
+                         now: Optional[datetime] = None) -> Tuple[str, UpdateOne]:
+    """Insert-once upsert for a snapshot; returns (ref, operation)"""
+    ref = snapshot_ref(job_id, job_details)
+    operation = UpdateOne(
+        {"_id": ref},
+        {"$setOnInsert": {
+            "job_id": job_id,
+            "job_details": job_details,
+            "created_at": now or datetime.utcnow()
+        }},
+        upsert=True
+    )
+    return ref, operation
+
+
+class JobSnapshotStore:
+    """Writes and resolves job snapshots, with an in-process LRU cache"""
+
+    def __init__(self, collection, cache_size: int = JOB_SNAPSHOT_CACHE_SIZE):
+        self.collection = collection
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+
+    def _remember(self, ref: str, job_details: dict):
+        self._cache[ref] = job_details
+        self._cache.move_to_end(ref)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def put_many(self, snapshots: Iterable[Tuple[str, dict]],
+                       now: Optional[datetime] = None) -> List[str]:
+        """Store (job_id, job_details) pairs; returns their refs in input order.
+
+        Snapshots this process already wrote or read are skipped, so popular
+        jobs cost one write per process rather than one per swipe.
+        """
+        refs, operations, fresh = [], [], {}
+        for job_id, job_details in snapshots:
+            ref, operation = build_snapshot_write(job_id, job_details, now)
+            refs.append(ref)
+            if ref not in self._cache and ref not in fresh:
+                operations.append(operation)
+                fresh[ref] = job_details
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+            for ref, job_details in fresh.items():
+                self._remember(ref, job_details)
+        return refs
+
+    async def put(self, job_id: str, job_details: dict) -> str:
+        return (await self.put_many([(job_id, job_details)]))[0]
+
+    async def resolve(self, refs: Iterable[str]) -> Dict[str, dict]:
+        """Snapshot details by ref: cache first, then a single $in query"""
+        found, missing = {}, []
+        for ref in dict.fromkeys(refs):
+            if ref in self._cache:
+                self._cache.move_to_end(ref)
+                found[ref] = self._cache[ref]
+            else:
+                missing.append(ref)
+
+        if missing:
+            cursor = self.collection.find(
+                {"_id": {"$in": missing}}, {"job_details": 1})
+            async for doc in cursor:
+                details = doc.get("job_details") or {}
+                found[doc["_id"]] = details
+                self._remember(doc["_id"], details)
+        return found
+
+    async def attach(self, docs: List[dict]) -> List[dict]:
+        """Fill job_details on action documents that only carry a job_ref.
+
+        Documents written before snapshots existed keep their embedded
+        job_details untouched.
+        """
+        refs = [doc["job_ref"] for doc in docs
+                if doc.get("job_ref") and not doc.get("job_details")]
+        if not refs:
+            return docs
+        try:
+            snapshots = await self.resolve(refs)
+        except Exception as e:
+            logger.error(f"❌ Failed to resolve job snapshots: {e}")
+            return docs
+        for doc in docs:
+            ref = doc.get("job_ref")
+            if ref and not doc.get("job_details") and ref in snapshots:
+                doc["job_details"] = snapshots[ref]
+        return docs
@@ -0,0 +1,363 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import json
+import logging
+import os
+import socket
+
+from pymongo import DeleteOne, UpdateOne
+
+from app.core.actions import (
+    ACTION_TIMESTAMP_FIELDS, INTERACTIONS_COLLECTION, REMOVALS_COLLECTION,
+    build_action_write, build_interaction_write, collection_for_action
+)
+
+logger = logging.getLogger(__name__)
+
+# sync   - write each swipe before responding (default)
+# memory - buffer in-process; lost if the process dies before a flush
+# redis  - buffer in a Redis stream; survives crashes and is replayed on start
+SWIPE_WRITE_MODE = os.getenv("SWIPE_WRITE_MODE", "sync").lower()
+SWIPE_FLUSH_INTERVAL_MS = int(os.getenv("SWIPE_FLUSH_INTERVAL_MS", "250"))
+SWIPE_FLUSH_MAX_ITEMS = int(os.getenv("SWIPE_FLUSH_MAX_ITEMS", "100"))
+
+STREAM_KEY = "stream:swipe-writes"
+CONSUMER_GROUP = "swipe-writers"
+# Messages left unacknowledged this long by another consumer are taken over
+STALE_CLAIM_MS = 30_000
+
+
+class SwipeWriteBuffer:
+    """Write-behind buffer for swipe persistence.
+
+    Swipes are queued and written with one ordered bulk_write per target
+    collection every SWIPE_FLUSH_INTERVAL_MS or SWIPE_FLUSH_MAX_ITEMS,
+    whichever comes first. Writes are plain $set upserts, so replaying a
+    batch after a partial failure or a crash is safe. Removals (unlike,
+    unsave) go through the same queue and leave a tombstone, so a buffered
+    upsert can't re-insert an item the user has since removed, whichever
+    consumer or process flushes it and in whatever order (see _write).
+    Order is decided by each entry's `ts`, taken from the submitting
+    process's clock.
+    """
+
+    def __init__(self, users_db, redis_client=None, mode: str = "sync",
+                 flush_interval_ms: int = SWIPE_FLUSH_INTERVAL_MS,
+                 max_items: int = SWIPE_FLUSH_MAX_ITEMS, exclusions=None,
+                 snapshots=None):
+        if mode not in ("sync", "memory", "redis"):
+            logger.warning(f"⚠️  Unknown SWIPE_WRITE_MODE '{mode}', using sync writes")
+            mode = "sync"
+        if mode == "redis" and redis_client is None:
+            mode = "memory"
+
+        self.users_db = users_db
+        self.redis_client = redis_client
+        self.exclusions = exclusions
+        self.snapshots = snapshots
+        self.mode = mode
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_items = max_items
+        self.consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+
+        self._buffer: List[dict] = []
+        self._unflushed = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._group_ready = False
+        self._last_ts: Optional[datetime] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "sync"
+
+    async def submit(self, action: str, user_id: str, job_id: str,
+                     job_details: Optional[dict] = None):
+        """Queue one swipe for the next flush"""
+        entry = {
+            "action": action,
+            "user_id": user_id,
+            "job_id": job_id,
+            "job_details": job_details,
+            "ts": self._stamp()
+        }
+        await self._enqueue(entry)
+
+        # Exclude the job from recommendations now, not at flush time
+        if self.exclusions is not None:
+            await self.exclusions.add(user_id, [job_id])
+
+    async def submit_removal(self, collection_name: str, user_id: str, job_id: str):
+        """Queue the removal of one action document behind earlier swipes"""
+        await self._enqueue({
+            "op": "remove",
+            "collection": collection_name,
+            "user_id": user_id,
+            "job_id": job_id,
+            "ts": self._stamp()
+        })
+
+    def _stamp(self) -> str:
+        """Entry time at Mongo's millisecond precision, strictly increasing per process.
+
+        Timestamps are compared against stored ones in _write, so finer
+        precision would be lost in the round trip; ties go to the removal.
+        """
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        if self._last_ts is not None and now <= self._last_ts:
+            now = self._last_ts + timedelta(milliseconds=1)
+        self._last_ts = now
+        return now.isoformat()
+
+    async def _enqueue(self, entry: dict):
+        if self.mode == "redis":
+            await self._ensure_group()
+            await self.redis_client.xadd(
+                STREAM_KEY, {"payload": json.dumps(entry, default=str)})
+        else:
+            self._buffer.append(entry)
+
+        self._unflushed += 1
+        if self._unflushed >= self.max_items:
+            self._wakeup.set()
+        self._ensure_running()
+
+    async def start(self):
+        """Replay anything a previous process left behind"""
+        if self.mode != "redis":
+            return
+        try:
+            await self._ensure_group()
+            claimed = await self._claim_stale()
+            if claimed:
+                logger.info(f"♻️  Recovered {claimed} buffered swipe writes")
+            self._ensure_running()
+        except Exception as e:
+            logger.error(f"❌ Failed to recover buffered swipe writes: {e}")
+
+    async def stop(self):
+        """Flush everything that is still buffered"""
+        if not self.enabled:
+            return
+        while await self.flush():
+            pass
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                flushed = await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Swipe write flush failed: {e}")
+                flushed = -1
+
+            # Idle: stop the loop, the next submit restarts it
+            if flushed == 0:
+                return
+
+    async def flush(self) -> int:
+        """Write one batch; returns the number of swipes persisted"""
+        if self.mode == "redis":
+            message_ids, entries = await self._read_stream()
+        else:
+            entries = self._buffer[:self.max_items]
+            self._buffer = self._buffer[self.max_items:]
+            message_ids = []
+
+        if not entries and not message_ids:
+            self._unflushed = 0
+            return 0
+
+        try:
+            if entries:
+                await self._write(entries)
+        except Exception:
+            if self.mode == "memory":
+                self._buffer = entries + self._buffer
+            # Redis entries stay pending and are re-read on the next flush
+            raise
+
+        if message_ids:
+            pipeline = self.redis_client.pipeline()
+            pipeline.xack(STREAM_KEY, CONSUMER_GROUP, *message_ids)
+            pipeline.xdel(STREAM_KEY, *message_ids)
+            await pipeline.execute()
+
+        self._unflushed = max(0, self._unflushed - len(entries))
+        logger.debug(f"💾 Flushed {len(entries)} buffered swipe writes")
+        return max(len(entries), len(message_ids))
+
+    async def _write(self, entries: List[dict]):
+        """Persist one batch; the outcome doesn't depend on flush order.
+
+        Several consumers (or processes, in memory mode) may flush a user's
+        swipe and a later removal of it in either order, and a claimed
+        message can be replayed after the removal ran. Removals therefore
+        write a tombstone before deleting anything, swipes older than a
+        tombstone are dropped, and deletes only touch documents older than
+        the removal.
+        """
+        removals = [entry for entry in entries if entry.get("op") == "remove"]
+        swipes = [entry for entry in entries if entry.get("op") != "remove"]
+
+        if removals:
+            await self._write_tombstones(removals)
+        tombstones = await self._tombstones_for(swipes)
+        swipes = [entry for entry in swipes if not self._superseded(entry, tombstones)]
+
+        operations = {}
+        for entry in swipes:
+            now = datetime.fromisoformat(entry["ts"])
+            collection_name, query, update = build_action_write(
+                entry["action"], entry["user_id"], entry["job_id"],
+                entry.get("job_details"), now)
+            operations.setdefault(collection_name, []).append(
+                UpdateOne(query, update, upsert=True))
+            operations.setdefault(INTERACTIONS_COLLECTION, []).append(UpdateOne(
+                *build_interaction_write(entry["user_id"], entry["job_id"], collection_name, now),
+                upsert=True))
+
+        writes = [
+            self.users_db[name].bulk_write(ops, ordered=True)
+            for name, ops in operations.items()
+        ]
+        snapshots = [(entry["job_id"], entry["job_details"])
+                     for entry in swipes if entry.get("job_details")]
+        if self.snapshots is not None and snapshots:
+            writes.append(self.snapshots.put_many(snapshots))
+        await asyncio.gather(*writes)
+
+        # A removal flushed elsewhere may have landed its tombstone after the
+        # check above; its delete can then have run before these upserts
+        tombstones = await self._tombstones_for(swipes)
+        removals += [
+            {"collection": collection_for_action(entry["action"]),
+             "user_id": entry["user_id"], "job_id": entry["job_id"],
+             "ts": tombstones[self._tombstone_key(entry)].isoformat()}
+            for entry in swipes if self._superseded(entry, tombstones)
+        ]
+        if removals:
+            await self._apply_removals(removals)
+            await self._unexclude_removed(removals)
+
+    @staticmethod
+    def _tombstone_key(entry: dict) -> Tuple[str, str, str]:
+        collection_name = entry.get("collection") or collection_for_action(entry["action"])
+        return entry["user_id"], entry["job_id"], collection_name
+
+    def _superseded(self, entry: dict, tombstones: dict) -> bool:
+        removed_at = tombstones.get(self._tombstone_key(entry))
+        return removed_at is not None and datetime.fromisoformat(entry["ts"]) <= removed_at
+
+    async def _write_tombstones(self, removals: List[dict]):
+        await self.users_db[REMOVALS_COLLECTION].bulk_write([
+            UpdateOne(
+                {"user_id": entry["user_id"], "job_id": entry["job_id"],
+                 "collection": entry["collection"]},
+                {"$max": {"removed_at": datetime.fromisoformat(entry["ts"])}},
+                upsert=True)
+            for entry in removals
+        ], ordered=False)
+
+    async def _tombstones_for(self, swipes: List[dict]) -> dict:
+        """Latest removal time per (user_id, job_id, collection) among `swipes`"""
+        if not swipes:
+            return {}
+        keys = {self._tombstone_key(entry) for entry in swipes}
+        cursor = self.users_db[REMOVALS_COLLECTION].find(
+            {"user_id": {"$in": list({key[0] for key in keys})},
+             "job_id": {"$in": list({key[1] for key in keys})}},
+            {"_id": 0, "user_id": 1, "job_id": 1, "collection": 1, "removed_at": 1})
+        tombstones = {}
+        async for doc in cursor:
+            key = (doc["user_id"], doc["job_id"], doc["collection"])
+            if key in keys:
+                tombstones[key] = doc["removed_at"]
+        return tombstones
+
+    async def _apply_removals(self, removals: List[dict]):
+        """Delete what each removal covers, leaving anything swiped after it"""
+        operations = {}
+        for entry in removals:
+            removed_at = datetime.fromisoformat(entry["ts"])
+            collection_name = entry["collection"]
+            operations.setdefault(collection_name, []).append(DeleteOne({
+                "user_id": entry["user_id"],
+                "job_id": entry["job_id"],
+                # $not also matches legacy rows with a missing or string timestamp
+                ACTION_TIMESTAMP_FIELDS[collection_name]: {"$not": {"$gt": removed_at}}
+            }))
+            operations.setdefault(INTERACTIONS_COLLECTION, []).append(UpdateOne(
+                *build_interaction_write(entry["user_id"], entry["job_id"], collection_name,
+                                         removed_at, remove=True)))
+        await asyncio.gather(*(
+            self.users_db[name].bulk_write(ops, ordered=True)
+            for name, ops in operations.items()
+        ))
+
+    async def _unexclude_removed(self, removals: List[dict]):
+        """Let removed jobs be recommended again once no action is left on them"""
+        if self.exclusions is None:
+            return
+        for entry in removals:
+            doc = await self.users_db[INTERACTIONS_COLLECTION].find_one(
+                {"user_id": entry["user_id"], "job_id": entry["job_id"]},
+                {"_id": 0, "actions": 1})
+            if not doc or not doc.get("actions"):
+                await self.exclusions.remove(entry["user_id"], entry["job_id"])
+
+    # ===== Redis stream helpers =====
+
+    async def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            await self.redis_client.xgroup_create(
+                STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _read_stream(self) -> Tuple[List[str], List[dict]]:
+        # Our own unacknowledged messages first (failed flushes, claimed
+        # messages), then new ones
+        await self._ensure_group()
+        for stream_id in ("0", ">"):
+            response = await self.redis_client.xreadgroup(
+                CONSUMER_GROUP, self.consumer_name, {STREAM_KEY: stream_id},
+                count=self.max_items)
+            messages = response[0][1] if response else []
+            if messages:
+                return self._decode_messages(messages)
+        return [], []
+
+    async def _claim_stale(self) -> int:
+        response = await self.redis_client.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, self.consumer_name,
+            min_idle_time=STALE_CLAIM_MS, start_id="0-0", count=1000)
+        messages = response[1] if response and len(response) > 1 else []
+        return len(messages)
+
+    def _decode_messages(self, messages) -> Tuple[List[str], List[dict]]:
+        message_ids, entries = [], []
+        for message_id, fields in messages:
+            message_ids.append(message_id)
+            if not fields or "payload" not in fields:
+                continue
+            try:
+                entries.append(json.loads(fields["payload"]))
+            except Exception as e:
+                logger.error(f"❌ Dropping unreadable swipe write {message_id}: {e}")
+        return message_ids, entries
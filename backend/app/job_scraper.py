@@ -2,23 +2,49 @@ import requests
 import json
 import time
 import re
-from bs4 import BeautifulSoup
+from bs4 import Tag
 from urllib.parse import urlencode, quote
 from typing import Dict, List, Optional, Set
 import logging
 import redis
-import hashlib
+import os
 from datetime import datetime, timedelta
 import asyncio
 import concurrent.futures
 
+from app.core.host_limiter import HostRateLimiter, host_of, parse_retry_after
+from app.core.job_cache import (
+    KNOWN_DETAIL_FIELDS, job_cluster, job_from_hash, job_hash_fields, matches_criteria,
+    search_cache_key, search_country, search_hash_fields, search_key, search_metadata,
+    stable_job_id, summarize_jobs
+)
+from app.services.company_matcher import TRUSTED_COMPANIES, trusted_company_matcher
+from app.services.job_classifier import JOB_CATEGORIES, job_classifier
+from app.services.skill_extractor import skill_extractor
+from app.utils.html_parsing import DETAIL_PAGE_STRAINER, SEARCH_PAGE_STRAINER, SEARCH_CARD_CLASSES, make_soup
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Classifier remote_status -> the Yes/Hybrid/No stored as `remote`
+REMOTE_WORK_LABELS = {'remote': 'Yes', 'hybrid': 'Hybrid', 'on-site': 'No'}
+
+# Cached detail pages younger than this are reused without any request;
+# older ones are revalidated with a conditional GET
+DETAIL_REFRESH_HOURS = float(os.getenv("SCRAPER_DETAIL_REFRESH_HOURS", "24"))
+
+
 class LinkedInJobScraper:
-    def __init__(self):
-        self.base_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    def __init__(self, origin: str = "https://www.linkedin.com", limiter: HostRateLimiter = None,
+                 detail_cache=None):
+        # origin is overridable so the scrapers can be pointed at a stub server
+        self.origin = origin.rstrip('/')
+        # Paces every outbound request; pass a Redis-backed one to share it
+        self.limiter = limiter or HostRateLimiter()
+        # Anything with get_known_details(job_ids), e.g. RedisJobDataCache
+        self.detail_cache = detail_cache
+        self.base_url = f"{self.origin}/jobs-guest/jobs/api/seeMoreJobPostings/search"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -31,138 +57,26 @@ class LinkedInJobScraper:
         self.session.headers.update(self.headers)
         
         # Trusted companies list - Fortune 500 + Major Tech Companies
-        self.trusted_companies = {
-            # Major Tech Companies
-            'google', 'microsoft', 'amazon', 'apple', 'meta', 'facebook', 'tesla', 'netflix',
-            'salesforce', 'oracle', 'adobe', 'nvidia', 'intel', 'ibm', 'cisco', 'vmware',
-            'spotify', 'uber', 'airbnb', 'twitter', 'linkedin', 'dropbox', 'slack', 'zoom',
-            'shopify', 'square', 'stripe', 'paypal', 'ebay', 'reddit', 'pinterest', 'snap',
-            'twilio', 'okta', 'snowflake', 'databricks', 'palantir', 'cloudflare', 'mongodb',
-            
-            # Financial Services
-            'jpmorgan', 'goldman sachs', 'morgan stanley', 'bank of america', 'wells fargo',
-            'citigroup', 'american express', 'visa', 'mastercard', 'blackrock', 'fidelity',
-            'charles schwab', 'robinhood', 'coinbase', 'stripe', 'square',
-            
-            # Consulting & Professional Services
-            'mckinsey', 'bain', 'bcg', 'deloitte', 'pwc', 'kpmg', 'ey', 'accenture',
-            'ibm consulting', 'tcs', 'infosys', 'wipro', 'cognizant', 'capgemini',
-            
-            # Fortune 500 Companies
-            'walmart', 'exxon mobil', 'berkshire hathaway', 'unitedhealth', 'mckesson',
-            'cvs health', 'amazon', 'at&t', 'general motors', 'ford', 'verizon',
-            'chevron', 'kroger', 'general electric', 'walgreens', 'phillips 66',
-            'marathon petroleum', 'costco', 'cardinal health', 'express scripts',
-            
-            # Healthcare & Pharma
-            'johnson & johnson', 'pfizer', 'merck', 'abbott', 'bristol myers squibb',
-            'eli lilly', 'gilead', 'amgen', 'biogen', 'regeneron', 'moderna',
-            'kaiser permanente', 'anthem', 'humana', 'centene',
-            
-            # Startups & Unicorns
-            'openai', 'anthropic', 'canva', 'figma', 'notion', 'discord', 'github',
-            'gitlab', 'atlassian', 'asana', 'monday.com', 'miro', 'airtable'
-        }
+        self.trusted_companies = TRUSTED_COMPANIES
         
         # Job categories mapping with related keywords
-        self.job_categories = {
-            'Software Engineering': [
-                'software engineer', 'software developer', 'full stack developer', 
-                'frontend developer', 'backend developer', 'web developer',
-                'mobile developer', 'ios developer', 'android developer',
-                'python developer', 'java developer', 'javascript developer',
-                'react developer', 'node.js developer', '.net developer'
-            ],
-            'Data Science & Analytics': [
-                'data scientist', 'data analyst', 'data engineer', 'ml engineer',
-                'machine learning engineer', 'ai engineer', 'research scientist',
-                'business analyst', 'business intelligence', 'data visualization',
-                'statistician', 'quantitative analyst', 'analytics engineer'
-            ],
-            'DevOps & Infrastructure': [
-                'devops engineer', 'cloud engineer', 'infrastructure engineer',
-                'site reliability engineer', 'platform engineer', 'systems engineer',
-                'network engineer', 'security engineer', 'aws engineer',
-                'kubernetes engineer', 'docker', 'terraform'
-            ],
-            'Product & Design': [
-                'product manager', 'product owner', 'ux designer', 'ui designer',
-                'product designer', 'user experience', 'user interface',
-                'design lead', 'creative director', 'graphic designer'
-            ],
-            'Cybersecurity': [
-                'security engineer', 'cybersecurity analyst', 'security architect',
-                'penetration tester', 'security consultant', 'incident response',
-                'vulnerability assessment', 'compliance analyst'
-            ],
-            'Project Management': [
-                'project manager', 'program manager', 'scrum master',
-                'agile coach', 'delivery manager', 'technical program manager',
-                'pmp', 'project coordinator'
-            ],
-            'Sales & Marketing': [
-                'sales representative', 'account manager', 'business development',
-                'marketing manager', 'digital marketing', 'growth marketing',
-                'content marketing', 'social media manager', 'seo specialist'
-            ],
-            'Finance & Accounting': [
-                'financial analyst', 'accountant', 'controller', 'cfo',
-                'investment analyst', 'risk analyst', 'auditor',
-                'financial planner', 'treasury analyst'
-            ],
-            'Human Resources': [
-                'hr manager', 'recruiter', 'talent acquisition', 'hr business partner',
-                'compensation analyst', 'learning and development', 'hr generalist'
-            ],
-            'Operations': [
-                'operations manager', 'supply chain', 'logistics coordinator',
-                'business operations', 'process improvement', 'quality assurance'
-            ]
-        }
+        self.job_categories = JOB_CATEGORIES
     
     def is_trusted_company(self, company_name: str) -> bool:
         """Check if a company is in the trusted companies list"""
-        if not company_name:
-            return False
-        
-        company_lower = company_name.lower().strip()
-        
-        # Direct match
-        if company_lower in self.trusted_companies:
-            return True
-        
-        # Partial match for companies with variations
-        for trusted in self.trusted_companies:
-            if trusted in company_lower or company_lower in trusted:
-                return True
-        
-        return False
+        return trusted_company_matcher.is_trusted(company_name)
     
     def get_job_category(self, title: str, description: str = "") -> str:
         """Determine job category based on title and description"""
-        title_lower = title.lower()
-        desc_lower = description.lower()
-        combined_text = f"{title_lower} {desc_lower}"
-        
-        category_scores = {}
-        
-        for category, keywords in self.job_categories.items():
-            score = 0
-            for keyword in keywords:
-                # Higher weight for title matches
-                if keyword in title_lower:
-                    score += 3
-                # Lower weight for description matches
-                elif keyword in desc_lower:
-                    score += 1
-            
-            if score > 0:
-                category_scores[category] = score
-        
-        if category_scores:
-            return max(category_scores, key=category_scores.get)
-        
-        return 'Other'
+        return job_classifier.classify(title, description)['category']
+
+    def classify_job(self, job_data: Dict) -> Dict:
+        """Category and remote status of a completed job, from one classifier pass"""
+        labels = job_classifier.classify(
+            job_data.get('title', ''), job_data.get('description', ''), job_data.get('location', ''))
+        job_data['category'] = labels['category']
+        job_data['remote_work'] = REMOTE_WORK_LABELS[labels['remote_status']]
+        return job_data
     
     def build_search_params(self, keywords: str = "software engineer", location: str = "India", 
                           start: int = 0, count: int = 25, job_type_filter: str = None) -> Dict:
@@ -192,9 +106,9 @@ class LinkedInJobScraper:
         
         return params
     
-    def extract_job_details(self, job_html: str) -> Dict:
-        """Extract job details from HTML content"""
-        soup = BeautifulSoup(job_html, 'html.parser')
+    def extract_job_details(self, job_html) -> Dict:
+        """Extract job details from a card's HTML or its already-parsed Tag"""
+        soup = job_html if isinstance(job_html, Tag) else make_soup(job_html)
         
         job_data = {
             'title': '',
@@ -254,15 +168,15 @@ class LinkedInJobScraper:
             if time_elem:
                 job_data['posted_date'] = time_elem.get('datetime', time_elem.get_text().strip())
             
-            # Detect job type and experience level from title
-            job_data['job_type'] = self.detect_job_type(job_data['title'])
-            job_data['experience_level'] = self.detect_experience_level(job_data['title'])
-            
-            # Extract additional metadata
+            # Detect job type and experience level from title, employment
+            # type from the card metadata, in one classifier pass
             metadata_elem = soup.find('div', class_='base-search-card__metadata')
+            metadata_text = metadata_elem.get_text().strip() if metadata_elem else ''
+            labels = job_classifier.classify(job_data['title'], metadata=metadata_text)
+            job_data['job_type'] = labels['job_type']
+            job_data['experience_level'] = labels['experience_level']
             if metadata_elem:
-                metadata_text = metadata_elem.get_text().strip()
-                job_data['employment_type'] = self.parse_employment_type(metadata_text)
+                job_data['employment_type'] = labels['employment_type']
             
         except Exception as e:
             logger.error(f"Error extracting job details: {str(e)}")
@@ -271,80 +185,129 @@ class LinkedInJobScraper:
     
     def detect_job_type(self, title: str) -> str:
         """Detect job type from job title"""
-        title_lower = title.lower()
-        
-        if any(keyword in title_lower for keyword in ['intern', 'internship']):
-            return 'Internship'
-        elif any(keyword in title_lower for keyword in ['contract', 'contractor', 'freelance', 'temporary']):
-            return 'Contract'
-        elif any(keyword in title_lower for keyword in ['part-time', 'part time']):
-            return 'Part-time'
-        else:
-            return 'Full-time'
+        return job_classifier.classify(title)['job_type']
     
     def detect_experience_level(self, title: str) -> str:
         """Detect experience level from job title"""
-        title_lower = title.lower()
-        
-        if any(keyword in title_lower for keyword in ['senior', 'sr.', 'lead', 'principal', 'staff']):
-            return 'Senior'
-        elif any(keyword in title_lower for keyword in ['junior', 'jr.', 'entry', 'associate', 'intern']):
-            return 'Entry Level'
-        elif any(keyword in title_lower for keyword in ['mid', 'intermediate']):
-            return 'Mid Level'
-        else:
-            return 'Mid Level'  # Default
+        return job_classifier.classify(title)['experience_level']
     
     def parse_employment_type(self, metadata_text: str) -> str:
         """Parse employment type from metadata"""
-        metadata_lower = metadata_text.lower()
-        
-        if 'full-time' in metadata_lower:
-            return 'Full-time'
-        elif 'part-time' in metadata_lower:
-            return 'Part-time'
-        elif 'contract' in metadata_lower:
-            return 'Contract'
-        elif 'internship' in metadata_lower:
-            return 'Internship'
-        else:
-            return 'Full-time'  # Default
+        return job_classifier.classify(metadata=metadata_text)['employment_type']
     
-    def get_job_description(self, job_url: str) -> Dict:
-        """Fetch detailed job description from job URL"""
+    def absolute_job_url(self, job_url: str) -> str:
+        """Resolve a card's (possibly relative) job link against the origin"""
+        if not job_url.startswith('http'):
+            job_url = f"{self.origin}{job_url}"
+        return job_url
+
+    def empty_job_description(self) -> Dict:
+        return {'description': '', 'requirements': [], 'skills': [], 'salary': ''}
+
+    def parse_job_description(self, html) -> Dict:
+        """Extract description, requirements, skills and salary from a job page"""
+        soup = make_soup(html, parse_only=DETAIL_PAGE_STRAINER)
+
+        # Extract job description
+        description_elem = soup.find('div', class_='show-more-less-html__markup')
+        if not description_elem:
+            description_elem = soup.find('div', class_='description__text')
+
+        description = ''
+        if description_elem:
+            description = description_elem.get_text().strip()
+
+        # Extract requirements and skills
+        requirements, skills = self.parse_description_for_requirements(description)
+
+        # Extract salary if available
+        salary = self.extract_salary_info(soup)
+
+        return {
+            'description': description,
+            'requirements': requirements,
+            'skills': skills,
+            'salary': salary
+        }
+
+    def lookup_known_details(self, jobs: List[Dict]) -> Dict[str, Dict]:
+        """Assign each card its job_id and fetch cached details in one batch"""
+        for job_data in jobs:
+            job_data['job_id'] = stable_job_id(job_data)
+        if self.detail_cache is None or not jobs:
+            return {}
         try:
-            if not job_url.startswith('http'):
-                job_url = f"https://www.linkedin.com{job_url}"
-            
-            response = self.session.get(job_url, timeout=15)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract job description
-                description_elem = soup.find('div', class_='show-more-less-html__markup')
-                if not description_elem:
-                    description_elem = soup.find('div', class_='description__text')
-                
-                description = ''
-                if description_elem:
-                    description = description_elem.get_text().strip()
-                
-                # Extract requirements and skills
-                requirements, skills = self.parse_description_for_requirements(description)
-                
-                # Extract salary if available
-                salary = self.extract_salary_info(soup)
-                
-                return {
-                    'description': description,
-                    'requirements': requirements,
-                    'skills': skills,
-                    'salary': salary
-                }
+            return self.detail_cache.get_known_details([job_data['job_id'] for job_data in jobs])
+        except Exception as e:
+            logger.warning(f"Known-job lookup failed, fetching every detail page: {str(e)}")
+            return {}
+
+    def is_detail_fresh(self, known: Optional[Dict]) -> bool:
+        if not known or not known.get('description') or not known.get('fetched_at'):
+            return False
+        try:
+            fetched_at = datetime.fromisoformat(known['fetched_at'])
+        except ValueError:
+            return False
+        return datetime.now() - fetched_at < timedelta(hours=DETAIL_REFRESH_HOURS)
+
+    def cached_job_description(self, known: Dict) -> Dict:
+        """Detail fields of a job as stored in Redis by save_job_to_redis"""
+        return {
+            'description': known.get('description') or '',
+            'requirements': json.loads(known.get('requirements') or '[]'),
+            'skills': json.loads(known.get('skills') or '[]'),
+            'salary': known.get('salary') or '',
+            'etag': known.get('etag') or '',
+            'last_modified': known.get('last_modified') or '',
+            'detail_fetched_at': known.get('fetched_at') or ''
+        }
+
+    def conditional_headers(self, known: Optional[Dict]) -> Dict:
+        headers = {}
+        if known and known.get('description'):
+            if known.get('etag'):
+                headers['If-None-Match'] = known['etag']
+            if known.get('last_modified'):
+                headers['If-Modified-Since'] = known['last_modified']
+        return headers
+
+    def described_response(self, status_code: int, headers, content, known: Optional[Dict]) -> Optional[Dict]:
+        """Details for a detail-page response: parsed on 200, cached on 304"""
+        if status_code == 304 and known:
+            details = self.cached_job_description(known)
+        elif status_code == 200:
+            details = self.parse_job_description(content)
+            details['etag'] = headers.get('ETag', '')
+            details['last_modified'] = headers.get('Last-Modified', '')
+        else:
+            return None
+        details['detail_fetched_at'] = datetime.now().isoformat()
+        return details
+
+    def get_job_description(self, job_url: str, known: Optional[Dict] = None) -> Dict:
+        """Fetch detailed job description from job URL.
+
+        `known` is the job's cached entry from lookup_known_details: fresh
+        entries are returned without a request, stale ones are revalidated
+        with If-None-Match / If-Modified-Since.
+        """
+        if self.is_detail_fresh(known):
+            return self.cached_job_description(known)
+        try:
+            job_url = self.absolute_job_url(job_url)
+
+            self.limiter.acquire_sync(host_of(job_url))
+            response = self.session.get(job_url, headers=self.conditional_headers(known), timeout=15)
+            if response.status_code == 429:
+                self.limiter.penalize_sync(host_of(job_url), parse_retry_after(response.headers.get('Retry-After')) or 1)
+            details = self.described_response(response.status_code, response.headers, response.content, known)
+            if details is not None:
+                return details
         except Exception as e:
             logger.error(f"Error fetching job description from {job_url}: {str(e)}")
         
-        return {'description': '', 'requirements': [], 'skills': [], 'salary': ''}
+        return self.empty_job_description()
     
     def extract_salary_info(self, soup) -> str:
         """Extract salary information from job page"""
@@ -371,90 +334,7 @@ class LinkedInJobScraper:
     
     def parse_description_for_requirements(self, description: str) -> tuple:
         """Parse job description to extract requirements and skills"""
-        requirements = []
-        skills = set()
-        
-        # Expanded skill keywords by category
-        skill_categories = {
-            'Programming Languages': [
-                'python', 'java', 'javascript', 'typescript', 'c++', 'c#', '.net',
-                'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'r',
-                'matlab', 'perl', 'objective-c', 'dart', 'elixir'
-            ],
-            'Web Technologies': [
-                'react', 'angular', 'vue.js', 'node.js', 'express', 'django',
-                'flask', 'spring', 'laravel', 'rails', 'asp.net', 'html',
-                'css', 'sass', 'less', 'webpack', 'babel', 'jquery'
-            ],
-            'Databases': [
-                'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-                'oracle', 'sql server', 'sqlite', 'cassandra', 'dynamodb',
-                'neo4j', 'influxdb', 'mariadb'
-            ],
-            'Cloud & DevOps': [
-                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
-                'ansible', 'jenkins', 'git', 'github', 'gitlab', 'bitbucket',
-                'ci/cd', 'linux', 'ubuntu', 'centos', 'nginx', 'apache'
-            ],
-            'Data & Analytics': [
-                'machine learning', 'deep learning', 'artificial intelligence',
-                'ai', 'data science', 'pandas', 'numpy', 'scikit-learn',
-                'tensorflow', 'pytorch', 'keras', 'tableau', 'power bi',
-                'spark', 'hadoop', 'kafka', 'airflow'
-            ],
-            'Mobile': [
-                'ios', 'android', 'react native', 'flutter', 'xamarin',
-                'cordova', 'ionic', 'swift', 'objective-c', 'kotlin', 'java'
-            ]
-        }
-        
-        # Flatten all skills
-        all_skills = []
-        for category_skills in skill_categories.values():
-            all_skills.extend(category_skills)
-        
-        description_lower = description.lower()
-        
-        # Extract skills (case-insensitive matching)
-        for skill in all_skills:
-            if skill.lower() in description_lower:
-                skills.add(skill.title())
-        
-        # Extract requirements using more sophisticated patterns
-        requirement_patterns = [
-            r'(?:required|must have|essential|mandatory)[:\s]([^.!?]{10,100})',
-            r'(?:minimum|at least)[\s]+(\d+[\s]*(?:years?|yrs?)[\s]*(?:of)?[\s]*experience)',
-            r'(?:bachelor|master|phd|degree)[^.!?]{0,50}',
-            r'(?:experience with|proficiency in|knowledge of)[^.!?]{10,80}',
-            r'(?:strong|excellent|solid)[\s]+(?:knowledge|understanding|experience)[^.!?]{10,80}'
-        ]
-        
-        for pattern in requirement_patterns:
-            matches = re.finditer(pattern, description, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                requirement = match.group(0).strip()
-                if len(requirement) > 15 and len(requirement) < 200:  # Filter reasonable length
-                    requirements.append(requirement)
-        
-        # Also extract bullet points and numbered lists
-        sentences = re.split(r'[.!?•·‣▪▫-]\s*', description)
-        for sentence in sentences:
-            sentence = sentence.strip()
-            sentence_lower = sentence.lower()
-            
-            # Look for requirement indicators
-            if any(indicator in sentence_lower for indicator in [
-                'required', 'must have', 'essential', 'mandatory', 'minimum',
-                'years of experience', 'degree', 'certification', 'preferred'
-            ]):
-                if 20 <= len(sentence) <= 150:  # Reasonable length
-                    requirements.append(sentence)
-        
-        # Remove duplicates and limit results
-        requirements = list(dict.fromkeys(requirements))[:8]  # Keep unique, limit to 8
-        skills = list(skills)[:12]  # Limit to 12 skills
-        
-        return requirements, skills
+        return skill_extractor.parse_description(description)
     
     def filter_by_category(self, jobs: List[Dict], category: str) -> List[Dict]:
         """Filter jobs by category"""
@@ -475,15 +355,18 @@ class LinkedInJobScraper:
     def make_request_with_backoff(self, url: str, params: Dict = None, max_retries: int = 3,
                                 base_timeout: int = 30) -> requests.Response:
         """Make HTTP request with exponential backoff and retry logic"""
+        host = host_of(url)
         for attempt in range(max_retries):
             try:
+                self.limiter.acquire_sync(host)
                 response = self.session.get(url, params=params, timeout=base_timeout)
 
-                # Handle rate limiting (429 Too Many Requests)
+                # Handle rate limiting (429 Too Many Requests): the limiter
+                # holds the host back for Retry-After before the next attempt
                 if response.status_code == 429:
-                    wait_time = 2 ** attempt  # Exponential backoff
+                    wait_time = parse_retry_after(response.headers.get('Retry-After')) or 2 ** attempt
                     logger.warning(f"Rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    time.sleep(wait_time)
+                    self.limiter.penalize_sync(host, wait_time)
                     continue
 
                 # Handle other client/server errors
@@ -526,6 +409,13 @@ class LinkedInJobScraper:
         # This should never be reached, but just in case
         raise Exception(f"Request failed after {max_retries} attempts")
 
+    def extract_job_cards(self, html) -> List[Dict]:
+        """Parse a search results page into one job dict per card"""
+        soup = make_soup(html, parse_only=SEARCH_PAGE_STRAINER)
+        job_cards = soup.find_all('div', class_=SEARCH_CARD_CLASSES)
+        # Cards are read in place; no serialize-and-reparse per card
+        return [self.extract_job_details(card) for card in job_cards]
+
     def scrape_jobs(self, keywords: str = "software engineer", location: str = "India",
                    max_jobs: int = 50, job_type_filter: str = None, category_filter: str = None,
                    trusted_only: bool = True) -> List[Dict]:
@@ -546,49 +436,42 @@ class LinkedInJobScraper:
                 # Use enhanced request method with retry and backoff
                 response = self.make_request_with_backoff(self.base_url, params=params, max_retries=3, base_timeout=30)
 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                job_cards = soup.find_all('div', class_=['base-card', 'job-search-card'])
+                job_cards = self.extract_job_cards(response.content)
 
                 if not job_cards:
                     logger.info("No more job cards found")
                     break
 
-                jobs_added_this_batch = 0
-
-                for card in job_cards:
-                    if len(all_jobs) >= max_jobs:
-                        break
+                # Skip if company is not trusted (when trusted_only is True)
+                if trusted_only:
+                    job_cards = [job_data for job_data in job_cards if job_data['is_trusted_company']]
+                job_cards = job_cards[:max_jobs - len(all_jobs)]
 
-                    job_data = self.extract_job_details(str(card))
+                # One pipelined Redis lookup per page; known jobs skip the detail fetch
+                known_details = self.lookup_known_details(job_cards)
 
-                    # Skip if company is not trusted (when trusted_only is True)
-                    if trusted_only and not job_data['is_trusted_company']:
-                        continue
+                jobs_added_this_batch = 0
 
+                for job_data in job_cards:
                     # Get detailed description if URL is available
                     if job_data['job_url']:
-                        detailed_info = self.get_job_description(job_data['job_url'])
+                        detailed_info = self.get_job_description(
+                            job_data['job_url'], known_details.get(job_data['job_id'])
+                        )
                         job_data.update(detailed_info)
 
-                    # Determine job category
-                    job_data['category'] = self.get_job_category(
-                        job_data['title'],
-                        job_data.get('description', '')
-                    )
+                    # Category and remote status in one classifier pass
+                    self.classify_job(job_data)
 
                     all_jobs.append(job_data)
                     jobs_added_this_batch += 1
 
-                    # Add delay to be respectful to LinkedIn's servers
-                    time.sleep(0.5)
-
                 # If no jobs were added in this batch, break to avoid infinite loop
                 if jobs_added_this_batch == 0:
                     logger.info("No qualifying jobs found in this batch")
                     break
 
                 start += count
-                time.sleep(2)  # Delay between pages
 
             except Exception as e:
                 logger.error(f"Error during scraping: {str(e)}")
@@ -656,73 +539,18 @@ class RedisJobDataCache:
                          job_type_filter: str = None, category_filter: str = None, 
                          trusted_only: bool = True) -> str:
         """Generate unique cache key based on search parameters"""
-        search_params = f"{keywords}_{location}_{max_jobs}_{job_type_filter}_{category_filter}_{trusted_only}"
-        return hashlib.md5(search_params.encode()).hexdigest()
-    
-    def _determine_remote_status(self, job_data: dict) -> str:
-        """Determine if a job is remote based on location and description"""
-        try:
-            location = job_data.get('location', '').lower()
-            description = job_data.get('description', '').lower()
-            
-            # Check for remote keywords in location
-            remote_location_keywords = ['remote', 'work from home', 'wfh', 'virtual', 'anywhere']
-            if any(keyword in location for keyword in remote_location_keywords):
-                return 'remote'
-            
-            # Check for remote keywords in description
-            remote_desc_keywords = ['remote work', 'work from home', 'wfh', 'virtual', 'distributed team', 'remote-first']
-            if any(keyword in description for keyword in remote_desc_keywords):
-                return 'remote'
-            
-            # Check for hybrid keywords
-            hybrid_keywords = ['hybrid', 'flexible', 'partially remote']
-            if any(keyword in location or keyword in description for keyword in hybrid_keywords):
-                return 'hybrid'
-            
-            return 'on-site'
-            
-        except Exception as e:
-            logger.error(f"Error determining remote status: {e}")
-            return 'on-site'
+        return search_cache_key(keywords, location, max_jobs, job_type_filter, category_filter, trusted_only)
     
     def save_job_to_redis(self, job_data: Dict) -> bool:
         """Save individual job to Redis hash with country-based partitioning"""
         try:
-            # Generate unique job ID if not present
-            if 'job_id' not in job_data:
-                job_id_source = f"{job_data.get('title', '')}{job_data.get('company', '')}{job_data.get('location', '')}"
-                job_data['job_id'] = hashlib.md5(job_id_source.encode()).hexdigest()[:12]
-
-            job_id = job_data['job_id']
-            location = job_data.get('location', '').lower()
-
-            # Determine country
-            if any(keyword in location for keyword in ['usa', 'us', 'united states']):
-                country = 'usa'
-            elif any(keyword in location for keyword in ['india', 'mumbai', 'delhi', 'bangalore']):
-                country = 'india'
-            else:
-                country = 'global'
+            # Prepare job fields for Redis Hash (assigns job_id if missing)
+            redis_fields = job_hash_fields(job_data, self.cache_duration_seconds)
+            job_id = redis_fields['job_id']
 
             # Create cluster-based storage system
             redis_key = f"job:{job_id}"
-            cluster_key = f"cluster:{country}:jobs"
-
-            # Prepare job fields for Redis Hash
-            redis_fields = {
-                'title': job_data.get('title', ''),
-                'company': job_data.get('company', ''),
-                'location': location,
-                'country': country,
-                'job_type': job_data.get('job_type', ''),
-                'skills': json.dumps(job_data.get('skills', [])),
-                'requirements': json.dumps(job_data.get('requirements', [])),
-                'description': job_data.get('description', ''),
-                'job_id': job_id,
-                'created_at': datetime.now().isoformat(),
-                'expires_at': (datetime.now() + timedelta(seconds=self.cache_duration_seconds)).isoformat()
-            }
+            cluster_key = f"cluster:{job_cluster(redis_fields['location'])}:jobs"
 
             # Use pipeline for atomic operations
             pipeline = self.redis_client.pipeline()
@@ -738,19 +566,25 @@ class RedisJobDataCache:
             logger.error(f"Error saving job to Redis: {str(e)}")
             return False
 
+    def get_known_details(self, job_ids: List[str]) -> Dict[str, Dict]:
+        """Cached detail fields for the given job IDs, in one pipelined round trip"""
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipeline.hmget(f"job:{job_id}", KNOWN_DETAIL_FIELDS)
+
+        known = {}
+        for job_id, values in zip(job_ids, pipeline.execute()):
+            if any(value is not None for value in values):
+                known[job_id] = dict(zip(KNOWN_DETAIL_FIELDS, values))
+        return known
+
     def save_to_cache(self, cache_key: str, jobs_data: List[Dict], metadata: Dict = None) -> bool:
         """Save job search results to Redis with country-based partitioning"""
         try:
             # Group jobs by country
             country_jobs = {}
             for job_data in jobs_data:
-                location = job_data.get('location', '').lower()
-                country = 'india'  # Default country
-                
-                if ',' in location:
-                    country = location.split(',')[-1].strip().lower()
-                
-                country_jobs.setdefault(country, []).append(job_data)
+                country_jobs.setdefault(search_country(job_data.get('location', '')), []).append(job_data)
 
             saved_job_ids = []
             for country, country_specific_jobs in country_jobs.items():
@@ -761,22 +595,22 @@ class RedisJobDataCache:
 
                 # Save country-specific search results
                 country_search_key = f"{country}:search:{cache_key}"
-                search_metadata = {
-                    'cache_key': cache_key,
-                    'country': country,
-                    'job_ids': json.dumps(saved_job_ids),
-                    'job_count': len(saved_job_ids),
-                    'metadata': json.dumps(metadata or {}),
-                    'created_at': datetime.now().isoformat(),
-                    'expires_at': (datetime.now() + timedelta(seconds=self.cache_duration_seconds)).isoformat()
-                }
+                search_fields = search_hash_fields(
+                    cache_key, country, saved_job_ids, metadata, self.cache_duration_seconds)
                 
                 # Store country-specific search metadata
-                self.redis_client.hset(country_search_key, mapping=search_metadata)
+                self.redis_client.hset(country_search_key, mapping=search_fields)
                 self.redis_client.expire(country_search_key, self.cache_duration_seconds)
                 
                 # Add to country-specific search index
                 self.redis_client.sadd(f"{country}:active_searches", cache_key)
+
+            # The combined record is what load_from_cache and the cleanup read
+            search_fields = search_hash_fields(
+                cache_key, 'all', saved_job_ids, metadata, self.cache_duration_seconds)
+            self.redis_client.hset(search_key(cache_key), mapping=search_fields)
+            self.redis_client.expire(search_key(cache_key), self.cache_duration_seconds)
+            self.redis_client.sadd("active_searches", cache_key)
             
             logger.info(f"Saved {len(saved_job_ids)} jobs to Redis cache across {len(country_jobs)} countries")
             return True
@@ -830,24 +664,7 @@ class RedisJobDataCache:
     def _process_redis_job_data(self, redis_job_data: Dict) -> Dict:
         """Convert Redis hash data back to job dictionary format"""
         try:
-            return {
-                'title': redis_job_data.get('title', ''),
-                'company': redis_job_data.get('company', ''),
-                'location': redis_job_data.get('location', ''),
-                'description': redis_job_data.get('description', ''),
-                'requirements': json.loads(redis_job_data.get('requirements', '[]')),
-                'job_type': redis_job_data.get('job_type', ''),
-                'skills': json.loads(redis_job_data.get('skills', '[]')),
-                'posted_date': redis_job_data.get('posted_date', ''),
-                'job_url': redis_job_data.get('url', ''),
-                'salary': redis_job_data.get('salary', ''),
-                'category': redis_job_data.get('category', ''),
-                'is_trusted_company': redis_job_data.get('is_trusted_company', 'False') == 'True',
-                'experience_level': redis_job_data.get('experience_level', ''),
-                'employment_type': redis_job_data.get('employment_type', ''),
-                'job_id': redis_job_data.get('job_id', ''),
-                'remote_work': redis_job_data.get('remote', 'No')
-            }
+            return job_from_hash(redis_job_data)
         except Exception as e:
             logger.error(f"Error processing Redis job data: {str(e)}")
             return {}
@@ -1019,19 +836,8 @@ class RedisJobDataCache:
                     continue
                 
                 # Apply filters
-                if title_keyword and title_keyword.lower() not in job_data.get('title', '').lower():
-                    continue
-                
-                if company_keyword and company_keyword.lower() not in job_data.get('company', '').lower():
-                    continue
-                
-                if location_keyword and location_keyword.lower() not in job_data.get('location', '').lower():
-                    continue
-                
-                if remote_only and job_data.get('remote', 'No') == 'No':
-                    continue
-                
-                if trusted_only and job_data.get('is_trusted_company', 'False') != 'True':
+                if not matches_criteria(job_data, title_keyword, company_keyword,
+                                        location_keyword, remote_only, trusted_only):
                     continue
                 
                 # Convert and add to results
@@ -1053,59 +859,7 @@ class RedisJobDataCache:
             if not job_keys:
                 return {'total_jobs': 0}
             
-            # Collect statistics
-            stats = {
-                'total_jobs': 0,
-                'by_company': {},
-                'by_location': {},
-                'by_job_type': {},
-                'by_category': {},
-                'by_experience_level': {},
-                'remote_stats': {'Yes': 0, 'No': 0, 'Hybrid': 0},
-                'trusted_companies': 0
-            }
-            
-            for job_key in job_keys:
-                job_data = self.redis_client.hgetall(job_key)
-                if not job_data:
-                    continue
-                
-                stats['total_jobs'] += 1
-                
-                # Company stats
-                company = job_data.get('company', 'Unknown')
-                stats['by_company'][company] = stats['by_company'].get(company, 0) + 1
-                
-                # Location stats
-                location = job_data.get('location', 'Unknown')
-                stats['by_location'][location] = stats['by_location'].get(location, 0) + 1
-                
-                # Job type stats
-                job_type = job_data.get('job_type', 'Unknown')
-                stats['by_job_type'][job_type] = stats['by_job_type'].get(job_type, 0) + 1
-                
-                # Category stats
-                category = job_data.get('category', 'Unknown')
-                stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-                
-                # Experience level stats
-                exp_level = job_data.get('experience_level', 'Unknown')
-                stats['by_experience_level'][exp_level] = stats['by_experience_level'].get(exp_level, 0) + 1
-                
-                # Remote work stats
-                remote = job_data.get('remote', 'No')
-                if remote in stats['remote_stats']:
-                    stats['remote_stats'][remote] += 1
-                
-                # Trusted company stats
-                if job_data.get('is_trusted_company', 'False') == 'True':
-                    stats['trusted_companies'] += 1
-            
-            # Sort top categories by count
-            for category in ['by_company', 'by_location', 'by_job_type', 'by_category', 'by_experience_level']:
-                stats[category] = dict(sorted(stats[category].items(), key=lambda x: x[1], reverse=True))
-            
-            return stats
+            return summarize_jobs(self.redis_client.hgetall(job_key) for job_key in job_keys)
             
         except Exception as e:
             logger.error(f"Error getting job statistics: {str(e)}")
@@ -1120,7 +874,6 @@ class RedisCachedJobScraper:
                  cache_duration_hours: int = 72):
         """Initialize Redis-cached job scraper"""
         try:
-            self.scraper = LinkedInJobScraper()
             self.cache = RedisJobDataCache(
                 redis_host=redis_host,
                 redis_port=redis_port,
@@ -1128,6 +881,11 @@ class RedisCachedJobScraper:
                 redis_password=redis_password,
                 cache_duration_hours=cache_duration_hours
             )
+            # Share the politeness budget with every other scraping process
+            self.scraper = LinkedInJobScraper(
+                limiter=HostRateLimiter(redis_client=self.cache.redis_client),
+                detail_cache=self.cache
+            )
             logger.info("RedisCachedJobScraper initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize RedisCachedJobScraper: {str(e)}")
@@ -1179,17 +937,8 @@ class RedisCachedJobScraper:
         )
         
         # Save to cache
-        metadata = {
-            'keywords': keywords,
-            'location': location,
-            'max_jobs': max_jobs,
-            'job_type_filter': job_type_filter,
-            'category_filter': category_filter,
-            'trusted_only': trusted_only,
-            'scraped_at': datetime.now().isoformat(),
-            'scraper_version': '2.0',
-            'source': 'LinkedIn'
-        }
+        metadata = self.search_metadata(keywords, location, max_jobs, job_type_filter,
+                                        category_filter, trusted_only)
         
         success = self.cache.save_to_cache(cache_key, jobs_data, metadata)
         if success:
@@ -1197,6 +946,13 @@ class RedisCachedJobScraper:
         
         return jobs_data
     
+    def search_metadata(self, keywords: str, location: str, max_jobs: int,
+                        job_type_filter: str = None, category_filter: str = None,
+                        trusted_only: bool = True) -> Dict:
+        """Metadata stored alongside a cached search"""
+        return search_metadata(keywords, location, max_jobs, job_type_filter,
+                               category_filter, trusted_only)
+    
     def _filter_jobs(self, jobs, keywords, location, job_type_filter, category_filter):
         """Filter jobs based on criteria"""
         filtered = []
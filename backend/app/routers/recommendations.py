@@ -1,21 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
 from app.core.db import db
+from app.core.responses import FastJSONResponse
+from app.core.payload_cache import job_payload_cache, record_version
+from app.core.job_models import job_model_cache
+from app.core.rate_limiter import limit_route, DAILY_SWIPE_LIMIT
+from app.core.actions import VALID_ACTIONS, collection_for_action
 from app.services.recommender import HybridRecommender
 from app.services.embeddings import EmbeddingService
 from app.models.user import UserProfile, JobSeekerCreate, EmployerCreate
 from app.models.job import JobPosting, JobRecommendation
 from app.models.swipe import UserSwipe, SwipeType
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from datetime import datetime
+import asyncio
 import json
 import logging
+import time
 
 from app.utils.converter import convert_mongo_doc
+from app.utils.pagination import MAX_PAGE_SIZE
+from app.utils.streaming import ndjson_response, wants_ndjson
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 logger = logging.getLogger(__name__)
 
+# Largest deck an offline client may flush through /swipe/batch
+MAX_SWIPE_BATCH_SIZE = 50
+
 # Lazy import email service to avoid startup errors
 def get_email_service():
     """Lazy load email service - returns None if not available"""
@@ -32,6 +44,15 @@ class SwipeRequest(BaseModel):
     action: str  # 'like', 'dislike', 'save', 'apply', 'super_like'
     job_payload: dict | None = None
 
+class SwipeBatchItem(BaseModel):
+    job_id: str
+    action: str
+    job_payload: dict | None = None
+
+class SwipeBatchRequest(BaseModel):
+    user_id: str
+    swipes: List[SwipeBatchItem] = Field(..., min_length=1, max_length=MAX_SWIPE_BATCH_SIZE)
+
 class CreateUserRequest(BaseModel):
     clerk_id: str
     email: str
@@ -95,20 +116,29 @@ async def create_user(request: CreateUserRequest):
         print(f"💥 Error creating user: {e}")
         raise HTTPException(status_code=500, detail=f"User creation failed: {str(e)}")
 
+USER_LIST_PROJECTION = {
+    "clerk_id": 1,
+    "email": 1,
+    "first_name": 1,
+    "last_name": 1,
+    "role": 1,
+    "skills": 1,
+    "location": 1
+}
+
 @router.get("/users")
-async def list_users():
-    """List all users in the system (for debugging)"""
+async def list_users(request: Request):
+    """List all users in the system (for debugging).
+
+    With `Accept: application/x-ndjson` users are streamed one per line.
+    """
     try:
         print(f"\n📋 === LISTING ALL USERS ===")
-        users = await db.users_db.Profile.find({}, {
-            "clerk_id": 1, 
-            "email": 1, 
-            "first_name": 1, 
-            "last_name": 1, 
-            "role": 1,
-            "skills": 1,
-            "location": 1
-        }).to_list(100)
+        if wants_ndjson(request):
+            cursor = db.users_db.Profile.find({}, USER_LIST_PROJECTION).limit(100)
+            return ndjson_response(convert_mongo_doc(user) async for user in cursor)
+
+        users = await db.users_db.Profile.find({}, USER_LIST_PROJECTION).to_list(100)
         
         user_list = []
         for user in users:
@@ -170,8 +200,20 @@ async def get_recommendations(
     limit: int = 10,
     location: str = "All Locations",
     recommender: HybridRecommender = Depends(get_recommender),
+    _rate_limit: dict = Depends(limit_route("recommend")),
 ):
     """Get personalized job recommendations for a user"""
+    recommendations = await recommend_for_user(clerk_id, limit, location, recommender)
+    # Ready-to-encode content: skip FastAPI's encoder pass
+    return FastJSONResponse(recommendations)
+
+async def recommend_for_user(clerk_id: str, limit: int, location: str,
+                             recommender: HybridRecommender) -> List[dict]:
+    """Score and rank jobs for a user; shared by the recommend and bootstrap routes.
+
+    Returns JobRecommendation-shaped dicts ({"job", "match_score"}) whose job
+    bodies are cached pre-serialized fragments.
+    """
     try:
         print(f"\n🚀 === RECOMMENDATION REQUEST ===")
         print(f"User ID: {clerk_id}")
@@ -265,61 +307,30 @@ async def get_recommendations(
         if not jobs:
             return []
 
-        # Convert and filter jobs
-        job_models = []
+        # Drop already interacted jobs before any conversion or scoring -
+        # one batched membership check against the per-user exclusion index
+        job_dicts = []
         for job in jobs:
+            job_dicts.append(job if isinstance(job, dict) else convert_mongo_doc(job))
+        candidate_ids = [str(job.get("id") or job.get("_id") or "") for job in job_dicts]
+        already_seen = await db.exclusions.contains_many(clerk_id, candidate_ids)
+
+        print(f"🚫 Filtering out {sum(already_seen)} liked/saved/disliked jobs")
+
+        filtered_job_models = []
+        payload_keys = {}  # id(model) -> (source job id, record version)
+        for job_data, candidate_id, seen in zip(job_dicts, candidate_ids, already_seen):
+            if seen:
+                continue
             try:
-                if isinstance(job, dict):
-                    job_data = job
-                else:
-                    job_data = convert_mongo_doc(job)
-                
-                job_model = JobPosting(**job_data)
-                job_models.append(job_model)
+                version = record_version(job_data)
+                # Validated once per record version, then reused
+                job_model = job_model_cache.get(candidate_id, version, job_data)
             except Exception as e:
                 print(f"❌ Skipping invalid job: {str(e)}")
                 continue
-
-        # Filter out already interacted jobs - Query from correct collections
-        print(f"🔍 Fetching user's interacted jobs from separate collections...")
-        
-        # Get liked jobs from users_job_like collection
-        liked_jobs_cursor = db.users_db.users_job_like.find({"user_id": clerk_id})
-        liked_job_ids = set()
-        async for doc in liked_jobs_cursor:
-            jid = str(doc.get("job_id"))
-            if jid:
-                liked_job_ids.add(jid)
-        
-        # Get saved jobs from users_job_saved collection
-        saved_jobs_cursor = db.users_db.users_job_saved.find({"user_id": clerk_id})
-        saved_job_ids = set()
-        async for doc in saved_jobs_cursor:
-            jid = str(doc.get("job_id"))
-            if jid:
-                saved_job_ids.add(jid)
-        
-        # Get disliked jobs from users_job_dislike collection
-        disliked_jobs_cursor = db.users_db.users_job_dislike.find({"user_id": clerk_id})
-        disliked_job_ids = set()
-        async for doc in disliked_jobs_cursor:
-            jid = str(doc.get("job_id"))
-            if jid:
-                disliked_job_ids.add(jid)
-        
-        # Combine liked and saved (both should be excluded from recommendations)
-        excluded_job_ids = liked_job_ids | saved_job_ids | disliked_job_ids
-        
-        print(f"🚫 Filtering out jobs:")
-        print(f"   - Liked: {len(liked_job_ids)} jobs")
-        print(f"   - Saved: {len(saved_job_ids)} jobs")
-        print(f"   - Disliked: {len(disliked_job_ids)} jobs")
-        print(f"   - Total excluded: {len(excluded_job_ids)} jobs")
-        
-        filtered_job_models = []
-        for job_model in job_models:
-            if job_model.id not in excluded_job_ids:
-                filtered_job_models.append(job_model)
+            filtered_job_models.append(job_model)
+            payload_keys[id(job_model)] = (candidate_id, version)
         
         print(f"📊 After filtering: {len(filtered_job_models)} jobs available")
 
@@ -362,8 +373,13 @@ async def get_recommendations(
         except Exception as e:
             print(f"Queueing related jobs failed: {e}")
 
+        # Job bodies come from the pre-serialized payload cache; only the
+        # per-user score is encoded per request
         return [
-            JobRecommendation(job=job, match_score=score)
+            {
+                "job": job_payload_cache.fragment(*payload_keys[id(job)], job),
+                "match_score": float(score)
+            }
             for job, score in recommendations[:limit]
         ]
     except HTTPException:
@@ -719,12 +735,71 @@ async def send_saved_email_task(user_email: str, user_name: str, job_title: str,
     except Exception:
         return False
 
+def clean_job_snapshot(job_snapshot: dict | None, job_id: str) -> dict:
+    """Strip action-specific timestamps and metadata from a job snapshot"""
+    if not job_snapshot:
+        logger.warning(f"⚠️  No job snapshot available, creating minimal payload")
+        return {'id': job_id}
+
+    cleaned_snapshot = {k: v for k, v in job_snapshot.items()
+                        if k not in ['saved_at', 'liked_at', 'disliked_at', 'created_at', 'updated_at', '_id']}
+
+    # Ensure job_id is set correctly
+    if 'id' not in cleaned_snapshot:
+        logger.warning(f"⚠️  No 'id' field in job snapshot, using job_id from request")
+        cleaned_snapshot['id'] = job_id
+
+    return cleaned_snapshot
+
+def format_job_location(job_snapshot: dict) -> str:
+    """Human-readable job location for notification emails"""
+    job_location_data = job_snapshot.get('location', {})
+    if isinstance(job_location_data, dict):
+        city = job_location_data.get('city', '')
+        state = job_location_data.get('state', '')
+        country = job_location_data.get('country', 'USA')
+        remote = job_location_data.get('remote', False)
+
+        location_parts = [p for p in [city, state, country] if p]
+        job_location = ', '.join(location_parts) if location_parts else 'Location not specified'
+        if remote:
+            job_location = f"Remote, {job_location}"
+        return job_location
+
+    return str(job_location_data) if job_location_data else 'Location not specified'
+
+async def timed_stage(timings: dict, stage: str, awaitable):
+    """Await `awaitable`, recording its duration in milliseconds under `stage`"""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = (time.perf_counter() - started) * 1000
+
+async def fetch_job_snapshot(job_id: str) -> dict:
+    """Job snapshot from the job cache; empty when the job is unknown"""
+    try:
+        job_snapshot = await db.get_job_by_id(job_id)
+        logger.info(f"📦 Fetched job from database")
+        return job_snapshot or {}
+    except Exception as e:
+        logger.debug(f"⚠️  Could not get job snapshot: {e}")
+        return {}
+
+def server_timing_header(timings: dict) -> str:
+    return ", ".join(f"{stage};dur={ms:.1f}" for stage, ms in timings.items())
+
 @router.post("/swipe")
-async def handle_swipe_action(request: SwipeRequest, background_tasks: BackgroundTasks):
-    """Handle user swipe actions (like, dislike, save) with optional email notifications"""
+async def handle_swipe_action(request: SwipeRequest, background_tasks: BackgroundTasks,
+                              response: Response):
+    """Handle user swipe actions (like, dislike, save) with optional email notifications.
+
+    The limit check, profile lookup and snapshot fetch don't depend on each
+    other, so they run concurrently; only the save waits on the limit check.
+    """
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
+        timings = {}
         
         logger.info(f"\n👆 === SWIPE ACTION ===")
         logger.info(f"User: {request.user_id[:12]}...")
@@ -732,11 +807,21 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
         logger.info(f"Action: {request.action}")
         logger.info(f"Timestamp: {datetime.utcnow().isoformat()}")
         
-        valid_actions = ['like', 'dislike', 'save', 'apply', 'super_like']
-        if request.action not in valid_actions:
-            raise HTTPException(status_code=400, detail=f"Invalid action. Must be one of: {valid_actions}")
+        if request.action not in VALID_ACTIONS:
+            raise HTTPException(status_code=400, detail=f"Invalid action. Must be one of: {VALID_ACTIONS}")
         
-        limit_check = await db.check_and_increment_swipe_limit(request.user_id)
+        stages = [
+            timed_stage(timings, "limit", db.check_and_increment_swipe_limit(request.user_id)),
+            # Profile is only needed for the notification email
+            timed_stage(timings, "user", db.get_user_by_clerk_id_cached(request.user_id)),
+        ]
+        if request.job_payload:
+            logger.info(f"📦 Using provided job payload")
+        else:
+            stages.append(timed_stage(timings, "snapshot", fetch_job_snapshot(request.job_id)))
+
+        limit_check, user, *fetched = await asyncio.gather(*stages)
+        job_snapshot = request.job_payload if request.job_payload else fetched[0]
         
         if not limit_check.get("allowed", False):
             logger.warning(f"🚫 User exceeded daily swipe limit")
@@ -744,60 +829,26 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
                 status_code=429,
                 detail={
                     "error": "Daily swipe limit reached",
-                    "message": f"You've reached your daily limit of {limit_check.get('limit', 20)} swipes",
+                    "message": f"You've reached your daily limit of {limit_check.get('limit', DAILY_SWIPE_LIMIT)} swipes",
                     "remaining": limit_check.get("remaining", 0),
                     "reset_at": limit_check.get("reset_at").isoformat() if limit_check.get("reset_at") else None,
                     "total_today": limit_check.get("total_today", 0)
-                }
+                },
+                headers={"Server-Timing": server_timing_header(timings)}
             )
         
         logger.info(f"✅ Swipe allowed. Remaining: {limit_check.get('remaining', 0)}")
         
-        # Get user details for email
-        user = await db.get_user_by_clerk_id(request.user_id)
         if not user:
             logger.warning(f"⚠️  User not found: {request.user_id}")
         
-        # Get job snapshot
-        action_start = time.time()
-        
-        job_snapshot = None
-        try:
-            if request.job_payload:
-                job_snapshot = request.job_payload
-                logger.info(f"📦 Using provided job payload")
-            else:
-                job_snapshot = await db.get_job_by_id(request.job_id)
-                logger.info(f"📦 Fetched job from database")
-        except Exception as e:
-            logger.debug(f"⚠️  Could not get job snapshot: {e}")
-            job_snapshot = {}
-        
         # Clean job snapshot - remove action-specific timestamps and metadata
-        if job_snapshot:
-            logger.info(f"🧹 Cleaning job snapshot...")
-            logger.info(f"   Original keys: {list(job_snapshot.keys())}")
-            
-            cleaned_snapshot = {k: v for k, v in job_snapshot.items() 
-                               if k not in ['saved_at', 'liked_at', 'disliked_at', 'created_at', 'updated_at', '_id']}
-            
-            # Ensure job_id is set correctly
-            if 'id' in cleaned_snapshot:
-                job_snapshot = cleaned_snapshot
-            else:
-                logger.warning(f"⚠️  No 'id' field in job snapshot, using job_id from request")
-                job_snapshot = cleaned_snapshot
-                job_snapshot['id'] = request.job_id
-                
-            logger.info(f"   Cleaned keys: {list(job_snapshot.keys())}")
-            logger.info(f"   Job snapshot ready for saving")
-        else:
-            logger.warning(f"⚠️  No job snapshot available, creating minimal payload")
-            job_snapshot = {'id': request.job_id}
+        job_snapshot = clean_job_snapshot(job_snapshot, request.job_id)
         
         # Route actions to correct collections with detailed logging
         result = False
         collection_name = ""
+        save_start = time.perf_counter()
         
         logger.info(f"\n📝 === SAVING TO DATABASE ===")
         logger.info(f"Action: {request.action}")
@@ -805,7 +856,16 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
         logger.info(f"Job ID: {request.job_id}")
         
         try:
-            if request.action in ["like", "super_like", "apply"]:
+            if db.swipe_writer.enabled:
+                # Write-behind: the swipe is persisted by the next buffer flush
+                collection_name = collection_for_action(request.action)
+                logger.info(f"🎯 Buffering write for {collection_name} ({db.swipe_writer.mode} mode)...")
+                await db.swipe_writer.submit(
+                    request.action, request.user_id, request.job_id,
+                    job_snapshot if collection_name != "users_job_dislike" else None)
+                result = True
+
+            elif request.action in ["like", "super_like", "apply"]:
                 collection_name = "users_job_like"
                 logger.info(f"🎯 Routing to {collection_name} collection...")
                 result = await db.save_job_like(request.user_id, request.job_id, job_snapshot)
@@ -831,41 +891,14 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
             logger.error(f"   Traceback:\n{traceback.format_exc()}")
             result = False
         
-        action_elapsed = time.time() - action_start
+        timings["save"] = (time.perf_counter() - save_start) * 1000
+        action_elapsed = timings["save"] / 1000
         
         if not result:
             logger.error(f"❌ FINAL RESULT: Failed to persist action '{request.action}' to {collection_name}")
             logger.error(f"   This is a critical error - the action was not saved!")
         else:
             logger.info(f"✅ FINAL RESULT: Action saved successfully in {action_elapsed:.3f} seconds")
-            
-            # Verify the save by querying the database
-            try:
-                logger.info(f"🔍 Verifying save in database...")
-                if request.action in ["like", "super_like", "apply"]:
-                    verify_doc = await db.users_db.users_job_like.find_one({
-                        "user_id": request.user_id,
-                        "job_id": request.job_id
-                    })
-                elif request.action == "save":
-                    verify_doc = await db.users_db.users_job_saved.find_one({
-                        "user_id": request.user_id,
-                        "job_id": request.job_id
-                    })
-                elif request.action == "dislike":
-                    verify_doc = await db.users_db.users_job_dislike.find_one({
-                        "user_id": request.user_id,
-                        "job_id": request.job_id
-                    })
-                
-                if verify_doc:
-                    logger.info(f"✅ VERIFICATION SUCCESS: Document found in {collection_name}")
-                    logger.info(f"   Document ID: {verify_doc.get('_id')}")
-                else:
-                    logger.error(f"❌ VERIFICATION FAILED: Document NOT found in {collection_name}")
-                    
-            except Exception as verify_error:
-                logger.error(f"⚠️  Verification check failed: {verify_error}")
         
         # Queue email notification based on action
         email_will_be_sent = False
@@ -876,20 +909,7 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
             job_title = job_snapshot.get('title', 'Job Position')
             company_name = job_snapshot.get('company', job_snapshot.get('employer_id', 'Company'))
             
-            # Parse location properly
-            job_location_data = job_snapshot.get('location', {})
-            if isinstance(job_location_data, dict):
-                city = job_location_data.get('city', '')
-                state = job_location_data.get('state', '')
-                country = job_location_data.get('country', 'USA')
-                remote = job_location_data.get('remote', False)
-                
-                location_parts = [p for p in [city, state, country] if p]
-                job_location = ', '.join(location_parts) if location_parts else 'Location not specified'
-                if remote:
-                    job_location = f"Remote, {job_location}"
-            else:
-                job_location = str(job_location_data) if job_location_data else 'Location not specified'
+            job_location = format_job_location(job_snapshot)
             
             if user_email:
                 # Send application confirmation email for like/apply actions
@@ -919,8 +939,10 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
                     email_will_be_sent = True
                     logger.info(f"✅ Saved job notification queued for {user_email}")
 
-        elapsed = time.time() - start_time
-        logger.info(f"⏱️  Total swipe handling: {elapsed:.3f}s")
+        timings["total"] = (time.perf_counter() - start_time) * 1000
+        response.headers["Server-Timing"] = server_timing_header(timings)
+        logger.info(f"⏱️  Total swipe handling: {timings['total'] / 1000:.3f}s "
+                    f"({', '.join(f'{k}={v:.1f}ms' for k, v in timings.items() if k != 'total')})")
         logger.info(f"=====================================\n")
 
         return {
@@ -929,10 +951,11 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
             "action": request.action,
             "job_id": request.job_id,
             "email_queued": email_will_be_sent,
+            "write_mode": db.swipe_writer.mode,
             "swipe_limit": {
                 "remaining": limit_check.get("remaining", 0),
                 "total_today": limit_check.get("total_today", 0),
-                "limit": limit_check.get("limit", 20),
+                "limit": limit_check.get("limit", DAILY_SWIPE_LIMIT),
                 "reset_at": limit_check.get("reset_at").isoformat() if limit_check.get("reset_at") else None
             }
         }
@@ -945,9 +968,165 @@ async def handle_swipe_action(request: SwipeRequest, background_tasks: Backgroun
         logger.error(f"Full traceback:\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Swipe action failed: {str(e)}")
 
+async def send_batch_emails_task(user_email: str, user_name: str, applications: List[dict], saved: List[dict]):
+    """Background task sending all notifications for one swipe batch in a single task."""
+    sent = 0
+    for job in applications:
+        if await send_application_email_task(user_email=user_email, user_name=user_name, **job):
+            sent += 1
+    for job in saved:
+        if await send_saved_email_task(user_email=user_email, user_name=user_name, **job):
+            sent += 1
+    return sent
+
+@router.post("/swipe/batch")
+async def handle_swipe_batch(request: SwipeBatchRequest, background_tasks: BackgroundTasks):
+    """Apply an ordered list of swipes queued by an offline client in one round trip"""
+    try:
+        import time
+        start_time = time.time()
+
+        logger.info(f"\n👆 === SWIPE BATCH ===")
+        logger.info(f"User: {request.user_id[:12]}...")
+        logger.info(f"Swipes: {len(request.swipes)}")
+
+        results = [
+            {"index": i, "job_id": item.job_id, "action": item.action, "success": False}
+            for i, item in enumerate(request.swipes)
+        ]
+        valid_indexes = []
+        for i, item in enumerate(request.swipes):
+            if item.action in VALID_ACTIONS:
+                valid_indexes.append(i)
+            else:
+                results[i]["error"] = f"Invalid action. Must be one of: {VALID_ACTIONS}"
+
+        # One limit check for the whole batch; if only part of it fits, the
+        # earliest swipes win
+        limit_check = {"allowed": True, "remaining": 0, "total_today": 0, "limit": DAILY_SWIPE_LIMIT, "reset_at": None}
+        if valid_indexes:
+            limit_check = await db.check_and_increment_swipe_limit(request.user_id, cost=len(valid_indexes))
+            if not limit_check.get("allowed", False) and limit_check.get("remaining", 0) > 0:
+                accepted = limit_check["remaining"]
+                limit_check = await db.check_and_increment_swipe_limit(request.user_id, cost=accepted)
+                if limit_check.get("allowed", False):
+                    for i in valid_indexes[accepted:]:
+                        results[i]["error"] = "Daily swipe limit reached"
+                    valid_indexes = valid_indexes[:accepted]
+
+            if not limit_check.get("allowed", False):
+                logger.warning(f"🚫 User exceeded daily swipe limit")
+                raise HTTPException(
+                    status_code=429,
+                    detail={
+                        "error": "Daily swipe limit reached",
+                        "message": f"You've reached your daily limit of {limit_check.get('limit', DAILY_SWIPE_LIMIT)} swipes",
+                        "remaining": limit_check.get("remaining", 0),
+                        "reset_at": limit_check.get("reset_at").isoformat() if limit_check.get("reset_at") else None,
+                        "total_today": limit_check.get("total_today", 0)
+                    }
+                )
+
+        # Fetch the user once for the whole batch
+        user = await db.get_user_by_clerk_id_cached(request.user_id)
+        if not user:
+            logger.warning(f"⚠️  User not found: {request.user_id}")
+
+        # Snapshots: client payloads where present, one batch lookup otherwise
+        items = [request.swipes[i] for i in valid_indexes]
+        missing = [item.job_id for item in items if not item.job_payload]
+        fetched = await db.resolve_jobs(missing) if missing else {}
+        snapshots = [
+            clean_job_snapshot(item.job_payload or fetched.get(item.job_id), item.job_id)
+            for item in items
+        ]
+
+        swipes = [
+            {
+                "action": item.action,
+                "job_id": item.job_id,
+                "job_details": snapshot if collection_for_action(item.action) != "users_job_dislike" else None
+            }
+            for item, snapshot in zip(items, snapshots)
+        ]
+
+        if db.swipe_writer.enabled:
+            for swipe in swipes:
+                await db.swipe_writer.submit(
+                    swipe["action"], request.user_id, swipe["job_id"], swipe["job_details"])
+            saved = [True] * len(swipes)
+        else:
+            saved = await db.save_user_job_actions_bulk(request.user_id, swipes)
+
+        # Group notification emails into a single background task
+        applications, saved_jobs = [], []
+        for index, item, snapshot, ok in zip(valid_indexes, items, snapshots, saved):
+            results[index]["success"] = ok
+            if not ok:
+                results[index]["error"] = "Failed to persist action"
+                continue
+            job_email = {
+                "job_title": snapshot.get('title', 'Job Position'),
+                "company_name": snapshot.get('company', snapshot.get('employer_id', 'Company'))
+            }
+            if item.action in ['like', 'super_like', 'apply']:
+                applications.append({**job_email, "job_location": format_job_location(snapshot)})
+            elif item.action == 'save':
+                saved_jobs.append(job_email)
+
+        email_will_be_sent = False
+        user_email = user.get('email', '') if user else ''
+        if user_email and (applications or saved_jobs):
+            user_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() or "User"
+            background_tasks.add_task(
+                send_batch_emails_task,
+                user_email=user_email,
+                user_name=user_name,
+                applications=applications,
+                saved=saved_jobs
+            )
+            email_will_be_sent = True
+            logger.info(f"📧 Queued {len(applications) + len(saved_jobs)} notifications for {user_email}")
+
+        elapsed = time.time() - start_time
+        succeeded = sum(1 for r in results if r["success"])
+        logger.info(f"⏱️  Swipe batch handled: {succeeded}/{len(results)} in {elapsed:.3f}s")
+
+        return {
+            "success": succeeded == len(results),
+            "processed": succeeded,
+            "results": results,
+            "email_queued": email_will_be_sent,
+            "write_mode": db.swipe_writer.mode,
+            "swipe_limit": {
+                "remaining": limit_check.get("remaining", 0),
+                "total_today": limit_check.get("total_today", 0),
+                "limit": limit_check.get("limit", DAILY_SWIPE_LIMIT),
+                "reset_at": limit_check.get("reset_at").isoformat() if limit_check.get("reset_at") else None
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error handling swipe batch: {e}")
+        import traceback
+        logger.error(f"Full traceback:\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Swipe batch failed: {str(e)}")
+
+PAGE_LIMIT_QUERY = Query(
+    None, ge=1, le=MAX_PAGE_SIZE,
+    description="Page size; when set (or with a cursor) the response is {items, next_cursor}")
+PAGE_CURSOR_QUERY = Query(None, description="next_cursor from the previous page")
+
 @router.get("/saved/{clerk_id}")
-async def get_saved_jobs(clerk_id: str):
-    """Return the user's saved jobs from MongoDB WITHOUT caching for real-time updates"""
+async def get_saved_jobs(request: Request, clerk_id: str, limit: Optional[int] = PAGE_LIMIT_QUERY,
+                         cursor: Optional[str] = PAGE_CURSOR_QUERY):
+    """Return the user's saved jobs from MongoDB WITHOUT caching for real-time updates.
+
+    Without `limit`/`cursor` the full list is returned as before, or streamed
+    one job per line with `Accept: application/x-ndjson`.
+    """
     try:
         import time
         start_time = time.time()
@@ -956,13 +1135,23 @@ async def get_saved_jobs(clerk_id: str):
         logger.info(f"User ID: {clerk_id}")
         logger.info(f"Timestamp: {datetime.utcnow().isoformat()}")
         
-        jobs = await db.get_user_saved_jobs(clerk_id)
+        if not (limit or cursor) and wants_ndjson(request):
+            return ndjson_response(db.iter_user_action_jobs("users_job_saved", clerk_id))
+
+        if limit or cursor:
+            page = await db.get_user_saved_jobs_page(clerk_id, limit or MAX_PAGE_SIZE, cursor)
+            jobs = page["items"]
+        else:
+            page = None
+            jobs = await db.get_user_saved_jobs(clerk_id)
         
         elapsed = time.time() - start_time
         logger.info(f"✅ Found {len(jobs)} saved jobs in {elapsed:.3f} seconds")
         logger.info(f"=====================================")
         
-        return jobs
+        return FastJSONResponse(page if page is not None else jobs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"💥 Error fetching saved jobs: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch saved jobs: {str(e)}")
@@ -990,8 +1179,13 @@ async def remove_saved_job(req: RemoveSavedRequest):
         raise HTTPException(status_code=500, detail=f"Failed to remove saved job: {str(e)}")
 
 @router.get("/liked/{clerk_id}")
-async def get_liked_jobs(clerk_id: str):
-    """Return the user's liked jobs from users_job_like collection"""
+async def get_liked_jobs(request: Request, clerk_id: str, limit: Optional[int] = PAGE_LIMIT_QUERY,
+                         cursor: Optional[str] = PAGE_CURSOR_QUERY):
+    """Return the user's liked jobs from users_job_like collection.
+
+    Without `limit`/`cursor` the full list is returned as before, or streamed
+    one job per line with `Accept: application/x-ndjson`.
+    """
     try:
         import time
         start_time = time.time()
@@ -1000,18 +1194,23 @@ async def get_liked_jobs(clerk_id: str):
         logger.info(f"User ID: {clerk_id}")
         logger.info(f"Timestamp: {datetime.utcnow().isoformat()}")
         
-        # Direct query to verify collection access
-        logger.info(f"🔍 Querying users_job_like collection directly...")
-        count = await db.users_db.users_job_like.count_documents({"user_id": clerk_id})
-        logger.info(f"📊 Found {count} documents in users_job_like for this user")
-        
-        jobs = await db.get_user_liked_jobs(clerk_id)
+        if not (limit or cursor) and wants_ndjson(request):
+            return ndjson_response(db.iter_user_action_jobs("users_job_like", clerk_id))
+
+        if limit or cursor:
+            page = await db.get_user_liked_jobs_page(clerk_id, limit or MAX_PAGE_SIZE, cursor)
+            jobs = page["items"]
+        else:
+            page = None
+            jobs = await db.get_user_liked_jobs(clerk_id)
         
         elapsed = time.time() - start_time
         logger.info(f"✅ Returned {len(jobs)} liked jobs in {elapsed:.3f} seconds")
         logger.info(f"=====================================")
         
-        return jobs
+        return FastJSONResponse(page if page is not None else jobs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"💥 Error fetching liked jobs: {e}")
         import traceback
@@ -1029,11 +1228,19 @@ async def remove_liked_job(req: RemoveSavedRequest):
         raise HTTPException(status_code=500, detail=f"Failed to remove liked job: {str(e)}")
 
 @router.get("/disliked/{clerk_id}")
-async def get_disliked_jobs(clerk_id: str):
+async def get_disliked_jobs(request: Request, clerk_id: str, limit: Optional[int] = PAGE_LIMIT_QUERY,
+                            cursor: Optional[str] = PAGE_CURSOR_QUERY):
     """Return the user's disliked job IDs from users_job_dislike collection"""
     try:
+        if limit or cursor:
+            return FastJSONResponse(
+                await db.get_user_disliked_jobs_page(clerk_id, limit or MAX_PAGE_SIZE, cursor))
+        if wants_ndjson(request):
+            return ndjson_response(db.iter_user_action_jobs("users_job_dislike", clerk_id))
         jobs = await db.get_user_disliked_jobs(clerk_id)
-        return jobs
+        return FastJSONResponse(jobs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch disliked jobs: {str(e)}")
 
@@ -1054,4 +1261,52 @@ async def check_job_disliked(clerk_id: str, job_id: str):
         is_disliked = await db.is_job_disliked(clerk_id, job_id)
         return {"is_disliked": is_disliked}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to check job dislike status: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to check job dislike status: {str(e)}")
+
+
+@router.get("/bootstrap/{clerk_id}")
+async def get_bootstrap(
+    clerk_id: str,
+    limit: int = 10,
+    location: str = "All Locations",
+    list_limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    recommender: HybridRecommender = Depends(get_recommender),
+    _rate_limit: dict = Depends(limit_route("recommend")),
+):
+    """Everything the app loads on launch, in one request.
+
+    Recommendations, the first page of the saved/liked/disliked lists and
+    the swipe limit status are fetched concurrently. Lists come back as
+    {items, next_cursor}; continue them through the paginated list endpoints.
+    """
+    try:
+        start_time = time.perf_counter()
+        timings = {}
+
+        recommendations, lists, swipe_limit = await asyncio.gather(
+            timed_stage(timings, "recommend", recommend_for_user(
+                clerk_id, limit, location, recommender)),
+            timed_stage(timings, "lists", db.get_user_job_lists(clerk_id, list_limit)),
+            timed_stage(timings, "limit", db.get_swipe_limit_status(clerk_id)),
+        )
+
+        timings["total"] = (time.perf_counter() - start_time) * 1000
+        logger.info(f"🚀 Bootstrap for {clerk_id[:12]}... in {timings['total']:.1f}ms")
+
+        return FastJSONResponse({
+            "recommendations": recommendations,
+            "saved": lists["saved"],
+            "liked": lists["liked"],
+            "disliked": lists["disliked"],
+            "swipe_limit": {
+                "remaining": swipe_limit.get("remaining", 0),
+                "total_today": swipe_limit.get("total_today", 0),
+                "limit": swipe_limit.get("limit", DAILY_SWIPE_LIMIT),
+                "reset_at": swipe_limit.get("reset_at").isoformat() if swipe_limit.get("reset_at") else None
+            }
+        }, headers={"Server-Timing": server_timing_header(timings)})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error building bootstrap payload: {e}")
+        raise HTTPException(status_code=500, detail=f"Bootstrap failed: {str(e)}")
@@ -0,0 +1,122 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+import os
+import re
+
+COMPANY_MATCH_CACHE_SIZE = int(os.getenv("COMPANY_MATCH_CACHE_SIZE", "4096"))
+
+# Trusted companies list - Fortune 500 + Major Tech Companies
+TRUSTED_COMPANIES = {
+    # Major Tech Companies
+    'google', 'microsoft', 'amazon', 'apple', 'meta', 'facebook', 'tesla', 'netflix',
+    'salesforce', 'oracle', 'adobe', 'nvidia', 'intel', 'ibm', 'cisco', 'vmware',
+    'spotify', 'uber', 'airbnb', 'twitter', 'linkedin', 'dropbox', 'slack', 'zoom',
+    'shopify', 'square', 'stripe', 'paypal', 'ebay', 'reddit', 'pinterest', 'snap',
+    'twilio', 'okta', 'snowflake', 'databricks', 'palantir', 'cloudflare', 'mongodb',
+
+    # Financial Services
+    'jpmorgan', 'goldman sachs', 'morgan stanley', 'bank of america', 'wells fargo',
+    'citigroup', 'american express', 'visa', 'mastercard', 'blackrock', 'fidelity',
+    'charles schwab', 'robinhood', 'coinbase', 'stripe', 'square',
+
+    # Consulting & Professional Services
+    'mckinsey', 'bain', 'bcg', 'deloitte', 'pwc', 'kpmg', 'ey', 'accenture',
+    'ibm consulting', 'tcs', 'infosys', 'wipro', 'cognizant', 'capgemini',
+
+    # Fortune 500 Companies
+    'walmart', 'exxon mobil', 'berkshire hathaway', 'unitedhealth', 'mckesson',
+    'cvs health', 'amazon', 'at&t', 'general motors', 'ford', 'verizon',
+    'chevron', 'kroger', 'general electric', 'walgreens', 'phillips 66',
+    'marathon petroleum', 'costco', 'cardinal health', 'express scripts',
+
+    # Healthcare & Pharma
+    'johnson & johnson', 'pfizer', 'merck', 'abbott', 'bristol myers squibb',
+    'eli lilly', 'gilead', 'amgen', 'biogen', 'regeneron', 'moderna',
+    'kaiser permanente', 'anthem', 'humana', 'centene',
+
+    # Startups & Unicorns
+    'openai', 'anthropic', 'canva', 'figma', 'notion', 'discord', 'github',
+    'gitlab', 'atlassian', 'asana', 'monday.com', 'miro', 'airtable'
+}
+
+# Other names companies post under, mapped to their trusted name
+COMPANY_ALIASES = {
+    'jp morgan': 'jpmorgan',
+    'j.p. morgan': 'jpmorgan',
+    'jpmorgan chase': 'jpmorgan',
+    'ernst & young': 'ey',
+    'pricewaterhousecoopers': 'pwc',
+    'boston consulting group': 'bcg',
+    'tata consultancy services': 'tcs',
+    'amazon web services': 'amazon',
+    'aws': 'amazon',
+    'alphabet': 'google',
+    'meta platforms': 'meta',
+    'exxonmobil': 'exxon mobil',
+    'unitedhealth group': 'unitedhealth',
+    'bristol-myers squibb': 'bristol myers squibb',
+}
+
+# Legal-form and corporate tokens that may follow a trusted name
+CORPORATE_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp',
+    'corporation', 'co', 'company', 'companies', 'plc', 'pvt', 'private',
+    'group', 'holdings', 'gmbh', 'ag', 'sa', 'nv', 'bv', 'se',
+})
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.&'][a-z0-9]+)*")
+_END = ""  # trie key marking the end of a name
+
+
+def company_tokens(name: str) -> Tuple[str, ...]:
+    """Lowercased word tokens; '&', '.' and ' inside a word are kept (at&t, monday.com)"""
+    return tuple(_TOKEN.findall(name.lower())) if name else ()
+
+
+class TrustedCompanyMatcher:
+    """Token trie over trusted company names and their aliases.
+
+    A company is trusted when its name is a trusted name or alias,
+    optionally followed by CORPORATE_SUFFIXES tokens: 'Google LLC' and
+    'JPMorgan Chase & Co.' match, while 'Honey' (ey), 'Apple Bees' and
+    'Notion Labs' don't. A lookup walks the trie once from the first
+    token, so it costs O(name length); results are memoized per raw name
+    since the same employers recur constantly.
+    """
+
+    def __init__(self, names: Iterable[str] = TRUSTED_COMPANIES,
+                 aliases: Dict[str, str] = COMPANY_ALIASES,
+                 cache_size: int = COMPANY_MATCH_CACHE_SIZE):
+        self.names = frozenset(names)
+        self._trie: dict = {}
+        for name in self.names:
+            self._insert(name, name)
+        for alias, name in aliases.items():
+            if name in self.names:
+                self._insert(alias, name)
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _insert(self, key: str, name: str):
+        node = self._trie
+        for token in company_tokens(key):
+            node = node.setdefault(token, {})
+        node[_END] = name
+
+    def _match(self, company_name: str) -> Optional[str]:
+        """Trusted name `company_name` is registered under, if any"""
+        tokens = company_tokens(company_name)
+        node = self._trie
+        for end, token in enumerate(tokens, 1):
+            node = node.get(token)
+            if node is None:
+                return None
+            if _END in node and CORPORATE_SUFFIXES.issuperset(tokens[end:]):
+                return node[_END]
+        return None
+
+    def is_trusted(self, company_name: str) -> bool:
+        return bool(company_name) and self.match(company_name) is not None
+
+
+# Built once, shared by the scraper and the Redis-side filters
+trusted_company_matcher = TrustedCompanyMatcher()
@@ -0,0 +1,163 @@
+from typing import Dict, Iterable, List, Tuple
+
+from app.utils.keyword_patterns import KeywordMatcher
+
+# Job categories mapping with related keywords
+JOB_CATEGORIES = {
+    'Software Engineering': [
+        'software engineer', 'software developer', 'full stack developer',
+        'frontend developer', 'backend developer', 'web developer',
+        'mobile developer', 'ios developer', 'android developer',
+        'python developer', 'java developer', 'javascript developer',
+        'react developer', 'node.js developer', '.net developer'
+    ],
+    'Data Science & Analytics': [
+        'data scientist', 'data analyst', 'data engineer', 'ml engineer',
+        'machine learning engineer', 'ai engineer', 'research scientist',
+        'business analyst', 'business intelligence', 'data visualization',
+        'statistician', 'quantitative analyst', 'analytics engineer'
+    ],
+    'DevOps & Infrastructure': [
+        'devops engineer', 'cloud engineer', 'infrastructure engineer',
+        'site reliability engineer', 'platform engineer', 'systems engineer',
+        'network engineer', 'security engineer', 'aws engineer',
+        'kubernetes engineer', 'docker', 'terraform'
+    ],
+    'Product & Design': [
+        'product manager', 'product owner', 'ux designer', 'ui designer',
+        'product designer', 'user experience', 'user interface',
+        'design lead', 'creative director', 'graphic designer'
+    ],
+    'Cybersecurity': [
+        'security engineer', 'cybersecurity analyst', 'security architect',
+        'penetration tester', 'security consultant', 'incident response',
+        'vulnerability assessment', 'compliance analyst'
+    ],
+    'Project Management': [
+        'project manager', 'program manager', 'scrum master',
+        'agile coach', 'delivery manager', 'technical program manager',
+        'pmp', 'project coordinator'
+    ],
+    'Sales & Marketing': [
+        'sales representative', 'account manager', 'business development',
+        'marketing manager', 'digital marketing', 'growth marketing',
+        'content marketing', 'social media manager', 'seo specialist'
+    ],
+    'Finance & Accounting': [
+        'financial analyst', 'accountant', 'controller', 'cfo',
+        'investment analyst', 'risk analyst', 'auditor',
+        'financial planner', 'treasury analyst'
+    ],
+    'Human Resources': [
+        'hr manager', 'recruiter', 'talent acquisition', 'hr business partner',
+        'compensation analyst', 'learning and development', 'hr generalist'
+    ],
+    'Operations': [
+        'operations manager', 'supply chain', 'logistics coordinator',
+        'business operations', 'process improvement', 'quality assurance'
+    ]
+}
+
+# Ordered rules: the first label with any keyword present wins
+JOB_TYPE_RULES = [
+    ('Internship', ['intern', 'internship']),
+    ('Contract', ['contract', 'contractor', 'freelance', 'temporary']),
+    ('Part-time', ['part-time', 'part time']),
+]
+EXPERIENCE_LEVEL_RULES = [
+    ('Senior', ['senior', 'sr.', 'lead', 'principal', 'staff']),
+    ('Entry Level', ['junior', 'jr.', 'entry', 'associate', 'intern']),
+    ('Mid Level', ['mid', 'intermediate']),
+]
+EMPLOYMENT_TYPE_RULES = [
+    ('Full-time', ['full-time']),
+    ('Part-time', ['part-time']),
+    ('Contract', ['contract']),
+    ('Internship', ['internship']),
+]
+REMOTE_LOCATION_KEYWORDS = ['remote', 'work from home', 'wfh', 'virtual', 'anywhere']
+REMOTE_DESCRIPTION_KEYWORDS = ['remote work', 'work from home', 'wfh', 'virtual', 'distributed team', 'remote-first']
+HYBRID_KEYWORDS = ['hybrid', 'flexible', 'partially remote']
+
+
+def _first_label(rules: List[Tuple[str, List[str]]], found: Dict[str, None], default: str) -> str:
+    for label, keywords in rules:
+        if any(keyword in found for keyword in keywords):
+            return label
+    return default
+
+
+class JobClassifier:
+    """Every keyword rule of the scraper compiled into one regex.
+
+    `classify` scans each text field once and derives category scores, job
+    type, experience level, employment type and remote status from the
+    same match sets, so callers should classify a job once and read every
+    label from the result. Keywords match on lowercased text where they
+    start a word (see KeywordMatcher), so 'lead' no longer fires inside
+    'misleading'. Built once per process; read-only afterwards.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]] = JOB_CATEGORIES):
+        self.categories = categories
+        keywords = [keyword for category in categories.values() for keyword in category]
+        for rules in (JOB_TYPE_RULES, EXPERIENCE_LEVEL_RULES, EMPLOYMENT_TYPE_RULES):
+            keywords += [keyword for _, rule_keywords in rules for keyword in rule_keywords]
+        keywords += REMOTE_LOCATION_KEYWORDS + REMOTE_DESCRIPTION_KEYWORDS + HYBRID_KEYWORDS
+        self._matcher = KeywordMatcher(keywords)
+
+    def _find(self, text: str) -> Dict[str, None]:
+        return self._matcher.find(text.lower()) if text and isinstance(text, str) else {}
+
+    def category_scores(self, in_title: Dict[str, None], in_description: Dict[str, None]) -> Dict[str, int]:
+        """Title matches weigh 3, description-only matches 1"""
+        scores = {}
+        for category, keywords in self.categories.items():
+            score = 0
+            for keyword in keywords:
+                if keyword in in_title:
+                    score += 3
+                elif keyword in in_description:
+                    score += 1
+            if score > 0:
+                scores[category] = score
+        return scores
+
+    def remote_status(self, in_location: Dict[str, None], in_description: Dict[str, None]) -> str:
+        if any(keyword in in_location for keyword in REMOTE_LOCATION_KEYWORDS):
+            return 'remote'
+        if any(keyword in in_description for keyword in REMOTE_DESCRIPTION_KEYWORDS):
+            return 'remote'
+        if any(keyword in in_location or keyword in in_description for keyword in HYBRID_KEYWORDS):
+            return 'hybrid'
+        return 'on-site'
+
+    def classify(self, title: str = "", description: str = "", location: str = "",
+                 metadata: str = "") -> dict:
+        """All labels for one job; `metadata` is a search card's metadata text"""
+        in_title = self._find(title)
+        in_description = self._find(description)
+        in_location = self._find(location)
+        in_metadata = self._find(metadata)
+
+        scores = self.category_scores(in_title, in_description)
+        return {
+            'category_scores': scores,
+            'category': max(scores, key=scores.get) if scores else 'Other',
+            'job_type': _first_label(JOB_TYPE_RULES, in_title, 'Full-time'),
+            'experience_level': _first_label(EXPERIENCE_LEVEL_RULES, in_title, 'Mid Level'),
+            'employment_type': _first_label(EMPLOYMENT_TYPE_RULES, in_metadata, 'Full-time'),
+            'remote_status': self.remote_status(in_location, in_description)
+        }
+
+    def classify_many(self, jobs: Iterable[dict]) -> List[dict]:
+        """Classify a batch of job dicts (title/description/location), e.g. a catalog re-run"""
+        classify = self.classify
+        return [
+            classify(job.get('title') or '', job.get('description') or '', job.get('location') or '')
+            for job in jobs
+        ]
+
+
+# Process-wide classifier shared by the scraper and the Redis job cache
+job_classifier = JobClassifier()
@@ -0,0 +1,152 @@
+from typing import Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+
+from app.utils.keyword_patterns import trie_regex
+
+logger = logging.getLogger(__name__)
+
+SKILL_DICTIONARY_PATH = os.getenv("SKILL_DICTIONARY_PATH")
+
+# Bump the version whenever the skill list changes so stored extractions
+# (jobs-lists `skills_version`) can be found and re-extracted.
+SKILL_DICTIONARY = {
+    "version": "2024.1",
+    "categories": {
+        'Programming Languages': [
+            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', '.net',
+            'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'r',
+            'matlab', 'perl', 'objective-c', 'dart', 'elixir'
+        ],
+        'Web Technologies': [
+            'react', 'angular', 'vue.js', 'node.js', 'express', 'django',
+            'flask', 'spring', 'laravel', 'rails', 'asp.net', 'html',
+            'css', 'sass', 'less', 'webpack', 'babel', 'jquery'
+        ],
+        'Databases': [
+            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
+            'oracle', 'sql server', 'sqlite', 'cassandra', 'dynamodb',
+            'neo4j', 'influxdb', 'mariadb'
+        ],
+        'Cloud & DevOps': [
+            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
+            'ansible', 'jenkins', 'git', 'github', 'gitlab', 'bitbucket',
+            'ci/cd', 'linux', 'ubuntu', 'centos', 'nginx', 'apache'
+        ],
+        'Data & Analytics': [
+            'machine learning', 'deep learning', 'artificial intelligence',
+            'ai', 'data science', 'pandas', 'numpy', 'scikit-learn',
+            'tensorflow', 'pytorch', 'keras', 'tableau', 'power bi',
+            'spark', 'hadoop', 'kafka', 'airflow'
+        ],
+        'Mobile': [
+            'ios', 'android', 'react native', 'flutter', 'xamarin',
+            'cordova', 'ionic', 'swift', 'objective-c', 'kotlin', 'java'
+        ]
+    }
+}
+
+REQUIREMENT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+        r'(?:required|must have|essential|mandatory)[:\s]([^.!?]{10,100})',
+        r'(?:minimum|at least)[\s]+(\d+[\s]*(?:years?|yrs?)[\s]*(?:of)?[\s]*experience)',
+        r'(?:bachelor|master|phd|degree)[^.!?]{0,50}',
+        r'(?:experience with|proficiency in|knowledge of)[^.!?]{10,80}',
+        r'(?:strong|excellent|solid)[\s]+(?:knowledge|understanding|experience)[^.!?]{10,80}'
+    )
+]
+SENTENCE_SPLIT = re.compile(r'[.!?•·‣▪▫-]\s*')
+REQUIREMENT_INDICATORS = (
+    'required', 'must have', 'essential', 'mandatory', 'minimum',
+    'years of experience', 'degree', 'certification', 'preferred'
+)
+
+MAX_REQUIREMENTS = 8
+MAX_SKILLS = 12
+
+
+def load_skill_dictionary(path: Optional[str] = SKILL_DICTIONARY_PATH) -> dict:
+    """Built-in dictionary, or a JSON file of the same shape when configured"""
+    if not path:
+        return SKILL_DICTIONARY
+    try:
+        with open(path) as f:
+            dictionary = json.load(f)
+        if "version" not in dictionary or "categories" not in dictionary:
+            raise ValueError("expected 'version' and 'categories'")
+        return dictionary
+    except Exception as e:
+        logger.error(f"❌ Could not load skill dictionary {path}, using built-in: {e}")
+        return SKILL_DICTIONARY
+
+
+def skills_pattern(skills: Iterable[str]) -> "re.Pattern":
+    """One compiled whole-word alternation over every skill.
+
+    Short alphabetic skills ('r', 'go', 'ai') also refuse '&' and '-' as
+    neighbours, so 'R&D' and 'go-to' are not read as R and Go.
+    """
+    skills = list(dict.fromkeys(skill.lower() for skill in skills if skill))
+    short = [skill for skill in skills if len(skill) <= 2 and skill.isalpha()]
+    other = [skill for skill in skills if skill not in short]
+    branches = []
+    if short:
+        branches.append(rf"(?<![&\-])(?:{trie_regex(short)})(?![\w&\-])")
+    if other:
+        branches.append(rf"(?:{trie_regex(other)})(?!\w)")
+    return re.compile(rf"(?<!\w)(?:{'|'.join(branches)})")
+
+
+class SkillExtractor:
+    """Skill dictionary compiled into a single regex.
+
+    `find_skills` is one scan of the lowercased text by the regex engine,
+    whatever the number of skills, and keeps only whole-word matches, so
+    'go' and 'r' no longer fire inside 'google' or 'senior', and '.net'
+    inside 'asp.net' is reported as ASP.NET only. Where skills overlap
+    the longest wins ('react native' over 'react'). Built once per
+    process; read-only afterwards.
+    """
+
+    def __init__(self, skills: Iterable[str], version: str):
+        self.version = version
+        self._pattern = skills_pattern(skills)
+
+    @classmethod
+    def from_dictionary(cls, dictionary: dict) -> "SkillExtractor":
+        skills = [skill for category in dictionary["categories"].values() for skill in category]
+        return cls(skills, str(dictionary["version"]))
+
+    def find_skills(self, text: str, limit: Optional[int] = MAX_SKILLS) -> List[str]:
+        """Dictionary skills in `text`, in order of first appearance"""
+        found = dict.fromkeys(match.group(0) for match in self._pattern.finditer(text.lower()))
+        skills = [skill.title() for skill in found]
+        return skills[:limit] if limit else skills
+
+    def find_requirements(self, description: str, limit: int = MAX_REQUIREMENTS) -> List[str]:
+        requirements = []
+        for pattern in REQUIREMENT_PATTERNS:
+            for match in pattern.finditer(description):
+                requirement = match.group(0).strip()
+                if 15 < len(requirement) < 200:  # Filter reasonable length
+                    requirements.append(requirement)
+
+        # Also extract bullet points and numbered lists
+        for sentence in SENTENCE_SPLIT.split(description):
+            sentence = sentence.strip()
+            sentence_lower = sentence.lower()
+            if any(indicator in sentence_lower for indicator in REQUIREMENT_INDICATORS):
+                if 20 <= len(sentence) <= 150:  # Reasonable length
+                    requirements.append(sentence)
+
+        return list(dict.fromkeys(requirements))[:limit]
+
+    def parse_description(self, description: str) -> Tuple[List[str], List[str]]:
+        """(requirements, skills) for a job description"""
+        return self.find_requirements(description), self.find_skills(description)
+
+
+# Process-wide extractor shared by the scraper and ingest backfills
+skill_extractor = SkillExtractor.from_dictionary(load_skill_dictionary())
@@ -0,0 +1,60 @@
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def _default_parser() -> str:
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+# lxml's C parser is several times faster than the pure-Python html.parser;
+# SCRAPER_HTML_PARSER forces a specific bs4 tree builder.
+HTML_PARSER = os.getenv("SCRAPER_HTML_PARSER") or _default_parser()
+
+
+def has_class(*names: str):
+    """SoupStrainer `class_` matcher for elements carrying any of `names`.
+
+    While parsing, a strainer sees the raw `class` attribute ("base-card
+    base-search-card ..."), so a plain list of names only matches elements
+    with exactly one class. This splits the attribute first.
+    """
+    wanted = frozenset(names)
+
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(classes)
+
+    return match
+
+
+# Only the job cards of a search results page are ever read
+SEARCH_CARD_CLASSES = ["base-card", "job-search-card"]
+SEARCH_PAGE_STRAINER = SoupStrainer("div", class_=has_class(*SEARCH_CARD_CLASSES))
+
+# Elements LinkedInJobScraper reads from a job detail page: the description
+# and the class-based salary selectors in extract_salary_info
+DETAIL_PAGE_CLASSES = [
+    "show-more-less-html__markup",
+    "description__text",
+    "salary",
+    "compensation-text",
+    "jobs-unified-top-card__job-insight",
+]
+DETAIL_PAGE_STRAINER = SoupStrainer(class_=has_class(*DETAIL_PAGE_CLASSES))
+
+
+def make_soup(markup, parse_only: SoupStrainer = None) -> BeautifulSoup:
+    """Parse HTML with the fastest available backend.
+
+    `parse_only` limits tree building to the matching subtrees; everything
+    else in the document is tokenized and dropped.
+    """
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=parse_only)
+
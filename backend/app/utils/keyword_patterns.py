@@ -0,0 +1,62 @@
+import re
+from typing import Dict, Iterable
+
+
+def trie_regex(keywords: Iterable[str]) -> str:
+    """Regex alternation of `keywords`, factored into a prefix trie.
+
+    `['react', 'react native', 'redis']` becomes `re(?:act(?:\\ native)?|dis)`,
+    so the regex engine (C) branches on one character at a time instead
+    of trying every keyword at every position. Longer keywords win over
+    their prefixes because the optional tails are greedy.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        if not keyword:
+            continue
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            return f"(?:{pattern})?"
+        return pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Which of a fixed keyword set occur in a text, in one regex scan.
+
+    A keyword counts when it appears starting at a word start; its end may
+    fall inside a word ('intern' in 'internship', but 'lead' not in
+    'misleading'). Keywords that overlap are all reported: the scan
+    tries every word start, and a match also reports the keywords that are
+    prefixes of it. Keywords and text are compared as given; callers
+    lowercase both. Read-only once built.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+        self._pattern = re.compile(rf"(?<![a-z0-9])(?=({trie_regex(keywords)}))")
+        self._prefixes = {
+            keyword: [other for other in keywords if other != keyword and keyword.startswith(other)]
+            for keyword in keywords
+        }
+
+    def find(self, text: str) -> Dict[str, None]:
+        """Distinct keywords present in `text`, in order of first appearance"""
+        found: Dict[str, None] = {}
+        prefixes = self._prefixes
+        for keyword in self._pattern.findall(text):
+            if keyword not in found:
+                for prefix in prefixes[keyword]:
+                    found.setdefault(prefix)
+                found[keyword] = None
+        return found
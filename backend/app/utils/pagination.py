@@ -0,0 +1,69 @@
+from bson import ObjectId
+from datetime import datetime
+from typing import Any, Optional, Tuple
+import base64
+import json
+
+MAX_PAGE_SIZE = 100
+
+
+# Timestamp types found in the action collections, in the order a
+# descending sort returns them: datetimes, then legacy ISO strings and
+# numbers, then rows with no timestamp at all (null or missing)
+CURSOR_KINDS = ("date", "string", "number", "null")
+
+
+def _cursor_kind(value) -> str:
+    if isinstance(value, datetime):
+        return "date"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return "number"
+    if value is None:
+        return "null"
+    raise TypeError(f"Unsupported cursor value type: {type(value).__name__}")
+
+
+def encode_cursor(timestamp, doc_id: ObjectId) -> str:
+    """Opaque token for the position after (timestamp, _id).
+
+    `timestamp` may be any CURSOR_KINDS value, so legacy rows with a string
+    or missing timestamp don't end pagination early.
+    """
+    kind = _cursor_kind(timestamp)
+    payload = {"t": timestamp.isoformat() if kind == "date" else timestamp, "i": str(doc_id)}
+    if kind != "date":
+        payload["k"] = kind
+    token = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(token.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, ObjectId]:
+    """Inverse of encode_cursor; raises ValueError for malformed tokens"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        kind = payload.get("k", "date")
+        value = datetime.fromisoformat(payload["t"]) if kind == "date" else payload["t"]
+        if _cursor_kind(value) != kind:
+            raise ValueError(f"cursor value does not match kind '{kind}'")
+        return value, ObjectId(payload["i"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def keyset_query(base_filter: dict, field: str, cursor: Optional[str]) -> dict:
+    """Filter for the page after `cursor` when sorting by (field, _id) descending"""
+    if not cursor:
+        return dict(base_filter)
+    value, doc_id = decode_cursor(cursor)
+    kind = _cursor_kind(value)
+    # Comparison operators only match values of the same type, so $lt stays
+    # within the cursor's kind; every later kind follows in full
+    after = [{field: value, "_id": {"$lt": doc_id}}]
+    if kind != "null":
+        after.insert(0, {field: {"$lt": value}})
+    for later in CURSOR_KINDS[CURSOR_KINDS.index(kind) + 1:]:
+        after.append({field: None} if later == "null" else {field: {"$type": later}})
+    return {**base_filter, "$or": after}
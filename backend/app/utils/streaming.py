@@ -0,0 +1,32 @@
+from typing import AsyncIterator
+import logging
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client asked for newline-delimited JSON"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _encode(items: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    try:
+        async for item in items:
+            yield dumps(item) + b"\n"
+    except Exception as e:
+        # Headers (and the 200) are already sent; a last error line tells the
+        # client the stream is incomplete rather than just short
+        logger.error(f"💥 NDJSON stream aborted: {e}")
+        yield dumps({"error": str(e)}) + b"\n"
+
+
+def ndjson_response(items: AsyncIterator[dict]) -> StreamingResponse:
+    """Stream documents one per line as they come off the cursor"""
+    return StreamingResponse(_encode(items), media_type=NDJSON_MEDIA_TYPE)
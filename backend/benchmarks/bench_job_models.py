@@ -0,0 +1,65 @@
+"""JobPosting construction cost for a 100-job recommendation request.
+
+Compares validating every record per request (the old JobPosting(**record)
+path) with JobModelCache, which validates once per record version.
+
+Run from backend/:  python -m benchmarks.bench_job_models
+"""
+from bson import ObjectId
+import timeit
+
+from app.core.job_models import JobModelCache
+from app.core.payload_cache import record_version
+from app.models.job import JobPosting
+
+JOBS = 100
+ROUNDS = 200
+
+
+def sample_records(count: int = JOBS):
+    return [
+        {
+            "_id": str(ObjectId()),
+            "employer_id": f"employer-{i}",
+            "title": f"Data Engineer {i}",
+            "description": "Own batch and streaming pipelines. " * 20,
+            "requirements": ["Python", "SQL", "Airflow"],
+            "responsibilities": ["Build pipelines", "Review designs"],
+            "employment_type": "full_time",
+            "salary": {"min": 90000, "max": 130000, "currency": "USD", "is_public": True},
+            "location": {"city": "Pune", "state": "MH", "country": "India", "remote": False},
+            "skills_required": ["python", "sql", "spark", "airflow"],
+            "posted_at": "2024-05-01T12:30:00",
+            "company": f"Company {i}",
+            "source": "jobs_lists",
+            "record_version": f"2024-05-01T12:30:00|{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def validate_every_request(records):
+    return [JobPosting(**record) for record in records]
+
+
+def cached(records, cache: JobModelCache):
+    return [cache.get(record["_id"], record_version(record), record) for record in records]
+
+
+def main():
+    records = sample_records()
+    cache = JobModelCache()
+    cached(records, cache)  # warm: the first request validates
+
+    paths = (
+        ("validate per request", lambda: validate_every_request(records)),
+        ("JobModelCache (warm)", lambda: cached(records, cache)),
+    )
+    for name, fn in paths:
+        seconds = min(timeit.repeat(fn, number=ROUNDS, repeat=5))
+        print(f"{name:<24} {seconds / ROUNDS * 1000:8.3f} ms per {JOBS} jobs")
+    print(f"cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
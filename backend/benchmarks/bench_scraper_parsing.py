@@ -0,0 +1,79 @@
+"""Per-page HTML parse time of the LinkedIn scraper, on saved fixtures.
+
+Compares the old pipeline (full html.parser tree, every card serialized and
+reparsed; full detail page tree) with the current one (SoupStrainer-limited
+tree on the fastest available backend, cards read in place). Both must
+produce the same job dicts. Also times skill extraction on a 5 KB
+description: the old per-skill `in` checks against the compiled regex.
+
+Run from backend/:  python -m benchmarks.bench_scraper_parsing
+"""
+from pathlib import Path
+import timeit
+
+from bs4 import BeautifulSoup
+
+from app.job_scraper import LinkedInJobScraper
+from app.services.skill_extractor import SKILL_DICTIONARY, skill_extractor
+from app.utils.html_parsing import HTML_PARSER
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ROUNDS = 20
+
+
+def legacy_search_page(scraper, html):
+    soup = BeautifulSoup(html, 'html.parser')
+    job_cards = soup.find_all('div', class_=['base-card', 'job-search-card'])
+    return [scraper.extract_job_details(BeautifulSoup(str(card), 'html.parser')) for card in job_cards]
+
+
+def legacy_job_page(scraper, html):
+    soup = BeautifulSoup(html, 'html.parser')
+    description_elem = soup.find('div', class_='show-more-less-html__markup')
+    if not description_elem:
+        description_elem = soup.find('div', class_='description__text')
+    description = description_elem.get_text().strip() if description_elem else ''
+    requirements, skills = scraper.parse_description_for_requirements(description)
+    return {
+        'description': description,
+        'requirements': requirements,
+        'skills': skills,
+        'salary': scraper.extract_salary_info(soup)
+    }
+
+
+def legacy_skills(description):
+    description_lower = description.lower()
+    skills = set()
+    for category_skills in SKILL_DICTIONARY["categories"].values():
+        for skill in category_skills:
+            if skill.lower() in description_lower:
+                skills.add(skill.title())
+    return list(skills)[:12]
+
+
+def main():
+    scraper = LinkedInJobScraper()
+    search_html = (FIXTURES / "linkedin_search_page.html").read_bytes()
+    job_html = (FIXTURES / "linkedin_job_page.html").read_bytes()
+
+    assert legacy_search_page(scraper, search_html) == scraper.extract_job_cards(search_html)
+    assert legacy_job_page(scraper, job_html) == scraper.parse_job_description(job_html)
+    description = scraper.parse_job_description(job_html)['description']
+    description = (description * (5000 // max(len(description), 1) + 1))[:5000]
+
+    cases = (
+        ("search page, legacy", lambda: legacy_search_page(scraper, search_html)),
+        (f"search page, {HTML_PARSER} strained", lambda: scraper.extract_job_cards(search_html)),
+        ("job page, legacy", lambda: legacy_job_page(scraper, job_html)),
+        (f"job page, {HTML_PARSER} strained", lambda: scraper.parse_job_description(job_html)),
+        ("skills, per-skill `in` checks", lambda: legacy_skills(description)),
+        ("skills, compiled regex", lambda: skill_extractor.find_skills(description)),
+    )
+    for name, fn in cases:
+        seconds = min(timeit.repeat(fn, number=ROUNDS, repeat=5))
+        print(f"{name:<32} {seconds / ROUNDS * 1000:8.3f} ms per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Serialization cost of a recommendation response, per 100 jobs.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with the
+FastJSONResponse path (one model_dump + orjson) and with job bodies spliced
+from the warm JobPayloadCache. The cached path includes computing each
+record's cache key, as the recommendations route does per candidate.
+
+Run from backend/:  python -m benchmarks.bench_serialization
+"""
+from datetime import datetime
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.payload_cache import JobPayloadCache, record_version
+from app.core.responses import dump_models, dumps
+from app.models.job import JobPosting, JobRecommendation
+
+JOBS = 100
+ROUNDS = 200
+
+
+def sample_recommendations(count: int = JOBS):
+    recommendations = []
+    for i in range(count):
+        job = JobPosting(
+            employer_id=f"employer-{i}",
+            title=f"Senior Backend Engineer {i}",
+            description="Build and operate Python services. " * 20,
+            requirements=["5+ years Python", "FastAPI", "MongoDB", "Redis"],
+            responsibilities=["Design APIs", "Own on-call", "Mentor engineers"],
+            employment_type="full_time",
+            salary={"min": 120000, "max": 160000, "currency": "USD"},
+            location={"city": "Austin", "state": "TX", "country": "USA", "remote": True},
+            skills_required=["python", "fastapi", "mongodb", "redis", "docker"],
+            posted_at=datetime(2024, 5, 1, 12, 30),
+            company=f"Company {i}",
+            url=f"https://example.com/jobs/{i}",
+        )
+        recommendations.append(JobRecommendation(job=job, match_score=0.5 + i / 1000))
+    return recommendations
+
+
+def default_path(recommendations) -> bytes:
+    return json.dumps(jsonable_encoder(recommendations)).encode("utf-8")
+
+
+def fast_path(recommendations) -> bytes:
+    return dumps(dump_models(recommendations))
+
+
+def source_records(recommendations):
+    """The converted catalog records the jobs came from, write stamp included"""
+    return [
+        {**rec.job.model_dump(by_alias=True), "record_version": f"2024-05-01T12:30:00|{i}"}
+        for i, rec in enumerate(recommendations)
+    ]
+
+
+def cached_path(recommendations, records, cache: JobPayloadCache) -> bytes:
+    return dumps([
+        {"job": cache.fragment(str(i), record_version(record), rec.job), "match_score": rec.match_score}
+        for i, (rec, record) in enumerate(zip(recommendations, records))
+    ])
+
+
+def main():
+    recommendations = sample_recommendations()
+    records = source_records(recommendations)
+    cache = JobPayloadCache()
+    expected = json.loads(default_path(recommendations))
+    assert expected == json.loads(fast_path(recommendations))
+    assert expected == json.loads(cached_path(recommendations, records, cache))
+
+    paths = (
+        ("jsonable_encoder + json", default_path),
+        ("model_dump + orjson", fast_path),
+        ("cached fragments + keys", lambda recs: cached_path(recs, records, cache)),
+    )
+    for name, fn in paths:
+        seconds = min(timeit.repeat(lambda: fn(recommendations), number=ROUNDS, repeat=5))
+        print(f"{name:<26} {seconds / ROUNDS * 1000:8.3f} ms per {JOBS} jobs")
+
+
+if __name__ == "__main__":
+    main()
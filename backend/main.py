@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from app.routers import recommendations
 from app.core.db import db
+from app.core.indexes import INDEX_VERIFY_ON_STARTUP, IndexCoverageError
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
@@ -30,6 +31,18 @@ async def startup_event():
         logger.info("✅ Database indexes ensured")
     except Exception as e:
         logger.warning(f"⚠️  Index creation warning: {e}")
+
+    # Check that hot queries are index-backed (INDEX_VERIFY_STRICT aborts on COLLSCAN)
+    if INDEX_VERIFY_ON_STARTUP:
+        try:
+            await db.verify_indexes()
+        except IndexCoverageError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️  Query plan verification failed: {e}")
+
+    # Replay swipe writes buffered by a previous process (write-behind mode)
+    await db.swipe_writer.start()
     
     logger.info("🔗 API endpoints registered")
     
@@ -42,6 +55,12 @@ async def startup_event():
     
     logger.info("✨ Job Recommender API is ready!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Persist buffered swipes and swipe limit counters still waiting for a flush
+    await db.swipe_writer.stop()
+    await db.rate_limiter.flush_audit()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Job Recommender API"}
@@ -69,6 +88,8 @@ async def debug_info():
                 "/api/recommend/{clerk_id}",
                 "/api/recommend/create-user",
                 "/api/recommend/swipe",
+                "/api/recommend/swipe/batch",
+                "/api/recommend/bootstrap/{clerk_id}",
                 "/api/recommend/saved/{clerk_id}",
                 "/api/recommend/liked/{clerk_id}"
             ]
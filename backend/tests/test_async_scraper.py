@@ -0,0 +1,118 @@
+"""AsyncLinkedInJobScraper against an httpx.MockTransport.
+
+Run from backend/:  python -m unittest tests.test_async_scraper
+"""
+from pathlib import Path
+import unittest
+
+import httpx
+
+from app.async_scraper import AsyncLinkedInJobScraper
+
+FIXTURES = Path(__file__).parent.parent / "benchmarks" / "fixtures"
+SEARCH_PATH = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+PAGE_SIZE = 25
+
+
+def search_page(start: int, cards: int) -> str:
+    return "".join(
+        f'<div class="base-card base-search-card job-search-card">'
+        f'<a class="base-card__full-link" href="/jobs/view/{start + i}">Job</a>'
+        f'<h3 class="base-search-card__title">Backend Engineer {start + i}</h3>'
+        f'<h4 class="base-search-card__subtitle"><a>Acme</a></h4>'
+        f'<span class="job-search-card__location">Pune</span>'
+        f'</div>'
+        for i in range(cards)
+    )
+
+
+class RecordingLimiter:
+    """HostRateLimiter stand-in that never waits and records penalties"""
+
+    def __init__(self):
+        self.acquired = 0
+        self.penalties = []
+
+    async def acquire(self, host: str):
+        self.acquired += 1
+
+    async def penalize(self, host: str, seconds: float):
+        self.penalties.append((host, seconds))
+
+
+class LinkedInStub:
+    """Two search pages (25 + 3 cards); the second answers 429 once"""
+
+    def __init__(self):
+        self.job_page = (FIXTURES / "linkedin_job_page.html").read_bytes()
+        self.search_starts = []
+        self.detail_paths = []
+        self.throttled = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == SEARCH_PATH:
+            start = int(request.url.params["start"])
+            self.search_starts.append(start)
+            if start == PAGE_SIZE and not self.throttled:
+                self.throttled = True
+                return httpx.Response(429, headers={"Retry-After": "7"})
+            cards = {0: PAGE_SIZE, PAGE_SIZE: 3}.get(start, 0)
+            return httpx.Response(200, text=search_page(start, cards))
+        self.detail_paths.append(request.url.path)
+        return httpx.Response(200, content=self.job_page, headers={"ETag": '"v1"'})
+
+
+class AsyncScraperTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.stub = LinkedInStub()
+        self.limiter = RecordingLimiter()
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self.stub))
+        self.scraper = AsyncLinkedInJobScraper(limiter=self.limiter, client=self.client)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def scrape_pages(self, **kwargs):
+        return [page async for page in self.scraper.iter_pages(
+            "backend engineer", "Pune", trusted_only=False, **kwargs)]
+
+    async def test_walks_pages_until_an_empty_one(self):
+        pages = await self.scrape_pages(max_jobs=100)
+
+        self.assertEqual([next_start for next_start, _ in pages], [PAGE_SIZE, 2 * PAGE_SIZE])
+        self.assertEqual([len(jobs) for _, jobs in pages], [PAGE_SIZE, 3])
+        self.assertEqual(self.stub.search_starts, [0, PAGE_SIZE, PAGE_SIZE, 2 * PAGE_SIZE])
+
+        jobs = [job for _, page_jobs in pages for job in page_jobs]
+        self.assertEqual([job["title"] for job in jobs],
+                         [f"Backend Engineer {i}" for i in range(PAGE_SIZE + 3)])
+        self.assertEqual(len(self.stub.detail_paths), PAGE_SIZE + 3)
+        self.assertTrue(all(job["description"] and job["etag"] == '"v1"' for job in jobs))
+        # Every request, search or detail, waits for a limiter token
+        self.assertEqual(self.limiter.acquired, len(self.stub.search_starts) + len(self.stub.detail_paths))
+
+    async def test_429_penalizes_the_host_and_retries(self):
+        pages = await self.scrape_pages(max_jobs=100)
+
+        # The limiter, not a sleep in the scraper, holds back the retry
+        self.assertEqual(self.limiter.penalties, [("www.linkedin.com", 7.0)])
+        self.assertEqual(self.stub.search_starts.count(PAGE_SIZE), 2)
+        self.assertEqual(len(pages[1][1]), 3)
+
+    async def test_stops_at_max_jobs(self):
+        pages = await self.scrape_pages(max_jobs=10)
+
+        self.assertEqual([len(jobs) for _, jobs in pages], [10])
+        self.assertEqual(self.stub.search_starts, [0])
+        self.assertEqual(len(self.stub.detail_paths), 10)
+
+    async def test_resumes_from_a_checkpoint(self):
+        pages = await self.scrape_pages(max_jobs=100, start=PAGE_SIZE, collected=PAGE_SIZE)
+
+        self.assertEqual([len(jobs) for _, jobs in pages], [3])
+        self.assertEqual(self.stub.search_starts[0], PAGE_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
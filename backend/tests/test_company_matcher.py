@@ -0,0 +1,46 @@
+"""Trusted-company matching on the names LinkedIn cards carry.
+
+Run from backend/:  python -m unittest tests.test_company_matcher
+"""
+import unittest
+
+from app.services.company_matcher import TrustedCompanyMatcher
+
+
+class TrustedCompanyMatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = TrustedCompanyMatcher()
+
+    def test_trusted_names_and_aliases(self):
+        cases = {
+            "Google": "google",
+            "Google LLC": "google",
+            "Microsoft Corporation": "microsoft",
+            "Amazon Web Services, Inc.": "amazon",
+            "JPMorgan Chase & Co.": "jpmorgan",
+            "Goldman Sachs Group, Inc.": "goldman sachs",
+            "AT&T": "at&t",
+            "monday.com": "monday.com",
+            "Johnson & Johnson": "johnson & johnson",
+            "Infosys Limited": "infosys",
+            "IBM Consulting": "ibm consulting",
+        }
+        for company, expected in cases.items():
+            with self.subTest(company=company):
+                self.assertEqual(self.matcher.match(company), expected)
+
+    def test_trusted_name_inside_another_name(self):
+        for company in ("Honey", "Journey", "Apple Bees", "Square Enix", "Ford Foundation",
+                        "Notion Labs", "Zoom Video Staffing", "Staffing for Google",
+                        "Meta Recruiters Inc"):
+            with self.subTest(company=company):
+                self.assertFalse(self.matcher.is_trusted(company))
+
+    def test_empty_name(self):
+        self.assertFalse(self.matcher.is_trusted(""))
+        self.assertFalse(self.matcher.is_trusted("LLC"))
+
+
+if __name__ == "__main__":
+    unittest.main()
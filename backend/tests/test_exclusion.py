@@ -0,0 +1,78 @@
+"""ExclusionIndex warming while swipes keep arriving.
+
+Uses an in-memory Redis (fakeredis with Lua support).
+Run from backend/:  python -m unittest tests.test_exclusion
+"""
+import unittest
+
+from fakeredis import aioredis as fake_aioredis
+
+from app.core.exclusion import ExclusionIndex
+
+USER = "user_1"
+
+
+class ExclusionWarmTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.redis = fake_aioredis.FakeRedis(decode_responses=True)
+        # MongoDB stand-in: the loader returns what was committed when it ran
+        self.committed = {"job_1", "job_2"}
+        self.during_load = None
+        self.index = ExclusionIndex(self.redis, self.load)
+
+    async def asyncTearDown(self):
+        await self.redis.aclose()
+
+    async def load(self, user_id: str) -> set:
+        snapshot = set(self.committed)
+        if self.during_load:
+            action, self.during_load = self.during_load, None
+            await action()
+        return snapshot
+
+    async def swipe(self, job_id: str):
+        self.committed.add(job_id)
+        await self.index.add(USER, [job_id])
+
+    async def unswipe(self, job_id: str):
+        self.committed.discard(job_id)
+        await self.index.remove(USER, job_id)
+
+    async def test_add_while_warming_is_kept(self):
+        # Committed after the loader read, before the warm finished
+        self.during_load = lambda: self.swipe("job_3")
+
+        flags = await self.index.contains_many(USER, ["job_1", "job_3", "job_4"])
+
+        self.assertEqual(flags, [True, True, False])
+        self.assertEqual(await self.redis.get(f"excluded:{{{USER}}}:mode"), "set")
+        self.assertFalse(await self.redis.exists(f"excluded:{{{USER}}}:pending"))
+
+    async def test_add_while_cold_is_left_to_the_warm(self):
+        await self.swipe("job_3")
+
+        self.assertEqual(await self.index.contains_many(USER, ["job_3"]), [True])
+
+    async def test_remove_while_warming_aborts_the_warm(self):
+        self.during_load = lambda: self.unswipe("job_2")
+
+        # The loader's stale snapshot is not published; this read falls back to it...
+        await self.index.contains_many(USER, ["job_2"])
+        self.assertIsNone(await self.redis.get(f"excluded:{{{USER}}}:mode"))
+        # ...and the next read warms from the current data
+        self.assertEqual(await self.index.contains_many(USER, ["job_1", "job_2"]), [True, False])
+
+    async def test_second_warm_waits_for_the_first(self):
+        second = []
+
+        async def warm_again():
+            second.append(await self.index.warm(USER))
+
+        self.during_load = warm_again
+        self.assertTrue(await self.index.warm(USER))
+        self.assertEqual(second, [False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Keyset cursors over action lists with legacy timestamp values.
+
+Uses an in-memory MongoDB (mongomock).
+Run from backend/:  python -m unittest tests.test_pagination
+"""
+from datetime import datetime, timedelta
+import unittest
+
+from bson import ObjectId
+import mongomock
+
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_query
+
+FIELD = "saved_at"
+
+
+class KeysetPaginationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = mongomock.MongoClient().users.users_job_saved
+        start = datetime(2024, 5, 1, 12, 0)
+        docs = [{FIELD: start + timedelta(minutes=i)} for i in range(4)]
+        docs += [{FIELD: start}]                        # same timestamp, tie broken by _id
+        docs += [{FIELD: "2023-01-02T00:00:00"}, {FIELD: "2023-01-01T00:00:00"}]
+        docs += [{FIELD: 1672531200}]
+        docs += [{FIELD: None}, {}, {}]                 # no timestamp at all
+        for doc in docs:
+            self.collection.insert_one({"_id": ObjectId(), "user_id": "u", **doc})
+
+    def page(self, limit, cursor=None):
+        docs = list(self.collection.find(keyset_query({"user_id": "u"}, FIELD, cursor))
+                    .sort([(FIELD, -1), ("_id", -1)]).limit(limit + 1))
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1].get(FIELD), docs[-1]["_id"])
+        return docs, next_cursor
+
+    def test_pages_through_legacy_rows(self):
+        everything = list(self.collection.find({"user_id": "u"}).sort([(FIELD, -1), ("_id", -1)]))
+        for limit in (1, 2, 3, 4):
+            with self.subTest(limit=limit):
+                seen, cursor = [], None
+                while True:
+                    docs, cursor = self.page(limit, cursor)
+                    seen += [doc["_id"] for doc in docs]
+                    if cursor is None:
+                        break
+                self.assertEqual(seen, [doc["_id"] for doc in everything])
+
+    def test_cursor_round_trip(self):
+        doc_id = ObjectId()
+        for value in (datetime(2024, 5, 1, 12, 30, 5, 123000), "2023-01-01T00:00:00", 1672531200, 1.5, None):
+            with self.subTest(value=value):
+                self.assertEqual(decode_cursor(encode_cursor(value, doc_id)), (value, doc_id))
+
+    def test_datetime_cursors_from_before_kinds_still_decode(self):
+        # {"t": "2024-05-01T12:30:00", "i": "66321f0c9d1e4a0b8c7d6e5f"}
+        token = "eyJ0IjoiMjAyNC0wNS0wMVQxMjozMDowMCIsImkiOiI2NjMyMWYwYzlkMWU0YTBiOGM3ZDZlNWYifQ"
+        self.assertEqual(decode_cursor(token),
+                         (datetime(2024, 5, 1, 12, 30), ObjectId("66321f0c9d1e4a0b8c7d6e5f")))
+
+    def test_malformed_cursor(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""SwipeWriteBuffer with two consumers flushing the same user's writes.
+
+Uses in-memory MongoDB and Redis (mongomock-motor, fakeredis).
+Run from backend/:  python -m unittest tests.test_write_behind
+"""
+from datetime import datetime, timedelta
+import asyncio
+import unittest
+
+from fakeredis import aioredis as fake_aioredis
+from mongomock_motor import AsyncMongoMockClient
+import mongomock.collection
+
+from app.core.write_behind import SwipeWriteBuffer
+
+USER = "user_1"
+JOB = "job_1"
+
+
+def _bit_updater(doc, field_name, value):
+    # mongomock has no $bit; the interaction projection relies on it
+    if isinstance(doc, dict):
+        current = doc.get(field_name, 0)
+        for operation, operand in value.items():
+            current = {"and": current & operand, "or": current | operand,
+                       "xor": current ^ operand}[operation]
+        doc[field_name] = current
+
+
+mongomock.collection._updaters.setdefault("$bit", _bit_updater)
+
+
+class TwoConsumersTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.users_db = AsyncMongoMockClient()["users"]
+        self.redis = fake_aioredis.FakeRedis(decode_responses=True)
+
+    async def asyncTearDown(self):
+        await self.redis.aclose()
+
+    def buffer(self, mode: str, consumer: str) -> SwipeWriteBuffer:
+        # Long interval: the test decides when each consumer flushes
+        buffer = SwipeWriteBuffer(self.users_db, redis_client=self.redis, mode=mode,
+                                  flush_interval_ms=60_000, max_items=1000)
+        buffer.consumer_name = consumer
+        self.addCleanup(lambda: buffer._task and buffer._task.cancel())
+        return buffer
+
+    async def liked(self) -> bool:
+        return await self.users_db.users_job_like.find_one({"user_id": USER, "job_id": JOB}) is not None
+
+    async def like_bit(self) -> int:
+        doc = await self.users_db.user_job_actions.find_one({"user_id": USER, "job_id": JOB})
+        return (doc or {}).get("actions", 0) & 1
+
+    async def test_stream_removal_flushed_before_the_like_it_removes(self):
+        first, second = self.buffer("redis", "api-1"), self.buffer("redis", "api-2")
+
+        await first.submit("like", USER, JOB)
+        # api-1 takes the like off the stream but has not written it yet
+        like_ids, like_entries = await first._read_stream()
+        await second.submit_removal("users_job_like", USER, JOB)
+        # api-2 reads and writes the removal first
+        self.assertEqual(await second.flush(), 1)
+        await first._write(like_entries)
+
+        self.assertFalse(await self.liked())
+        self.assertEqual(await self.like_bit(), 0)
+
+    async def test_claimed_like_replayed_after_the_removal(self):
+        first, second = self.buffer("redis", "api-1"), self.buffer("redis", "api-2")
+
+        await first.submit("like", USER, JOB)
+        await first.submit_removal("users_job_like", USER, JOB)
+        _, entries = await first._read_stream()
+        await first._write(entries)
+        # api-1 died before acking; api-2 re-delivers the whole batch
+        await second._write(entries[:1])
+
+        self.assertFalse(await self.liked())
+        self.assertEqual(await self.like_bit(), 0)
+
+    async def test_memory_buffers_in_two_processes(self):
+        first, second = self.buffer("memory", "api-1"), self.buffer("memory", "api-2")
+
+        await first.submit("like", USER, JOB)
+        await second.submit_removal("users_job_like", USER, JOB)
+        await second.flush()
+        await first.flush()
+
+        self.assertFalse(await self.liked())
+        self.assertEqual(await self.like_bit(), 0)
+
+    async def test_like_after_a_removal_survives_the_late_removal(self):
+        first, second = self.buffer("memory", "api-1"), self.buffer("memory", "api-2")
+
+        await first.submit("like", USER, JOB)
+        await first.flush()
+        await second.submit_removal("users_job_like", USER, JOB)
+        # Another process, a few milliseconds later (ties go to the removal)
+        await asyncio.sleep(0.005)
+        await first.submit("like", USER, JOB)
+        # The re-like lands before the removal that preceded it
+        await first.flush()
+        await second.flush()
+
+        self.assertTrue(await self.liked())
+        self.assertEqual(await self.like_bit(), 1)
+
+    async def test_tombstone_landing_between_check_and_upsert(self):
+        first = self.buffer("memory", "api-1")
+        await first.submit("like", USER, JOB)
+        like_ts = datetime.fromisoformat(first._buffer[0]["ts"])
+
+        removal = {"op": "remove", "collection": "users_job_like", "user_id": USER,
+                   "job_id": JOB, "ts": (like_ts + timedelta(seconds=1)).isoformat()}
+        other = self.buffer("memory", "api-2")
+        tombstones_for = first._tombstones_for
+        calls = []
+
+        async def racing_lookup(swipes):
+            calls.append(len(swipes))
+            if len(calls) == 1:
+                # api-2 writes and applies the whole removal right after api-1's check
+                result = await tombstones_for(swipes)
+                await other._write([removal])
+                return result
+            return await tombstones_for(swipes)
+
+        first._tombstones_for = racing_lookup
+        await first.flush()
+
+        self.assertFalse(await self.liked())
+        self.assertEqual(await self.like_bit(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()